@@ -0,0 +1,370 @@
+import asyncio
+import inspect
+import threading
+import numpy as np
+from concurrent.futures import Future,ProcessPoolExecutor,ThreadPoolExecutor
+from typing import Callable,Tuple,Union
+from data_structures import Maze
+from parallel import SharedMaze,_init_worker,_solve_chunk,default_workers
+from pathfinding_algorithms import prepare_batch,solve_prepared
+
+class PlannerBusy(Exception):
+    """ Raised by AsyncPlanner.solve(wait=False) when the queue of searches is full. """
+
+class SearchCancelled(Exception):
+    """ Raised inside a search whose every requester has gone away, to stop it. """
+
+class _ThreadBackend:
+    """ Runs the searches of one grid version on the planner's thread pool. """
+    def __init__(self, grid:np.array, algorithm:Union[str,Callable], kwargs:dict, executor:ThreadPoolExecutor) -> None:
+        self.grid = grid
+        self.algorithm = algorithm
+        self.kwargs = kwargs
+        self.executor = executor
+        self.active = 0
+        self.retired = False
+        self._prepared = None
+        self._lock = threading.Lock()
+
+    def _solve(self, start:tuple, end:tuple, cancelled:threading.Event) -> Tuple[list,list]:
+        with self._lock:
+            if self._prepared is None:
+                self._prepared = prepare_batch(self.grid, self.algorithm, **self.kwargs)
+        grid, search, labels, kwargs = self._prepared
+        if "on_expand" in inspect.signature(search).parameters:
+            hook = kwargs.get("on_expand")
+            def on_expand(node) -> None:
+                if cancelled.is_set():
+                    raise SearchCancelled()
+                if hook is not None:
+                    hook(node)
+            kwargs = dict(kwargs, on_expand=on_expand)
+        return solve_prepared(grid, search, labels, start, end, **kwargs)
+
+    def submit(self, start:tuple, end:tuple, cancelled:threading.Event) -> Future:
+        return self.executor.submit(self._solve, start, end, cancelled)
+
+    def close(self) -> None:
+        self._prepared = None
+
+class _ProcessBackend:
+    """ Runs the searches of one grid version on a process pool attached to a shared memory copy of the grid. """
+    def __init__(self, grid:np.array, algorithm:Union[str,Callable], kwargs:dict, workers:int) -> None:
+        self.maze = SharedMaze(grid)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.maze.name, self.maze.grid_shape, self.maze.grid.dtype.str,
+                                                      algorithm, kwargs))
+        self.active = 0
+        self.retired = False
+
+    def submit(self, start:tuple, end:tuple, cancelled:threading.Event) -> Future:
+        # a running search in another process can not be told to stop; only queued ones are cancelled
+        future = Future()
+        chunk_future = self.executor.submit(_solve_chunk, [(0, (start, end))])
+        def done(chunk_future:Future) -> None:
+            if chunk_future.cancelled():
+                future.cancel()
+            elif chunk_future.exception() is not None:
+                future.set_exception(chunk_future.exception())
+            else:
+                future.set_result(chunk_future.result()[0][1])
+        chunk_future.add_done_callback(done)
+        future.add_done_callback(lambda future: chunk_future.cancel() if future.cancelled() else None)
+        return future
+
+    def close(self) -> None:
+        # the workers attached to the block when they started, so it can be unlinked without waiting for them
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.maze.close()
+
+class _Job:
+    __slots__ = ("key", "backend", "start", "end", "future", "waiters", "cancelled", "enqueue")
+
+    def __init__(self, key:tuple, backend, start:tuple, end:tuple, future:asyncio.Future) -> None:
+        self.key = key
+        self.backend = backend
+        self.start = start
+        self.end = end
+        self.future = future
+        self.waiters = 0
+        self.cancelled = threading.Event()
+        self.enqueue = None
+
+class AsyncPlanner:
+    """ A class to serve path queries to asyncio code without blocking the event loop.
+
+    This is a class that queues searches and runs them on a pool of threads or processes, while the event loop only
+    awaits their results. Requests for the same (grid version, start, end) that arrive while one is queued or running
+    share its result instead of searching again. At most workers searches run at once and at most max_queued more wait
+    in a bounded queue; once it is full, solve waits for room, or raises PlannerBusy with wait=False, so a burst of
+    requests slows its senders down instead of piling up work and latency.
+
+    A request that is cancelled (for example because its client disconnected) or runs past its timeout stops waiting
+    at once. The search itself is only dropped when no other request shares it: a queued search is never started, and a
+    running a_star, bfs or dfs on the thread pool stops at its next expansion. Searches in a process pool run to the end.
+
+    Every search runs on a copy of the grid taken at the version it was requested for, so update_cells can change the
+    maze while searches run. Searches of the new version get a fresh copy and per grid preparation
+    (see pathfinding_algorithms.prepare_batch); with pool="process" this also starts a new process pool.
+
+    Attributes
+    ----------
+        maze : Maze
+            the maze the queries are answered on.
+        algorithm : str/Callable
+            the name of an algorithm in pathfinding_algorithms.ALGORITHMS, or a function with the same signature.
+        workers : int
+            the largest number of searches that run at once.
+        max_queued : int
+            the largest number of searches that wait for a worker.
+        submitted : int
+            the number of searches queued.
+        coalesced : int
+            the number of requests that shared a search that was already queued or running.
+        cancelled : int
+            the number of searches dropped because every request for them went away.
+
+    Parameters
+    ----------
+        grid : numpy.array/Maze
+            a numpy array detailing the grid, or a Maze holding it
+        algorithm : str/Callable
+            the name of an algorithm in pathfinding_algorithms.ALGORITHMS, or a function with the same signature
+        workers : int/None
+            the number of searches that run at once; the number of usable CPUs if None
+        max_queued : int
+            the largest number of searches that wait for a worker
+        pool : str
+            "thread" to search on a thread pool in this process, or "process" for a process pool
+        **kwargs
+            keyword arguments passed on to the algorithm
+
+    Methods
+    -------
+        solve(start:tuple, end:tuple, wait:bool, timeout:float)
+            a coroutine that answers a query
+        update_cells(cells:list)
+            a method to change cells of the maze
+        close()
+            a coroutine that cancels the queued searches and shuts the pools down
+        info()
+            a method to get the counters of the planner
+    """
+    _pools = ("thread", "process")
+
+    def __init__(self, grid:Union[np.array,Maze], algorithm:Union[str,Callable] = "a_star",
+                 workers:Union[int,None] = None, max_queued:int = 64, pool:str = "thread", **kwargs) -> None:
+        if pool not in self._pools:
+            raise ValueError(f"pool must be one of {self._pools}, got {pool!r}")
+        workers = default_workers() if workers is None else workers
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if max_queued < 1:
+            raise ValueError(f"max_queued must be at least 1, got {max_queued}")
+        self.maze = grid if isinstance(grid, Maze) else Maze(grid)
+        self.algorithm = algorithm
+        self.workers = workers
+        self.max_queued = max_queued
+        self.pool = pool
+        self.kwargs = kwargs
+        self.submitted = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self._jobs = dict()
+        self._backend = None
+        self._backends = list()
+        self._queue = None
+        self._dispatchers = list()
+        self._executor = None
+        self._closed = False
+
+    def _current_backend(self):
+        version = self.maze.version
+        if self._backend is not None and self._backend.version == version:
+            return self._backend
+        if self._backend is not None:
+            self._retire(self._backend)
+        grid = np.array(self.maze.grid)
+        if self.pool == "process":
+            backend = _ProcessBackend(grid, self.algorithm, self.kwargs, self.workers)
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="planner")
+            backend = _ThreadBackend(grid, self.algorithm, self.kwargs, self._executor)
+        backend.version = version
+        self._backend = backend
+        self._backends.append(backend)
+        return backend
+
+    def _retire(self, backend) -> None:
+        backend.retired = True
+        if backend.active == 0:
+            self._backends.remove(backend)
+            backend.close()
+
+    def _start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queued)
+            self._dispatchers = [asyncio.ensure_future(self._dispatch()) for _ in range(self.workers)]
+
+    async def _dispatch(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+                try:
+                    result = await asyncio.wrap_future(job.backend.submit(job.start, job.end, job.cancelled))
+                except (SearchCancelled, asyncio.CancelledError):
+                    if not job.future.done():
+                        job.future.cancel()
+                    if self._closed:
+                        raise
+                except Exception as error:
+                    if not job.future.done():
+                        job.future.set_exception(error)
+                else:
+                    if not job.future.done():
+                        job.future.set_result(result)
+            finally:
+                self._finish(job)
+                self._queue.task_done()
+
+    def _finish(self, job:_Job) -> None:
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        job.backend.active -= 1
+        if job.backend.retired and job.backend.active == 0 and job.backend in self._backends:
+            self._backends.remove(job.backend)
+            job.backend.close()
+
+    def _release(self, job:_Job) -> None:
+        job.waiters -= 1
+        if job.waiters == 0 and not job.future.done():
+            # nobody is waiting for the result any more
+            job.cancelled.set()
+            job.future.cancel()
+            self.cancelled += 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            if job.enqueue is not None and not job.enqueue.done():
+                job.enqueue.cancel()
+
+    def _enqueued(self, job:_Job, enqueue:asyncio.Task) -> None:
+        if enqueue.cancelled():
+            # the job never reached the queue, so no dispatcher will finish it
+            self._finish(job)
+        else:
+            self.submitted += 1
+
+    async def solve(self, start:tuple, end:tuple, wait:bool = True,
+                    timeout:Union[float,None] = None) -> Tuple[list,list]:
+        """ A function to answer a query without blocking the event loop.
+
+        Parameters
+        ----------
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            wait : bool
+                if False, PlannerBusy is raised instead of waiting when the queue is full
+            timeout : float/None
+                the largest number of seconds to wait for the result; asyncio.TimeoutError is raised after it
+
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes and a list of nodes that are included in the path
+        """
+        if self._closed:
+            raise RuntimeError("the planner is closed")
+        self._start()
+        start = tuple(start)
+        end = tuple(end)
+        backend = self._current_backend()
+        key = (backend.version, start, end)
+        job = self._jobs.get(key)
+        if job is not None:
+            self.coalesced += 1
+        else:
+            job = _Job(key, backend, start, end, asyncio.get_running_loop().create_future())
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                if not wait:
+                    raise PlannerBusy(f"{self._queue.qsize()} searches are already queued")
+                # the put belongs to the job rather than to this request, so it goes on for the requests that share
+                # the job if this one is cancelled while it waits for room
+                job.enqueue = asyncio.ensure_future(self._queue.put(job))
+                job.enqueue.add_done_callback(lambda enqueue: self._enqueued(job, enqueue))
+            else:
+                self.submitted += 1
+            self._jobs[key] = job
+            backend.active += 1
+
+        job.waiters += 1
+        try:
+            visited_list, path_list = await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self._release(job)
+            raise
+        job.waiters -= 1
+        return list(visited_list), list(path_list)
+
+    def update_cells(self, cells:list) -> list:
+        """ A function to change cells of the maze.
+
+        Searches that are queued or running finish on the grid they were requested for; new requests search the
+        changed grid.
+
+        Parameters
+        ----------
+            cells : list
+                a list of (row, col, value) tuples
+
+        Returns
+        -------
+            changed : list
+                a list of the positions whose value changed
+        """
+        return self.maze.update_cells(cells)
+
+    async def close(self) -> None:
+        """ A function to cancel the queued and running searches and shut the pools down. """
+        self._closed = True
+        for job in list(self._jobs.values()):
+            job.cancelled.set()
+            if job.enqueue is not None and not job.enqueue.done():
+                job.enqueue.cancel()
+            if not job.future.done():
+                job.future.cancel()
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = list()
+        self._jobs.clear()
+        for backend in self._backends:
+            backend.close()
+        self._backends = list()
+        self._backend = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "AsyncPlanner":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def info(self) -> dict:
+        """ A function to get the counters of the planner.
+
+        Returns
+        -------
+            dict
+                a dictionary of the submitted, coalesced and cancelled searches, and the searches queued or running
+        """
+        return {"submitted": self.submitted, "coalesced": self.coalesced, "cancelled": self.cancelled,
+                "in_flight": len(self._jobs), "queued": self._queue.qsize() if self._queue is not None else 0}
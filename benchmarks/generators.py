@@ -0,0 +1,172 @@
+import random
+import numpy as np
+from typing import Callable,Tuple
+from data_structures import label_components
+
+def open_field(size:int, seed:int = 0) -> np.array:
+    """ A function that generates a grid without obstacles.
+
+    Parameters
+    ----------
+        size : int
+            the number of rows and columns
+        seed : int
+            unused; kept so every generator has the same signature
+
+    Returns
+    -------
+        grid : numpy.array
+            a uint8 array of zeros
+    """
+    return np.zeros((size, size), dtype=np.uint8)
+
+def random_obstacles(size:int, seed:int = 0, density:float = 0.2) -> np.array:
+    """ A function that generates a grid with cells blocked independently at random.
+
+    Parameters
+    ----------
+        size : int
+            the number of rows and columns
+        seed : int
+            the seed of the random generator
+        density : float
+            the chance of a cell being blocked
+
+    Returns
+    -------
+        grid : numpy.array
+            a uint8 array with 1 for blocked cells and 0 for accessible cells
+    """
+    return (np.random.default_rng(seed).random((size, size)) < density).astype(np.uint8)
+
+def recursive_division(size:int, seed:int = 0) -> np.array:
+    """ A function that generates a maze by recursive division.
+
+    The open grid is split by a wall with a single gap, and both halves are split again until the chambers are one cell
+    wide. Walls are placed on odd rows and columns and gaps on even ones, so every chamber stays connected to the rest.
+    Chambers are kept on a stack instead of the call stack, so large mazes do not hit the recursion limit.
+
+    Parameters
+    ----------
+        size : int
+            the number of rows and columns
+        seed : int
+            the seed of the random generator
+
+    Returns
+    -------
+        grid : numpy.array
+            a uint8 array with 1 for walls and 0 for passages
+    """
+    rng = random.Random(seed)
+    grid = np.zeros((size, size), dtype=np.uint8)
+    # (top, left, bottom, right) of open chambers, inclusive; top and left are always even
+    chambers = [(0, 0, size - 1, size - 1)]
+    while chambers:
+        top, left, bottom, right = chambers.pop()
+        height = bottom - top + 1
+        width = right - left + 1
+        if height < 3 and width < 3:
+            continue
+        if height > width or (height == width and rng.random() < 0.5):
+            if height < 3:
+                continue
+            wall = rng.randrange(top + 1, bottom, 2)
+            grid[wall, left:right + 1] = 1
+            grid[wall, rng.randrange(left, right + 1, 2)] = 0
+            chambers.append((top, left, wall - 1, right))
+            chambers.append((wall + 1, left, bottom, right))
+        else:
+            wall = rng.randrange(left + 1, right, 2)
+            grid[top:bottom + 1, wall] = 1
+            grid[rng.randrange(top, bottom + 1, 2), wall] = 0
+            chambers.append((top, left, bottom, wall - 1))
+            chambers.append((top, wall + 1, bottom, right))
+    return grid
+
+def rooms_and_corridors(size:int, seed:int = 0) -> np.array:
+    """ A function that generates rectangular rooms joined by corridors.
+
+    Rooms of random size are carved out of a solid grid, and every room is joined to the previous one by an L shaped
+    corridor, so all rooms are connected.
+
+    Parameters
+    ----------
+        size : int
+            the number of rows and columns
+        seed : int
+            the seed of the random generator
+
+    Returns
+    -------
+        grid : numpy.array
+            a uint8 array with 1 for walls and 0 for rooms and corridors
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.ones((size, size), dtype=np.uint8)
+    largest = max(4, size // 8)
+    corridor = max(1, size // 256)
+    previous = None
+    for _ in range(max(2, size * size // (largest * largest))):
+        height, width = rng.integers(3, largest + 1, size=2)
+        top = int(rng.integers(0, max(1, size - height)))
+        left = int(rng.integers(0, max(1, size - width)))
+        grid[top:top + height, left:left + width] = 0
+        center = (top + int(height) // 2, left + int(width) // 2)
+        if previous is not None:
+            (row_a, col_a), (row_b, col_b) = previous, center
+            grid[row_a:row_a + corridor, min(col_a, col_b):max(col_a, col_b) + 1] = 0
+            grid[min(row_a, row_b):max(row_a, row_b) + 1, col_b:col_b + corridor] = 0
+        previous = center
+    return grid
+
+GENERATORS = {
+    "open": open_field,
+    "random_10": lambda size, seed=0: random_obstacles(size, seed, density=0.1),
+    "random_25": lambda size, seed=0: random_obstacles(size, seed, density=0.25),
+    "random_35": lambda size, seed=0: random_obstacles(size, seed, density=0.35),
+    "maze": recursive_division,
+    "rooms": rooms_and_corridors,
+}
+
+def get_generator(name:str) -> Callable:
+    """ A function to look up a generator by name.
+
+    Parameters
+    ----------
+        name : str
+            the name of a generator in GENERATORS
+
+    Returns
+    -------
+        Callable
+            a function of (size, seed) that returns a grid
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"unknown generator {name!r}, expected one of {tuple(GENERATORS)}")
+    return GENERATORS[name]
+
+def pick_endpoints(grid:np.array) -> Tuple[tuple,tuple]:
+    """ A function to pick a start and an end that every algorithm can connect.
+
+    The start and end are the accessible cells closest to the top left and bottom right corners within the largest
+    component of the 4_wind neighborhood, so they are connected for every built in neighborhood.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+
+    Returns
+    -------
+        Tuple[tuple,tuple]
+            the start and end positions
+    """
+    labels = label_components(grid, "4_wind")
+    if labels.max() < 0:
+        raise ValueError("grid has no accessible cells")
+    largest = np.bincount(labels[labels >= 0]).argmax()
+    rows, cols = np.nonzero(labels == largest)
+    corner_distance = rows + cols
+    first, last = corner_distance.argmin(), corner_distance.argmax()
+    return (int(rows[first]), int(cols[first])), (int(rows[last]), int(cols[last]))
@@ -0,0 +1,316 @@
+""" Reproducible benchmarks of the search engines on generated grids.
+
+Every case is a generator, a size and an engine. The grids are generated from a fixed seed, so every run searches the
+same grids between the same endpoints, and the results are written as JSON. Passing a stored result file as the
+baseline compares every case against it and exits with status 1 if any of them expanded more nodes, found a costlier
+path or no path at all. Growth in time and peak memory is only printed as a warning, since it also shows up between
+two runs of the same code; pass --fail-on-time to fail on it as well.
+
+    python benchmarks/run_benchmarks.py --profile quick --output results.json
+    python benchmarks/run_benchmarks.py --profile quick --baseline results.json
+"""
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable,Iterable,Union
+from pathfinding_algorithms import (a_star,bfs,dfs,iddfs,ida_star,bidirectional_bfs,bidirectional_a_star,jps,
+                                    JumpPointTable,path_cost)
+from hierarchical import HierarchicalMaze,hpa_star
+from replanning import DStarLite
+from flow_fields import FlowField
+from grid_io import save_npy,load_npy
+from search_stats import SearchStats
+from benchmarks.generators import GENERATORS,get_generator,pick_endpoints
+
+# grids with more cells than this keep their visited nodes in flat arrays
+ARRAY_BACKEND_CELLS = 1024 * 1024
+
+PROFILES = {
+    "quick": {"sizes": (64, 256), "repeat": 3},
+    "standard": {"sizes": (64, 256, 1024), "repeat": 3},
+    "full": {"sizes": (64, 256, 1024, 4096), "repeat": 1},
+}
+
+def _backend(grid:np.array) -> str:
+    return "array" if grid.size > ARRAY_BACKEND_CELLS else "list"
+
+def _stats_engine(search:Callable, **kwargs) -> Callable:
+    def prepare(grid:np.array) -> Callable:
+        def run(start:tuple, end:tuple, stats:SearchStats) -> tuple:
+            return search(grid, start, end, lightweight=True, backend=_backend(grid), stats=stats, **kwargs)
+        return run
+    return prepare
+
+def _plain_engine(search:Callable, uses_nodes:bool = True) -> Callable:
+    def prepare(grid:np.array) -> Callable:
+        def run(start:tuple, end:tuple, stats:SearchStats) -> tuple:
+            if uses_nodes:
+                return search(grid, start, end, lightweight=True, backend=_backend(grid))
+            return search(grid, start, end)
+        return run
+    return prepare
+
+def _jps(grid:np.array) -> Callable:
+    table = JumpPointTable(grid)
+    return lambda start, end, stats: jps(grid, start, end, jump_table=table)
+
+def _hpa_star(grid:np.array) -> Callable:
+    maze = HierarchicalMaze(grid, cluster_size=max(10, grid.shape[0] // 32))
+    return lambda start, end, stats: hpa_star(maze, start, end)
+
+def _d_star_lite(grid:np.array) -> Callable:
+    def run(start:tuple, end:tuple, stats:SearchStats) -> tuple:
+        return DStarLite(grid, start, end).plan()
+    return run
+
+def _flow_field(grid:np.array) -> Callable:
+    def run(start:tuple, end:tuple, stats:SearchStats) -> tuple:
+        field = FlowField(grid, [end])
+        path_list = field.path_from(start)
+        # the field sweeps every reachable cell, so they all count as expanded
+        stats.expanded = int(np.isfinite(field.distances).sum())
+        return [], path_list
+    return run
+
+# metrics that differ between runs of the same code, so compare reports them but main only fails on them if asked to
+MEASURED_METRICS = ("time", "peak_memory")
+
+# engine name -> function of a grid that does the per grid work and returns a function of (start, end, stats)
+ENGINES = {
+    "bfs": _stats_engine(bfs),
+    "dfs": _stats_engine(dfs),
+    "a_star": _stats_engine(a_star),
+    "a_star_bucket": _stats_engine(a_star, queue="bucket"),
+    "iddfs": _plain_engine(iddfs, uses_nodes=False),
+    "ida_star": _plain_engine(ida_star, uses_nodes=False),
+    "bidirectional_bfs": _plain_engine(bidirectional_bfs),
+    "bidirectional_a_star": _plain_engine(bidirectional_a_star),
+    "jps": _jps,
+    "hpa_star": _hpa_star,
+    "d_star_lite": _d_star_lite,
+    "flow_field": _flow_field,
+}
+
+# iddfs and ida_star search every position again in each iteration, which takes minutes on the larger mazes, so they
+# only run when asked for
+DEFAULT_ENGINES = tuple(engine for engine in ENGINES if engine not in ("iddfs", "ida_star"))
+
+def load_corpus(generator:str, size:int, seed:int, corpus_dir:Union[str,None] = None) -> np.array:
+    """ A function to generate a grid, or load it from the corpus directory if it was generated before.
+
+    Parameters
+    ----------
+        generator : str
+            the name of a generator in generators.GENERATORS
+        size : int
+            the number of rows and columns
+        seed : int
+            the seed of the generator
+        corpus_dir : str/None
+            a directory to keep generated grids in as .npy files, or None to always generate them
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid
+    """
+    if corpus_dir is None:
+        return get_generator(generator)(size, seed)
+    path = os.path.join(corpus_dir, f"{generator}-{size}-{seed}.npy")
+    if not os.path.exists(path):
+        os.makedirs(corpus_dir, exist_ok=True)
+        save_npy(path, get_generator(generator)(size, seed))
+    return load_npy(path, mmap_mode=None)
+
+def run_case(grid:np.array, engine:str, repeat:int = 3, memory:bool = True) -> dict:
+    """ A function that benchmarks one engine on one grid.
+
+    The per grid work is timed once, and the search between pick_endpoints' start and end is timed repeat times, of
+    which the fastest is kept. If memory is True, the engine is run once more under tracemalloc for its peak memory;
+    that run is not timed.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        engine : str
+            the name of an engine in ENGINES
+        repeat : int
+            the number of timed searches
+        memory : bool
+            if True, the peak memory of the per grid work and one search is measured
+
+    Returns
+    -------
+        dict
+            the prepare_time and time in seconds, the expanded nodes, the path length and cost, and the peak_memory
+            in bytes (None if not measured)
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {tuple(ENGINES)}")
+    start, end = pick_endpoints(grid)
+    began = time.perf_counter()
+    search = ENGINES[engine](grid)
+    prepare_time = time.perf_counter() - began
+
+    times = list()
+    for _ in range(max(1, repeat)):
+        stats = SearchStats()
+        began = time.perf_counter()
+        visited_list, path_list = search(start, end, stats)
+        times.append(time.perf_counter() - began)
+    # engines without stats report the length of their visited list
+    expanded = stats.expanded or (len(visited_list) if visited_list[:1] != [None] else 0)
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        try:
+            ENGINES[engine](grid)(start, end, SearchStats())
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    found = path_list[:1] != [None]
+    return {"start": list(start), "end": list(end), "prepare_time": prepare_time, "time": min(times),
+            "expanded": expanded, "found": found, "path_length": len(path_list) if found else 0,
+            "path_cost": path_cost(path_list) if found else None, "peak_memory": peak_memory}
+
+def run_benchmarks(sizes:Iterable = PROFILES["quick"]["sizes"], generators:Iterable = tuple(GENERATORS),
+                   engines:Iterable = ("bfs", "dfs", "a_star"), repeat:int = 3, seed:int = 0, memory:bool = True,
+                   corpus_dir:Union[str,None] = None, log:Union[Callable,None] = None) -> dict:
+    """ A function that benchmarks every engine on every generated grid.
+
+    Parameters
+    ----------
+        sizes : Iterable
+            the sizes of the grids
+        generators : Iterable
+            the names of the generators
+        engines : Iterable
+            the names of the engines
+        repeat : int
+            the number of timed searches per case
+        seed : int
+            the seed of the generators
+        memory : bool
+            if True, the peak memory of every case is measured
+        corpus_dir : str/None
+            a directory to keep generated grids in, or None to always generate them
+        log : Callable/None
+            a function called with a line of progress after every case
+
+    Returns
+    -------
+        dict
+            the environment, the settings and a results dictionary keyed by "generator/size/engine"
+    """
+    results = dict()
+    for size in sizes:
+        for generator in generators:
+            grid = load_corpus(generator, size, seed, corpus_dir)
+            for engine in engines:
+                key = f"{generator}/{size}/{engine}"
+                results[key] = run_case(grid, engine, repeat=repeat, memory=memory)
+                if log is not None:
+                    log(f"{key}: {results[key]['time']:.4f}s, {results[key]['expanded']} expanded")
+    return {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "platform": platform.platform(), "machine": platform.machine()},
+        "settings": {"seed": seed, "repeat": repeat, "sizes": list(sizes), "generators": list(generators),
+                     "engines": list(engines)},
+        "results": results,
+    }
+
+def compare(results:dict, baseline:dict, tolerance:float = 0.25, min_time:float = 0.005) -> list:
+    """ A function that compares benchmark results with a baseline.
+
+    A case regressed if its time or peak memory grew by more than tolerance (times below min_time in both runs are too
+    noisy to compare), or if it expanded more nodes, found a costlier path or no path, which are deterministic. Cases
+    that only one of the two ran are skipped. Time and peak memory (see MEASURED_METRICS) also vary between runs of
+    the same code, so a caller that gates on the result should treat them as warnings.
+
+    Parameters
+    ----------
+        results : dict
+            the output of run_benchmarks
+        baseline : dict
+            an earlier output of run_benchmarks
+        tolerance : float
+            the allowed relative growth of time and peak memory
+        min_time : float
+            the time in seconds under which times are not compared
+
+    Returns
+    -------
+        list
+            a list of (case, metric, baseline value, new value) tuples, one per regression
+    """
+    regressions = list()
+    for key, case in results["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        if max(case["time"], old["time"]) >= min_time and case["time"] > old["time"] * (1 + tolerance):
+            regressions.append((key, "time", old["time"], case["time"]))
+        if case["peak_memory"] is not None and old.get("peak_memory") is not None and \
+                case["peak_memory"] > old["peak_memory"] * (1 + tolerance):
+            regressions.append((key, "peak_memory", old["peak_memory"], case["peak_memory"]))
+        for metric in ("expanded", "path_cost"):
+            if old.get(metric) is not None and case[metric] is not None and case[metric] > old[metric]:
+                regressions.append((key, metric, old[metric], case[metric]))
+        if old.get("found") and not case["found"]:
+            regressions.append((key, "found", True, False))
+    return regressions
+
+def main(argv:Union[list,None] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=tuple(PROFILES), default="quick")
+    parser.add_argument("--sizes", type=int, nargs="+", help="overrides the sizes of the profile")
+    parser.add_argument("--generators", nargs="+", choices=tuple(GENERATORS), default=tuple(GENERATORS))
+    parser.add_argument("--engines", nargs="+", choices=tuple(ENGINES), default=DEFAULT_ENGINES)
+    parser.add_argument("--repeat", type=int, help="overrides the repeats of the profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run of every case")
+    parser.add_argument("--corpus-dir", help="a directory to keep generated grids in between runs")
+    parser.add_argument("--output", help="a file to write the results to as JSON")
+    parser.add_argument("--baseline", help="a results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="the allowed relative growth of time and memory")
+    parser.add_argument("--min-time", type=float, default=0.005, help="the time in seconds under which times are not "
+                                                                      "compared")
+    parser.add_argument("--fail-on-time", action="store_true",
+                        help="exit with status 1 on growth in time and peak memory too, not only warn about it")
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    results = run_benchmarks(sizes=args.sizes or profile["sizes"], generators=args.generators, engines=args.engines,
+                             repeat=args.repeat or profile["repeat"], seed=args.seed, memory=not args.no_memory,
+                             corpus_dir=args.corpus_dir, log=lambda line: print(line, file=sys.stderr))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), tolerance=args.tolerance, min_time=args.min_time)
+        failed = False
+        for key, metric, old, new in regressions:
+            if metric in MEASURED_METRICS and not args.fail_on_time:
+                print(f"WARNING {key} {metric}: {old} -> {new}", file=sys.stderr)
+            else:
+                print(f"REGRESSION {key} {metric}: {old} -> {new}", file=sys.stderr)
+                failed = True
+        return 1 if failed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
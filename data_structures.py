@@ -1,6 +1,590 @@
 import numpy as np
 import math
+import array
+import heapq
+import itertools
 from typing import Tuple,Union
+from grid_io import load_grid
+
+DIAGONAL_LINE_COST = 14
+STRAIGHT_LINE_COST = 10
+
+# help visualize directions
+FOUR_WIND = {
+    "north": {
+        "calc": [-1, 0],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "east": {
+        "calc": [0, 1],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "south": {
+        "calc": [1, 0],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "west": {
+        "calc": [0, -1],
+        "cost": STRAIGHT_LINE_COST
+    }
+}
+
+EIGHT_WIND = {
+    "north_west": {
+        "calc": [-1, -1],
+        "cost": DIAGONAL_LINE_COST
+    },
+    "north": {
+        "calc": [-1, 0],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "north_east": {
+        "calc": [-1, 1],
+        "cost": DIAGONAL_LINE_COST
+    },
+
+    "west": {
+        "calc": [0, -1],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "east": {
+        "calc": [0, 1],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "south_west": {
+        "calc": [1, -1],
+        "cost": DIAGONAL_LINE_COST
+    },
+    "south": {
+        "calc": [1, 0],
+        "cost": STRAIGHT_LINE_COST
+    },
+    "south_east": {
+        "calc": [1, 1],
+        "cost": DIAGONAL_LINE_COST
+    },
+}
+
+# flattened (row offset, column offset, cost) tables shared by every node of a neighborhood
+NEIGHBOR_OFFSETS = {
+    "4_wind": tuple((value["calc"][0], value["calc"][1], value["cost"]) for value in FOUR_WIND.values()),
+    "8_wind": tuple((value["calc"][0], value["calc"][1], value["cost"]) for value in EIGHT_WIND.values()),
+    "8_wind_no_corner_cutting": tuple((value["calc"][0], value["calc"][1], value["cost"]) for value in EIGHT_WIND.values()),
+}
+
+# in weighted grids a cell value is the multiplier of the cost of stepping into it; cells of IMPASSABLE (or any value
+# that is not above 0) can not be entered
+IMPASSABLE = -1
+
+# neighborhoods where a diagonal step is only accessible if both orthogonal cells it passes are accessible
+NO_CORNER_CUTTING = {"8_wind_no_corner_cutting"}
+
+def register_neighborhood(name:str, offsets:tuple, corner_cutting:bool = True) -> None:
+    """ A function to register a neighborhood that nodes can be created with.
+
+    Parameters
+    ----------
+    name : str
+        a string that the neighborhood is selected by
+    offsets : tuple
+        a tuple of (row offset, column offset, cost) tuples
+    corner_cutting : bool
+        if False, diagonal steps are only accessible when both orthogonal cells next to them are accessible
+    """
+    NEIGHBOR_OFFSETS[name] = tuple((int(row_offset), int(col_offset), cost) for row_offset, col_offset, cost in offsets)
+    if corner_cutting:
+        NO_CORNER_CUTTING.discard(name)
+    else:
+        NO_CORNER_CUTTING.add(name)
+
+def get_neighborhood(name:str) -> tuple:
+    """ A function to get the offset table of a registered neighborhood.
+
+    Parameters
+    ----------
+    name : str
+        a string that represents a registered neighborhood
+
+    Returns
+    -------
+    offsets : tuple
+        a tuple of (row offset, column offset, cost) tuples
+    """
+    try:
+        return NEIGHBOR_OFFSETS[name]
+    except KeyError:
+        raise ValueError(f"unknown neighbors {name!r}, expected one of {tuple(NEIGHBOR_OFFSETS)}") from None
+
+def passable_steps(grid:np.array, neighbors:str = "8_wind") -> list:
+    """ A function to find every accessible step in a grid.
+
+    Parameters
+    ----------
+    grid : numpy.array
+        a numpy.array object with integer values.
+    neighbors : str
+        a string that represents a registered neighborhood
+
+    Returns
+    -------
+    steps : list
+        a list of (from, to) pairs of flat index arrays, one pair per offset of the neighborhood
+    """
+    rows, cols = grid.shape
+    free = free_cells(grid)
+    check_corners = neighbors in NO_CORNER_CUTTING
+    flat_index = np.arange(rows * cols).reshape(rows, cols)
+    steps = list()
+    for row_offset, col_offset, _ in get_neighborhood(neighbors):
+        # the cells that have a neighbor at this offset, and those neighbors
+        from_rows = slice(max(0, -row_offset), rows - max(0, row_offset))
+        from_cols = slice(max(0, -col_offset), cols - max(0, col_offset))
+        to_rows = slice(max(0, row_offset), rows + min(0, row_offset))
+        to_cols = slice(max(0, col_offset), cols + min(0, col_offset))
+        accessible = free[from_rows, from_cols] & free[to_rows, to_cols]
+        if check_corners and row_offset and col_offset:
+            accessible &= free[to_rows, from_cols] & free[from_rows, to_cols]
+        steps.append((flat_index[from_rows, from_cols][accessible], flat_index[to_rows, to_cols][accessible]))
+    return steps
+
+def label_components(grid:np.array, neighbors:str = "8_wind") -> np.array:
+    """ A function to label the connected components of the accessible cells in a grid.
+
+    This is a function that runs a vectorized union-find over every accessible step of the neighborhood: each round
+    hooks the root of the larger label under the smaller one, then compresses the trees with pointer jumping, until
+    both ends of every step share a root. Two positions are connected exactly when they have the same label, which
+    assumes the neighborhood is symmetric, like every built in neighborhood.
+
+    Parameters
+    ----------
+    grid : numpy.array
+        a numpy.array object with integer values.
+    neighbors : str
+        a string that represents a registered neighborhood
+
+    Returns
+    -------
+    labels : numpy.array
+        an int32 array shaped like the grid with a component number per accessible cell, and -1 for blocked cells
+    """
+    steps = passable_steps(grid, neighbors)
+    from_index = np.concatenate([step[0] for step in steps])
+    to_index = np.concatenate([step[1] for step in steps])
+    parents = np.arange(grid.size)
+    while True:
+        from_roots = parents[from_index]
+        to_roots = parents[to_index]
+        unmerged = from_roots != to_roots
+        if not unmerged.any():
+            break
+        np.minimum.at(parents, np.maximum(from_roots, to_roots)[unmerged], np.minimum(from_roots, to_roots)[unmerged])
+        while True:
+            jumped = parents[parents]
+            if np.array_equal(jumped, parents):
+                break
+            parents = jumped
+
+    free = free_cells(grid).ravel()
+    labels = np.full(grid.size, -1, dtype=np.int32)
+    labels[free] = np.unique(parents[free], return_inverse=True)[1]
+    return labels.reshape(grid.shape)
+
+def free_cells(grid) -> np.array:
+    """ A function to get the accessible cells of a grid as a bool array.
+
+    Parameters
+    ----------
+    grid : numpy.array/BitGrid
+        a numpy.array object with integer values, or a BitGrid
+
+    Returns
+    -------
+    free : numpy.array
+        a bool array shaped like the grid that is True for accessible cells
+    """
+    if isinstance(grid, BitGrid):
+        return grid.free_mask()
+    return np.asarray(grid) == 0
+
+class BitGrid:
+    """ A class to hold the occupancy of a grid with one bit per cell.
+
+    This is a class that packs a grid with np.packbits so every cell takes a single bit (set for blocked cells), which is
+    64 times smaller than an int64 grid and lets large grids fit in cache. It can be used wherever a grid is expected:
+    indexing a single cell with grid[row, col] reads the bit from a bytearray without numpy, indexing anything else
+    unpacks only the rows that are asked for, and np.asarray unpacks the whole grid. Setting single cells is supported,
+    so a Maze can update it. Batches of cells are looked up with is_free and neighbor_mask.
+
+    Attributes
+    ----------
+        shape : tuple
+            a tuple detailing the bounds of the grid.
+        bits : numpy.array
+            a uint8 array shaped (rows, ceil(cols / 8)) with the packed bits, sharing memory with the bytearray.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values; non zero cells are blocked.
+
+    Methods
+    -------
+        is_free(rows:np.array, cols:np.array)
+            a method to look up the accessibility of many cells at once
+        neighbor_mask(rows:np.array, cols:np.array, neighbors:str)
+            a method to look up the accessibility of the neighbors of many cells at once
+        free_mask()
+            a method to unpack the accessible cells into a bool array
+        copy()
+            a method to copy the grid
+    """
+    ndim = 2
+    dtype = np.dtype(np.uint8)
+
+    def __init__(self, grid:np.array) -> None:
+        grid = np.asarray(grid)
+        if grid.ndim != 2:
+            raise ValueError(f"grid must be 2 dimensional, got {grid.ndim} dimensions")
+        self.shape = grid.shape
+        self._stride = -(-grid.shape[1] // 8)
+        self._bytes = bytearray(np.packbits(grid != 0, axis=1).tobytes())
+        self.bits = np.frombuffer(self._bytes, dtype=np.uint8).reshape(grid.shape[0], self._stride)
+
+    @property
+    def size(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bytes)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if type(key) is tuple and len(key) == 2:
+            row, col = key
+            if type(row) is int and type(col) is int and 0 <= row < self.shape[0] and 0 <= col < self.shape[1]:
+                return (self._bytes[row * self._stride + (col >> 3)] >> (7 - (col & 7))) & 1
+            return np.unpackbits(self.bits[row], axis=-1, count=self.shape[1])[..., col]
+        return np.unpackbits(self.bits[key], axis=-1, count=self.shape[1])
+
+    def __setitem__(self, key:tuple, value:int) -> None:
+        row, col = key
+        if not (0 <= row < self.shape[0] and 0 <= col < self.shape[1]):
+            raise IndexError(f"index {key} is out of bounds for a grid shaped {self.shape}")
+        index = int(row) * self._stride + (int(col) >> 3)
+        mask = 1 << (7 - (int(col) & 7))
+        if value:
+            self._bytes[index] |= mask
+        else:
+            self._bytes[index] &= ~mask & 0xFF
+
+    def __array__(self, dtype=None, copy=None) -> np.array:
+        grid = np.unpackbits(self.bits, axis=1, count=self.shape[1])
+        return grid if dtype is None else grid.astype(dtype)
+
+    def is_free(self, rows:np.array, cols:np.array) -> np.array:
+        """ A function to look up the accessibility of many cells at once.
+
+        Parameters
+        ----------
+        rows : numpy.array
+            an array of row indexes
+        cols : numpy.array
+            an array of column indexes, the same shape as rows
+
+        Returns
+        -------
+        numpy.array
+            a bool array that is True for cells in the grid that are accessible
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        inside = (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+        safe_rows = np.where(inside, rows, 0)
+        safe_cols = np.where(inside, cols, 0)
+        blocked = (self.bits[safe_rows, safe_cols >> 3] >> (7 - (safe_cols & 7))) & 1
+        return inside & (blocked == 0)
+
+    def neighbor_mask(self, rows:np.array, cols:np.array, neighbors:str = "8_wind") -> np.array:
+        """ A function to look up the accessibility of the neighbors of many cells at once.
+
+        Parameters
+        ----------
+        rows : numpy.array
+            a 1d array of row indexes
+        cols : numpy.array
+            a 1d array of column indexes
+        neighbors : str
+            a string that represents a registered neighborhood
+
+        Returns
+        -------
+        numpy.array
+            a bool array shaped (cells, offsets) that is True where the step along the offset is accessible
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        offsets = get_neighborhood(neighbors)
+        check_corners = neighbors in NO_CORNER_CUTTING
+        mask = np.empty((len(rows), len(offsets)), dtype=bool)
+        for index, (row_offset, col_offset, _) in enumerate(offsets):
+            access = self.is_free(rows + row_offset, cols + col_offset)
+            if check_corners and row_offset and col_offset:
+                access &= self.is_free(rows + row_offset, cols) & self.is_free(rows, cols + col_offset)
+            mask[:, index] = access
+        return mask
+
+    def free_mask(self) -> np.array:
+        return np.unpackbits(self.bits, axis=1, count=self.shape[1]) == 0
+
+    def copy(self) -> "BitGrid":
+        grid = BitGrid.__new__(BitGrid)
+        grid.shape = self.shape
+        grid._stride = self._stride
+        grid._bytes = bytearray(self._bytes)
+        grid.bits = np.frombuffer(grid._bytes, dtype=np.uint8).reshape(self.shape[0], self._stride)
+        return grid
+
+    def __repr__(self) -> str:
+        return f"BitGrid(shape={self.shape}, nbytes={self.nbytes})"
+
+# neighborhoods whose connected components are the same as those of a built in connectivity; a diagonal step that
+# may not cut corners can always be replaced by two straight steps
+CONNECTIVITY = {"4_wind": "4_wind", "8_wind_no_corner_cutting": "4_wind", "8_wind": "8_wind"}
+
+class ComponentIndex:
+    """ A class to answer whether two positions are connected in constant time.
+
+    This is a class that labels the connected components of the accessible cells of a grid once with
+    label_components, and keeps the labels up to date as single cells are blocked or unblocked, so a search can tell
+    that its end can not be reached before it floods everything reachable from the start. Labels are joined by a
+    union-find over component numbers. Unblocking a cell joins the components around it. Blocking a cell first checks
+    whether its neighbors stay connected around it within the 3x3 block around the cell, which is the common case.
+    Otherwise a breadth first search is started from each group of neighbors, one step of each at a time; searches that
+    meet are merged, and a search that runs out of cells first has found a part that was split off, which gets a new
+    label. The work of a split is about the size of the smaller parts.
+
+    The neighborhoods 4_wind and 8_wind_no_corner_cutting have the same components, so they share the 4_wind
+    connectivity. Other registered neighborhoods are supported, but every update of them labels the grid again.
+
+    Attributes
+    ----------
+        grid : numpy.array/BitGrid
+            the grid the components are labeled in; cells that are 0 are accessible.
+        grid_shape : tuple
+            a tuple detailing the bounds of the grid.
+        connectivity : str
+            the neighborhood the components are labeled for.
+
+    Parameters
+    ----------
+        grid : numpy.array/BitGrid
+            a numpy.array object with integer values, or a BitGrid.
+        neighbors : str
+            a string that represents a registered neighborhood
+
+    Methods
+    -------
+        label(position:tuple)
+            a method to get the component of a position
+        connected(start:tuple, end:tuple)
+            a method to check whether there is a path between two positions
+        update(positions:list)
+            a method to bring the labels of changed cells up to date with the grid
+        rebuild()
+            a method to label the whole grid again
+    """
+    # updates of more than this fraction of the cells label the whole grid again instead
+    rebuild_fraction = 1 / 16
+
+    def __init__(self, grid, neighbors:str = "8_wind") -> None:
+        get_neighborhood(neighbors)
+        self.grid = grid
+        self.grid_shape = grid.shape
+        self.connectivity = CONNECTIVITY.get(neighbors, neighbors)
+        self._incremental = self.connectivity in CONNECTIVITY.values()
+        self._offsets = tuple((row_offset, col_offset) for row_offset, col_offset, _ in
+                              get_neighborhood(self.connectivity))
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        labels = label_components(self.grid, self.connectivity).ravel()
+        self._labels = labels
+        self._free = labels >= 0
+        self._parents = list(range(int(labels.max()) + 1))
+
+    def _find(self, label:int) -> int:
+        parents = self._parents
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    def _neighbors(self, index:int, free:bool = True) -> list:
+        cols = self.grid_shape[1]
+        row, col = divmod(index, cols)
+        neighbors = list()
+        for row_offset, col_offset in self._offsets:
+            child_row = row + row_offset
+            child_col = col + col_offset
+            if 0 <= child_row < self.grid_shape[0] and 0 <= child_col < cols:
+                child = child_row * cols + child_col
+                if not free or self._free[child]:
+                    neighbors.append(child)
+        return neighbors
+
+    def label(self, position:tuple) -> int:
+        """ A function to get the component of a position.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple containing a location in the grid
+
+        Returns
+        -------
+            int
+                the number of the component; -1 for blocked cells. Numbers are only comparable until the next update
+        """
+        label = self._labels[position[0] * self.grid_shape[1] + position[1]]
+        return -1 if label < 0 else self._find(int(label))
+
+    def connected(self, start:tuple, end:tuple) -> bool:
+        """ A function to check whether there is a path between two positions.
+
+        Parameters
+        ----------
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+
+        Returns
+        -------
+            bool
+                True if both positions are accessible and in the same component
+        """
+        label = self.label(start)
+        return label >= 0 and label == self.label(end)
+
+    def update(self, positions:list) -> None:
+        """ A function to bring the labels of changed cells up to date with the grid.
+
+        Maze.update_cells calls this for the indexes made by Maze.components, so it is only needed for grids that are
+        changed in another way.
+
+        Parameters
+        ----------
+            positions : list
+                a list of the positions whose value changed
+        """
+        if not self._incremental or len(positions) > self.rebuild_fraction * self._labels.size:
+            self.rebuild()
+            return
+        for row, col in positions:
+            index = row * self.grid_shape[1] + col
+            free = self.grid[row, col] == 0
+            if free and not self._free[index]:
+                self._unblock(index)
+            elif not free and self._free[index]:
+                self._block(index)
+
+    def _unblock(self, index:int) -> None:
+        self._free[index] = True
+        roots = {self._find(int(self._labels[neighbor])) for neighbor in self._neighbors(index)}
+        if not roots:
+            self._parents.append(len(self._parents))
+            self._labels[index] = len(self._parents) - 1
+            return
+        root = min(roots)
+        for other in roots:
+            self._parents[other] = root
+        self._labels[index] = root
+
+    def _block(self, index:int) -> None:
+        self._free[index] = False
+        self._labels[index] = -1
+        neighbors = self._neighbors(index)
+        if len(neighbors) < 2:
+            return
+        groups = self._local_groups(index, neighbors)
+        if len(groups) < 2:
+            return
+
+        # one breadth first search per group, merged when they meet, until a single one is left
+        owner = dict()
+        queues = dict()
+        cells = dict()
+        for search, group in enumerate(groups):
+            owner.update((cell, search) for cell in group)
+            queues[search] = list(group)
+            cells[search] = list(group)
+        merged = list(range(len(groups)))
+
+        def find(search:int) -> int:
+            while merged[search] != search:
+                merged[search] = merged[merged[search]]
+                search = merged[search]
+            return search
+
+        heads = dict.fromkeys(queues, 0)
+        while len(queues) > 1:
+            for search in list(queues):
+                if search not in queues:
+                    continue
+                queue = queues[search]
+                if heads[search] == len(queue):
+                    # nothing else can be reached, so this part is cut off from the rest
+                    del queues[search]
+                    self._parents.append(len(self._parents))
+                    self._labels[cells.pop(search)] = len(self._parents) - 1
+                    if len(queues) == 1:
+                        break
+                    continue
+                cell = queue[heads[search]]
+                heads[search] += 1
+                for neighbor in self._neighbors(cell):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        queue.append(neighbor)
+                        cells[search].append(neighbor)
+                        continue
+                    other = find(other)
+                    if other != search:
+                        merged[other] = search
+                        queue.extend(queues[other][heads.pop(other):])
+                        cells[search].extend(cells.pop(other))
+                        del queues[other]
+                if len(queues) == 1:
+                    break
+
+    def _local_groups(self, index:int, neighbors:list) -> list:
+        # the neighbors joined by paths inside the 3x3 block around the blocked cell
+        cols = self.grid_shape[1]
+        row, col = divmod(index, cols)
+        def inside(cell:int) -> bool:
+            cell_row, cell_col = divmod(cell, cols)
+            return abs(cell_row - row) <= 1 and abs(cell_col - col) <= 1
+        groups = list()
+        seen = set()
+        for neighbor in neighbors:
+            if neighbor in seen:
+                continue
+            group = [neighbor]
+            seen.add(neighbor)
+            for cell in group:
+                for child in self._neighbors(cell):
+                    if child not in seen and inside(child):
+                        seen.add(child)
+                        group.append(child)
+            groups.append(group)
+        return groups
+
+    def __repr__(self) -> str:
+        return f"ComponentIndex(shape={self.grid_shape}, connectivity={self.connectivity!r})"
 
 class Maze:
     """ A class to hold maze data.
@@ -13,16 +597,104 @@ class Maze:
             a numpy.array object with integer values.
         grid_shape : tuple
             a tuple detailing the bounds of the array.
+        version : int
+            an integer that is incremented every time the grid is changed through update_cells.
 
     Parameters
     ----------
         grid : numpy.array
             a numpy.array object with integer values.
+        compact : bool
+            if True, the occupancy of the grid is stored as a BitGrid with one bit per cell.
 
+    Methods
+    -------
+        update_cells(cells:list)
+            a method to change the values of cells in the grid
+        from_file(path:str, mmap_mode:str)
+            a method to create a maze from a grid file
+        components(neighbors:str)
+            a method to get the connected component index of the grid
     """
-    def __init__(self,grid:np.array) -> None:
-        self.grid = grid
-        self.grid_shape = grid.shape
+    version = 0
+    # connectivity -> ComponentIndex, made on first use
+    _components = None
+
+    def __init__(self,grid:np.array,compact:bool = False) -> None:
+        self.grid = BitGrid(grid) if compact and not isinstance(grid, BitGrid) else grid
+        self.grid_shape = self.grid.shape
+
+    @classmethod
+    def from_file(cls, path:str, mmap_mode:Union[str,None] = "r") -> "Maze":
+        """ A function to create a maze from a grid file.
+
+        The grid is loaded with grid_io.load_grid; a .npy file is memory mapped unless mmap_mode is None, and the maze
+        works on the memory mapped array directly. Open it with "r+" to change cells through update_cells.
+
+        Parameters
+        ----------
+        path : str
+            the path of a .npy, bit packed, run length encoded or delimited text file
+        mmap_mode : str/None
+            the memory map mode for .npy files
+
+        Returns
+        -------
+        Maze
+            a maze holding the loaded grid
+        """
+        return cls(load_grid(path, mmap_mode=mmap_mode))
+
+    def update_cells(self, cells:list) -> list:
+        """ A function to change the values of cells in the grid.
+
+        This is a function that writes new values into the grid and increments the version of the maze, so anything
+        derived from the grid can tell that it is out of date.
+
+        Parameters
+        ----------
+        cells : list
+            a list of (row, col, value) tuples
+
+        Returns
+        -------
+        changed : list
+            a list of the positions whose value changed
+        """
+        changed = list()
+        for row, col, value in cells:
+            if self.grid[row, col] != value:
+                self.grid[row, col] = value
+                changed.append((row, col))
+        if changed:
+            self.version += 1
+            for index in (self._components or {}).values():
+                index.update(changed)
+        return changed
+
+    def components(self, neighbors:str = "8_wind") -> "ComponentIndex":
+        """ A function to get the connected component index of the grid.
+
+        The index is made the first time it is asked for and kept up to date by update_cells, so searches given it
+        through their components argument fail in constant time when the end can not be reached.
+
+        Parameters
+        ----------
+        neighbors : str
+            a string that represents a registered neighborhood
+
+        Returns
+        -------
+        ComponentIndex
+            the index of the connectivity of the neighborhood
+        """
+        if self._components is None:
+            self._components = dict()
+        connectivity = CONNECTIVITY.get(neighbors, neighbors)
+        index = self._components.get(connectivity)
+        if index is None or index.grid is not self.grid:
+            index = self._components[connectivity] = ComponentIndex(self.grid, connectivity)
+        return index
 
     def __repr__(self) -> str:
         return f"grid: {self.grid} \n bounds: {self.grid_shape}"
@@ -68,6 +740,8 @@ class Node(Maze):
         a integer that represents the cost to get to the cell in the grid.
     heuristic : int/None
         a integer that represents the value from the current node to the end node.
+    weighted : bool
+        if True, cell values are step cost multipliers and cells that are not above 0 are blocked.
 
 
     Methods
@@ -78,9 +752,10 @@ class Node(Maze):
             a method to calculate the total cost to get to the current cell.
     """
     def __init__(self, grid:np.array, current:tuple, parent:Union[tuple,None] = None, neighbors:str= "4_wind", cost:Union[int,None] = None,
-                 heuristic:Union[int,None] = None) -> None:
+                 heuristic:Union[int,None] = None, weighted:bool = False) -> None:
         Maze.__init__(self,grid=grid)
 
+        self.weighted = weighted
         self.parent = parent
         self.pos = current
         self.cost = cost
@@ -113,7 +788,8 @@ class Node(Maze):
         Parameters
         ----------
         neighbors : str
-            a string that dictates which cells to be consider; n,w,s,e or ne,n,nw,w,sw,s,se
+            a string that dictates which cells to be consider; a name registered in NEIGHBOR_OFFSETS such as "4_wind"
+            (n,e,s,w), "8_wind" (nw,n,ne,w,e,sw,s,se) or "8_wind_no_corner_cutting"
 
         Returns
         -------
@@ -121,16 +797,16 @@ class Node(Maze):
             a function that will iterate over the desired directions adjacent to the cell.
         """
 
-        def _iterate_over_directions(neighbors_dict:dict) -> list:
+        def _iterate_over_directions(offsets:tuple) -> list:
             """ A function to iterate over cell directions.
 
             This is a function that will iterate over desired directions adjacent to the current cell. The function
-            considers the grid with respect to
+            considers the grid with respect to the bounds of the grid and the parent of the current cell.
 
             Parameters
             ----------
-            neighbors_dict : dict
-                a dictionary of directions and the calculation values need to
+            offsets : tuple
+                a tuple of (row offset, column offset, cost) tuples for each direction
 
             Returns
             -------
@@ -139,96 +815,249 @@ class Node(Maze):
 
             """
 
+            check_corners = neighbors in NO_CORNER_CUTTING
             children = list()
-            for key,value in neighbors_dict.items():
-                child_node = (self.pos[0] + value["calc"][0], self.pos[1] + value["calc"][1])
+            for row_offset, col_offset, cost in offsets:
+                child_node = (self.pos[0] + row_offset, self.pos[1] + col_offset)
                 if child_node == self.parent or child_node[0] < 0 or child_node[1] < 0 or child_node[0] >= self.grid_shape[0] or child_node[1] >= self.grid_shape[1]:
                     pass
                 else:
-                    if self.grid[child_node[0]][child_node[1]] == 0:
+                    if self.weighted:
+                        access = self.grid.item(child_node) > 0
+                        if access and check_corners and row_offset and col_offset:
+                            access = self.grid.item(child_node[0], self.pos[1]) > 0 and self.grid.item(self.pos[0], child_node[1]) > 0
+                        if access:
+                            cost = cost * self.grid.item(child_node)
+                        children.append({"node":child_node,"accessibility":access,"cost":cost})
+                        continue
+                    if self.grid[child_node[0], child_node[1]] == 0:
                         access = True
                     else:
                         access = False
-                    children.append({"node":child_node,"accessibility":access,"cost":value["cost"]})
+                    if access and check_corners and row_offset and col_offset:
+                        access = self.grid[child_node[0], self.pos[1]] == 0 and self.grid[self.pos[0], child_node[1]] == 0
+                    children.append({"node":child_node,"accessibility":access,"cost":cost})
             return children
 
-        diagonal_line_cost = 14
-        straight_line_cost = 10
-
-        # help visualize directions
-        four_wind = {
-            "north": {
-                "calc": [-1, 0],
-                "cost": straight_line_cost
-            },
-            "east": {
-                "calc": [0, 1],
-                "cost": straight_line_cost
-            },
-            "south": {
-                "calc": [1, 0],
-                "cost": straight_line_cost
-            },
-            "west": {
-                "calc": [0, -1],
-                "cost": straight_line_cost
-            }
-        }
-
-        eight_wind = {
-            "north_west": {
-                "calc": [-1, -1],
-                "cost": diagonal_line_cost
-            },
-            "north": {
-                "calc": [-1, 0],
-                "cost": straight_line_cost
-            },
-            "north_east": {
-                "calc": [-1, 1],
-                "cost": diagonal_line_cost
-            },
-
-            "west": {
-                "calc": [0, -1],
-                "cost": straight_line_cost
-            },
-            "east": {
-                "calc": [0, 1],
-                "cost": straight_line_cost
-            },
-            "south_west": {
-                "calc": [1, -1],
-                "cost": diagonal_line_cost
-            },
-            "south": {
-                "calc": [1, 0],
-                "cost": straight_line_cost
-            },
-            "south_east": {
-                "calc": [1, 1],
-                "cost": diagonal_line_cost
-            },
-        }
-
-        if neighbors == "4_wind":
-            return _iterate_over_directions(four_wind)
-        if neighbors == "8_wind":
-            return  _iterate_over_directions(eight_wind)
+        return _iterate_over_directions(get_neighborhood(neighbors))
+
+    def iter_children(self):
+        """ A function to iterate over the child cells of the node.
+
+        This is a function that yields the children of the node as (position, accessibility, cost) tuples, so the node
+        can be used interchangeably with a LightNode in the search loops.
+
+        Yields
+        ------
+            tuple
+                a tuple of the child's position, accessibility and step cost
+        """
+        for child in self.children:
+            yield child["node"], child["accessibility"], child["cost"]
 
     def __repr__(self):
         return f"Node{self.pos}"
 
+class LightNode:
+    """ A class to hold node data without per node allocations.
+
+    This is a lightweight alternative to the Node class. The class uses __slots__, does not run Maze.__init__ and
+    shares one precomputed direction offset table per neighborhood (see NEIGHBOR_OFFSETS). Children are not computed
+    when the node is created; iter_children generates them on demand as (position, accessibility, cost) tuples without
+    building any dictionaries. The children and info_dict attributes of the Node class are available as properties for
+    compatibility and are only built when accessed; info_dict does not include the children.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        pos : tuple
+            a tuple containing the location of the current node in the grid.
+        parent : tuple/None
+            a tuple containing the location of the parent node in the grid.
+        neighbors : str
+            a string that represents which neighbors within the grid to consider.
+        cost : int/None
+            an integer that represents the cost to get to the cell in the grid.
+        heuristic : int/None
+            an integer that represents the value from the current node to the end node.
+        total_cost : int/None
+            an integer that represents the total cost of getting to the current cell.
+
+    Parameters
+    ----------
+    grid : numpy.array
+        a numpy.array object with integer values.
+    current : tuple
+        a tuple containing the location of the current node in the grid.
+    parent : tuple/None
+        a tuple containing the location of the parent node in the grid.
+    neighbors : str
+        a string that represents which neighbors within the grid to consider.
+    cost : int/None
+        a integer that represents the cost to get to the cell in the grid.
+    heuristic : int/None
+        a integer that represents the value from the current node to the end node.
+    weighted : bool
+        if True, cell values are step cost multipliers and cells that are not above 0 are blocked.
+
+    Methods
+    -------
+        iter_children()
+            a method that lazily generates the children around the current node.
+    """
+    __slots__ = ("grid", "grid_shape", "pos", "parent", "neighbors", "cost", "heuristic", "total_cost", "weighted",
+                 "_children")
+
+    def __init__(self, grid:np.array, current:tuple, parent:Union[tuple,None] = None, neighbors:str= "4_wind", cost:Union[int,None] = None,
+                 heuristic:Union[int,None] = None, weighted:bool = False) -> None:
+        get_neighborhood(neighbors)
+        self.weighted = weighted
+        self.grid = grid
+        self.grid_shape = grid.shape
+        self.pos = current
+        self.parent = parent
+        self.neighbors = neighbors
+        self.cost = cost
+        self.heuristic = heuristic
+        self.total_cost = cost + heuristic if cost is not None and heuristic is not None else None
+        self._children = None
+
+    def iter_children(self):
+        """ A function to lazily generate the child cells of the node.
+
+        This is a function that walks the shared offset table of the node's neighborhood and yields every in bounds
+        child that is not the parent of the node.
+
+        Returns
+        -------
+            Iterator
+                an iterator of tuples of the child's position, accessibility and step cost
+        """
+        check_corners = self.neighbors in NO_CORNER_CUTTING
+        if self.weighted:
+            return self._iter_weighted_children(check_corners)
+        return self._iter_unweighted_children(check_corners)
+
+    def _iter_unweighted_children(self, check_corners:bool):
+        row, col = self.pos
+        rows, cols = self.grid_shape
+        grid = self.grid
+        parent = self.parent
+        for row_offset, col_offset, cost in NEIGHBOR_OFFSETS[self.neighbors]:
+            child_row = row + row_offset
+            child_col = col + col_offset
+            if 0 <= child_row < rows and 0 <= child_col < cols:
+                child_node = (child_row, child_col)
+                if child_node != parent:
+                    access = grid[child_row, child_col] == 0
+                    if access and check_corners and row_offset and col_offset:
+                        access = grid[child_row, col] == 0 and grid[row, child_col] == 0
+                    yield child_node, access, cost
+
+    def _iter_weighted_children(self, check_corners:bool):
+        # the step cost is scaled by the weight of the cell that is stepped into
+        row, col = self.pos
+        rows, cols = self.grid_shape
+        weights = self.grid
+        parent = self.parent
+        for row_offset, col_offset, cost in NEIGHBOR_OFFSETS[self.neighbors]:
+            child_row = row + row_offset
+            child_col = col + col_offset
+            if 0 <= child_row < rows and 0 <= child_col < cols:
+                child_node = (child_row, child_col)
+                if child_node != parent:
+                    weight = weights.item(child_row, child_col)
+                    access = weight > 0
+                    if access and check_corners and row_offset and col_offset:
+                        access = weights.item(child_row, col) > 0 and weights.item(row, child_col) > 0
+                    yield child_node, access, cost * weight if access else cost
+
+    @property
+    def children(self) -> list:
+        if self._children is None:
+            self._children = [{"node": child_node, "accessibility": access, "cost": cost}
+                              for child_node, access, cost in self.iter_children()]
+        return self._children
+
+    @property
+    def info_dict(self) -> dict:
+        # children are left out so storing a visited node does not force them to be generated
+        return {"current": self.pos, "parent": self.parent}
+
+    def __repr__(self):
+        return f"LightNode{self.pos}"
+
+class PositionIndex:
+    """ A class to act as a constant time membership index for grid positions.
+
+    This is a class that keeps track of which positions have been added to a data structure. By default the positions
+    are kept in a set; if the shape of the grid is given, a numpy bool array shaped like the grid is used as a bitmap
+    instead, which uses one byte per cell no matter how many positions are added. Positions are expected to be added
+    once, so discarding a position removes it from the index.
+
+    Attributes
+    ----------
+        grid_shape : tuple/None
+            a tuple detailing the bounds of the grid, or None for a set backed index.
+
+    Parameters
+    ----------
+        grid_shape : tuple/None
+            a tuple detailing the bounds of the grid, or None for a set backed index.
+
+    Methods
+    -------
+        add(position:tuple)
+            a method to add a position to the index
+        discard(position:tuple)
+            a method to remove a position from the index if it is present
+    """
+    def __init__(self, grid_shape:Union[tuple,None] = None) -> None:
+        self.grid_shape = grid_shape
+        if grid_shape is None:
+            self._positions = set()
+        else:
+            self._positions = np.zeros(grid_shape, dtype=bool)
+
+    def add(self, position:tuple) -> None:
+        if self.grid_shape is None:
+            self._positions.add(position)
+        else:
+            self._positions[position] = True
+
+    def discard(self, position:tuple) -> None:
+        if self.grid_shape is None:
+            self._positions.discard(position)
+        else:
+            self._positions[position] = False
+
+    def __contains__(self, position:tuple) -> bool:
+        if self.grid_shape is None:
+            return position in self._positions
+        return bool(self._positions[position])
+
+    def __repr__(self):
+        return f"PositionIndex(grid_shape={self.grid_shape})"
+
 class Stack:
     """ A class to act as a stack data structure.
 
     This is a class to hold information about a stack, and what is put into it ore taken out of it. Methods are designed
-    to insert a new object into the stack, and then remove and return an object in the first position of the stack.
+    to insert a new object on top of the stack, and then remove and return the object on top of the stack. The top of
+    the stack is the end of the list, so both are O(1).
 
     Attributes
     ----------
     stacked_nodes : list
-        a list of Node objects
+        a list of Node objects, the most recent last
+
+    Parameters
+    ----------
+    grid_shape : tuple/None
+        a tuple detailing the bounds of the grid; if given, membership is tracked with a bitmap.
 
     Methods
     -------
@@ -236,15 +1065,18 @@ class Stack:
         a function to add a node to the stack
     pop()
         a function to remove the most recent addition from the stack
+    contains(position:tuple)
+        a function to check if a position is stacked
 
     """
-    def __init__(self) -> None:
+    def __init__(self, grid_shape:Union[tuple,None] = None) -> None:
         self.stacked_nodes = list()
+        self._index = PositionIndex(grid_shape)
 
     def push(self,node: Node) -> None:
         """ A function to insert a new object.
 
-        This is a function that will insert a new object into the first index of a list.
+        This is a function that will append a new object to the end of a list.
 
         Parameters
         ----------
@@ -252,19 +1084,41 @@ class Stack:
             a Node object
 
         """
-        self.stacked_nodes.insert(0, node)
+        self.stacked_nodes.append(node)
+        self._index.add(node.pos)
 
     def pop(self) -> Node:
-        """ A function to remove and return the first object.
+        """ A function to remove and return the most recent object.
 
-        This is a function that will remove and return an object that is found in the first position of the list.
+        This is a function that will remove and return the object that is found in the last position of the list.
 
         Returns
         -------
             a Node object
 
         """
-        return self.stacked_nodes.pop(0)
+        node = self.stacked_nodes.pop()
+        self._index.discard(node.pos)
+        return node
+
+    def contains(self, position:tuple) -> bool:
+        """ A function to check if a position is stacked in constant time.
+
+        Parameters
+        ----------
+        position : tuple
+            a tuple describing the position of a node
+
+        Returns
+        -------
+            bool
+                True if the position is stacked, False otherwise
+
+        """
+        return position in self._index
+
+    def __contains__(self, position:tuple) -> bool:
+        return position in self._index
 
     def __repr__(self):
         return f"current stack is: {self.stacked_nodes}"
@@ -285,18 +1139,26 @@ class Queue:
         queue_list : list
             a list of positions
 
+    Parameters
+    ----------
+        grid_shape : tuple/None
+            a tuple detailing the bounds of the grid; if given, membership is tracked with a bitmap.
+
     Methods
     -------
         push(node:Node)
             a function to insert a new object into the queue
         pop()
             a function to remove the oldest object from the queue
+        contains(position:tuple)
+            a function to check if a position is queued
 
 
     """
-    def __init__(self) -> None:
+    def __init__(self, grid_shape:Union[tuple,None] = None) -> None:
         self.queued_nodes = list()
         self.queue_list = list()
+        self._index = PositionIndex(grid_shape)
 
     def push(self, node: Node) -> None:
         """ A function to insert a new object into the queue.
@@ -312,6 +1174,7 @@ class Queue:
         """
         self.queued_nodes.append(node)
         self.queue_list.append(node.pos)
+        self._index.add(node.pos)
 
     def pop(self) -> Node:
         """ A function to remove and return a popped object.
@@ -324,9 +1187,28 @@ class Queue:
                 a Node object
 
         """
-        self.queue_list.pop(0)
+        self._index.discard(self.queue_list.pop(0))
         return self.queued_nodes.pop(0)
 
+    def contains(self, position:tuple) -> bool:
+        """ A function to check if a position is queued in constant time.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a node
+
+        Returns
+        -------
+            bool
+                True if the position is queued, False otherwise
+
+        """
+        return position in self._index
+
+    def __contains__(self, position:tuple) -> bool:
+        return position in self._index
+
     def __repr__(self):
         return f"current queue is: {self.queued_nodes}"
 
@@ -335,9 +1217,8 @@ class Queue:
         return self
 
     def __next__(self):
-        self._iter_queued_nodes = self.queued_nodes
-        if self._iter_queued_nodes:
-            return self._iter_queued_nodes.pop(0)
+        if self.queued_nodes:
+            return self.pop()
         raise StopIteration()
     # ^^^^ for educational and testing purposes
 
@@ -348,25 +1229,92 @@ class PriorityQueue(Queue):
     """ A class to act as a priority queue data structure.
 
     This is a class to hold information pertaining to a priority queue. The class is a child of the Queue class.
-    Methods are designed to insert objects into a list, rearrange the list according to a heuristic, and remove and
-    return the object in the first position of the list.
+    Nodes are kept in a binary heap ordered by their total cost, so pushing and popping a node are O(log n). Ties
+    between nodes with an equal total cost are broken by the tie_break policy, followed by insertion order so results
+    stay deterministic. A position can only be queued once; pushing a node for a position that is already queued
+    replaces the old entry (lazy deletion), which is how decrease_key updates a frontier node.
+
+    Attributes
+    ----------
+        tie_break : str
+            a string that represents the tie breaking policy; "heuristic" (lower heuristic first), "fifo" or "lifo".
+        queued_nodes : list
+            a list of the queued Node objects in heap order.
+        queue_list : list
+            a list of the queued positions in heap order.
+
+    Parameters
+    ----------
+        tie_break : str
+            a string that represents the tie breaking policy; "heuristic" (lower heuristic first), "fifo" or "lifo".
 
     Methods
     -------
         push(node:Node)
             a method to insert an object into the priority queue
-        _prioritize()
-            a method to rearrange the queue based on heuristic
+        pop()
+            a method to remove and return the object with the lowest total cost
+        peek()
+            a method to return the object with the lowest total cost without removing it
+        decrease_key(node:Node)
+            a method to replace a queued node if the new node has a lower total cost
+        get(position:tuple)
+            a method to get the node queued for a position
+        remove(position:tuple)
+            a method to remove a queued position from the priority queue
+        contains(position:tuple)
+            a method to check if a position is queued
     """
-    def __init__(self) -> None:
-        super().__init__()
+    _removed = object()
+    _tie_breaks = ("heuristic", "fifo", "lifo")
+
+    def __init__(self, tie_break:str = "heuristic") -> None:
+        if tie_break not in self._tie_breaks:
+            raise ValueError(f"tie_break must be one of {self._tie_breaks}, got {tie_break!r}")
+        self.tie_break = tie_break
+        self._heap = list()
+        self._entry_finder = dict()
+        self._counter = itertools.count()
+
+    @property
+    def queued_nodes(self) -> list:
+        return [entry[-1] for entry in self._heap if entry[-1] is not self._removed]
+
+    @property
+    def queue_list(self) -> list:
+        return [entry[-1].pos for entry in self._heap if entry[-1] is not self._removed]
+
+    def _make_entry(self, node:Node) -> list:
+        """ A function to build a heap entry for a node.
+
+        This is a function that will build a list that is compared by the heap. The list starts with the node's total
+        cost, followed by the tie breaking keys and the node itself.
+
+        Parameters
+        ----------
+            node : Node
+                a Node object
+
+        Returns
+        -------
+            entry : list
+                a list of [total_cost, tie_break_key, count, node]
+
+        """
+        count = next(self._counter)
+        if self.tie_break == "heuristic":
+            tie_break_key = node.heuristic if node.heuristic is not None else 0
+        elif self.tie_break == "lifo":
+            tie_break_key = -count
+        else:
+            tie_break_key = 0
+        return [node.total_cost, tie_break_key, count, node]
 
     def push(self,node:Node) -> None:
         """ A function to insert a new object into the queue.
 
-        This is a function that will insert a new object into the last place of the list. The node object is appended
-        to the queued_nodes list while the node's position is appended to the queue_list. The _prioritize function is
-        called to rearrange the lists.
+        This is a function that will insert a new object into the heap. If the node's position is already queued, the
+        old entry is marked as removed and replaced by the new one.
 
         Parameters
         ----------
@@ -374,42 +1322,267 @@ class PriorityQueue(Queue):
                 a Node object
 
         """
-        self.queued_nodes.append(node)
-        self.queue_list.append(node.pos)
-        self._prioritize()
+        if node.pos in self._entry_finder:
+            self.remove(node.pos)
+        entry = self._make_entry(node)
+        self._entry_finder[node.pos] = entry
+        heapq.heappush(self._heap, entry)
+
+    def decrease_key(self, node:Node) -> bool:
+        """ A function to update a queued node with a cheaper one.
+
+        This is a function that will push the node if its position is not queued, or replace the queued node if the
+        new node has a lower total cost.
+
+        Parameters
+        ----------
+            node : Node
+                a Node object
+
+        Returns
+        -------
+            bool
+                True if the node was pushed into the queue, False otherwise
+
+        """
+        entry = self._entry_finder.get(node.pos)
+        if entry is not None and entry[0] <= node.total_cost:
+            return False
+        self.push(node)
+        return True
+
+    def get(self, position:tuple) -> Union[Node,None]:
+        """ A function to get the node queued for a position.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a node
+
+        Returns
+        -------
+            node : Node/None
+                the queued Node object, or None if the position is not queued
+
+        """
+        entry = self._entry_finder.get(position)
+        return entry[-1] if entry is not None else None
+
+    def remove(self, position:tuple) -> Node:
+        """ A function to remove a queued position.
+
+        This is a function that will mark the entry of a queued position as removed. The entry is discarded once it
+        reaches the top of the heap.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a queued node
+
+        Returns
+        -------
+            node : Node
+                the Node object that was removed
+
+        """
+        entry = self._entry_finder.pop(position)
+        node = entry[-1]
+        entry[-1] = self._removed
+        return node
+
+    def pop(self) -> Node:
+        """ A function to remove and return the node with the lowest total cost.
+
+        This is a function that will pop entries from the heap until an entry that has not been removed is found.
+
+        Returns
+        -------
+            node : Node
+                a Node object
+
+        """
+        while self._heap:
+            node = heapq.heappop(self._heap)[-1]
+            if node is not self._removed:
+                del self._entry_finder[node.pos]
+                return node
+        raise IndexError("pop from an empty priority queue")
+
+    def peek(self) -> Node:
+        """ A function to return the node with the lowest total cost without removing it.
+
+        Returns
+        -------
+            node : Node
+                a Node object
+
+        """
+        while self._heap and self._heap[0][-1] is self._removed:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            raise IndexError("peek from an empty priority queue")
+        return self._heap[0][-1]
 
-    def _prioritize(self) -> None:
-        """ A function to rearrange the priority list
+    def contains(self, position:tuple) -> bool:
+        """ A function to check if a position is queued in constant time.
 
-        This is a function that will rearrange a priority queue based on a given heuristic. It will iterate through
-        each node in the list, checking for a value that details the total cost of moving on to the next cell. Nodes
-        with the lowest cost are moved to the first position of the list.
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a node
+
+        Returns
+        -------
+            bool
+                True if the position is queued, False otherwise
 
         """
-        least_total_cost = None
-        for node in self.queued_nodes:
-            if least_total_cost == None or node.total_cost < least_total_cost:
-                self.queued_nodes.remove(node)
-                self.queued_nodes.insert(0, node)
-                least_total_cost = node.total_cost
+        return position in self._entry_finder
+
+    def __contains__(self, position:tuple) -> bool:
+        return position in self._entry_finder
+
+    def __next__(self):
+        if self._entry_finder:
+            return self.pop()
+        raise StopIteration()
+
+    def __len__(self):
+        return len(self._entry_finder)
 
     def __repr__(self):
         return f"Queue is {self.queued_nodes}"
 
+class BucketQueue(PriorityQueue):
+    """ A class to act as a bucket priority queue for integer total costs.
+
+    This is a class with the interface of PriorityQueue that keeps a bucket (a list) of nodes per total cost instead of
+    a binary heap, so pushing and popping are O(1) apart from finding the next lowest cost once a bucket runs empty. It
+    is a fast path for searches whose costs are small integers, such as a_star with the 10/14 step costs on grids with
+    integer weights. Nodes with equal total costs are popped last in first out. Total costs must be integers.
+
+    Attributes
+    ----------
+        queued_nodes : list
+            a list of the queued Node objects in cost order.
+        queue_list : list
+            a list of the queued positions in cost order.
+
+    Methods
+    -------
+        push(node:Node)
+            a method to insert an object into the bucket of its total cost
+        pop()
+            a method to remove and return the most recently pushed object with the lowest total cost
+        peek()
+            a method to return the object pop would return without removing it
+    """
+    def __init__(self) -> None:
+        PriorityQueue.__init__(self, tie_break="lifo")
+        self._buckets = dict()
+        self._lowest = None
+
+    @property
+    def queued_nodes(self) -> list:
+        return [entry[-1] for cost in sorted(self._buckets) for entry in reversed(self._buckets[cost])
+                if entry[-1] is not self._removed]
+
+    @property
+    def queue_list(self) -> list:
+        return [node.pos for node in self.queued_nodes]
+
+    def push(self, node:Node) -> None:
+        """ A function to insert a new object into the bucket of its total cost.
+
+        Parameters
+        ----------
+            node : Node
+                a Node object with an integer total cost
+
+        """
+        cost = node.total_cost
+        if type(cost) is not int:
+            if cost != int(cost):
+                raise ValueError(f"BucketQueue needs integer total costs, got {cost!r}")
+            cost = int(cost)
+        if node.pos in self._entry_finder:
+            self.remove(node.pos)
+        # entries keep the layout PriorityQueue reads: the total cost first and the node last
+        entry = [cost, node]
+        self._entry_finder[node.pos] = entry
+        self._buckets.setdefault(cost, list()).append(entry)
+        if self._lowest is None or cost < self._lowest:
+            self._lowest = cost
+
+    def _lowest_bucket(self) -> list:
+        # steps over removed entries and empty costs until a live entry is on top of the lowest bucket
+        while self._buckets:
+            bucket = self._buckets.get(self._lowest)
+            if bucket:
+                if bucket[-1][-1] is not self._removed:
+                    return bucket
+                bucket.pop()
+                continue
+            # the frontier of a search only spans a few distinct costs, so finding the next one is cheap
+            self._buckets.pop(self._lowest, None)
+            self._lowest = min(self._buckets) if self._buckets else None
+        return None
+
+    def pop(self) -> Node:
+        bucket = self._lowest_bucket()
+        if bucket is None:
+            raise IndexError("pop from an empty priority queue")
+        node = bucket.pop()[-1]
+        del self._entry_finder[node.pos]
+        return node
+
+    def peek(self) -> Node:
+        bucket = self._lowest_bucket()
+        if bucket is None:
+            raise IndexError("peek from an empty priority queue")
+        return bucket[-1][-1]
+
 class VisitedNodes:
     """ This is a class to house information about visited nodes
 
     This is a class that contains all the nodes a search function may iterate through. The class keeps track of each
     node that was visited.
 
+    Two backends are available. The "list" backend keeps every Node object and its info_dict. The "array" backend is
+    meant for grids with millions of cells; it does not keep the Node objects and instead records the g-cost, parent
+    index and visit status of each cell in flat numpy arrays indexed by row * width + col, along with the order the
+    cells were visited in. Both backends return the same visited list and path list from create_path.
+
+    With record_visited set to False only what create_path needs to rebuild a path is kept: the list backend keeps the
+    parent and cost of each position instead of the Node objects and their info_dict, the array backend does not record
+    the visiting order, and the visited list is always empty.
+
     Attributes
     ----------
+        backend : str
+            a string that represents the storage backend; "list" or "array".
         nodes : list
-            a list of Node objects
+            a list of Node objects (list backend only)
         visited_nodes : list
             a list of the Node object's position
         node_info : dict
-            a dictionary of node dictionaries
+            a dictionary of node dictionaries (list backend only)
+        g_costs : numpy.array
+            a flat array of the cost to reach each visited cell, inf if unvisited (array backend only)
+        parents : numpy.array
+            a flat array of the parent index of each visited cell, -1 if it has none (array backend only)
+        status : numpy.array
+            a flat array that is 1 for visited cells and 0 otherwise (array backend only)
+
+    Parameters
+    ----------
+        grid_shape : tuple/None
+            a tuple detailing the bounds of the grid; if given, membership is tracked with a bitmap. Required by the
+            array backend.
+        backend : str
+            a string that represents the storage backend; "list" or "array".
+        record_visited : bool
+            if False, the visited nodes are not kept and only their parents and costs are stored.
 
     Methods
     -------
@@ -417,11 +1590,41 @@ class VisitedNodes:
             a method to store node information in a series of lists
         create_path(current_node_position,start_position)
             a method to recreate a path through the stored nodes
+        contains(position:tuple)
+            a method to check if a position has been visited
+        get_cost(position:tuple)
+            a method to get the cost a visited position was stored with
     """
-    def __init__(self) -> None:
+    _backends = ("list", "array")
+
+    def __init__(self, grid_shape:Union[tuple,None] = None, backend:str = "list", record_visited:bool = True) -> None:
+        if backend not in self._backends:
+            raise ValueError(f"backend must be one of {self._backends}, got {backend!r}")
+        self.backend = backend
+        self.record_visited = record_visited
         self.nodes = list()
-        self.visited_nodes = list()
         self.node_info = dict()
+        if backend == "array":
+            if grid_shape is None:
+                raise ValueError("the array backend requires grid_shape")
+            self._width = grid_shape[1]
+            size = grid_shape[0] * grid_shape[1]
+            self.g_costs = np.full(size, np.inf)
+            self.parents = np.full(size, -1, dtype=np.int64)
+            self.status = np.zeros(size, dtype=np.uint8)
+            self._order = array.array("q")
+        else:
+            self._visited_nodes = list()
+            self._costs = dict()
+            self._parents = dict()
+            self._index = PositionIndex(grid_shape)
+
+    @property
+    def visited_nodes(self) -> list:
+        if self.backend == "array":
+            rows, cols = np.divmod(np.frombuffer(self._order, dtype=np.int64), self._width)
+            return list(zip(rows.tolist(), cols.tolist()))
+        return self._visited_nodes
 
     def _store_node(self, node:Node) -> None:
         """ A function to store a new Node object
@@ -429,7 +1632,7 @@ class VisitedNodes:
             This is a function that will insert a several objects into various lists. A Node object is inserted into
             the nodes list and the Node object's position is inserted into the visited_nodes list. A the info_dict of
             the Node object is inserted into the node_info dictionary, where the key is set to the Node object's
-            position.
+            position. With the array backend only the cost, parent index and status of the node's cell are written.
 
             Parameters
             ----------
@@ -437,17 +1640,80 @@ class VisitedNodes:
                     a Node object
 
         """
+        if self.backend == "array":
+            index = node.pos[0] * self._width + node.pos[1]
+            if node.parent is not None:
+                self.parents[index] = node.parent[0] * self._width + node.parent[1]
+            if node.cost is not None:
+                self.g_costs[index] = node.cost
+            self.status[index] = 1
+            if self.record_visited:
+                self._order.append(index)
+            return
+        if not self.record_visited:
+            self._parents[node.pos] = node.parent
+            self._costs[node.pos] = node.cost
+            self._index.add(node.pos)
+            return
         self.nodes.append(node)
-        self.visited_nodes.append(node.pos)
+        self._visited_nodes.append(node.pos)
         self.node_info[node.pos] = node.info_dict
+        self._costs[node.pos] = node.cost
+        self._index.add(node.pos)
+
+    def get_cost(self, position:tuple) -> Union[int,float,None]:
+        """ A function to get the cost that a visited position was stored with.
+
+            Parameters
+            ----------
+                position : tuple
+                    a tuple describing the position of a visited node
+
+            Returns
+            -------
+                int/float/None
+                    the cost of the stored node, None (inf for the array backend) if the node had no cost
 
-    def create_path(self,current_node_position,start_position) -> Tuple[list,list]:
+        """
+        if self.backend == "array":
+            return float(self.g_costs[position[0] * self._width + position[1]])
+        return self._costs[position]
+
+    def contains(self, position:tuple) -> bool:
+        """ A function to check if a position has been visited in constant time.
+
+            Parameters
+            ----------
+                position : tuple
+                    a tuple describing the position of a node
+
+            Returns
+            -------
+                bool
+                    True if the position has been visited, False otherwise
+
+        """
+        if self.backend == "array":
+            return self.status[position[0] * self._width + position[1]] == 1
+        return position in self._index
+
+    def __contains__(self, position:tuple) -> bool:
+        return self.contains(position)
+
+    def create_path(self,current_node_position,start_position,other_visited:Union["VisitedNodes",None] = None,
+                    end_position:Union[tuple,None] = None,
+                    other_node_position:Union[tuple,None] = None) -> Tuple[list,list]:
         """ A function to create a path through the stored nodes
 
             While the current node's position is not equal to the starting position, the current node is appended to a
             path list. The current node's position is updated to the parent of the current node's position and the
             process repeats. Once the current node's position is equal ot the starting position, the final node's
-            information is appended to the path list.
+            information is appended to the path list. With the array backend the parent array is walked instead.
+
+            For bidirectional searches, other_visited is the VisitedNodes of the search that started from the end
+            position. Its parent chain from other_node_position (the current node's position by default) back to the
+            end position is stitched in front of the path, so the path still runs from the end to the start, and the
+            visited nodes of both searches are returned.
 
             Parameters
             ----------
@@ -455,20 +1721,88 @@ class VisitedNodes:
                     a tuple that describes the position of the current node within a grid
                 start_position : tuple
                     a tuple that describes the position of the starting node
+                other_visited : VisitedNodes/None
+                    the visited nodes of a search from the end position
+                end_position : tuple/None
+                    a tuple that describes the position of the ending node, required with other_visited
+                other_node_position : tuple/None
+                    a tuple that describes where the path joins the other search, if it is not the current node
             Returns
             -------
                 Tuple[list,list]
                     A list of visited nodes and a list of nodes that are included in the path
 
         """
+        path_list = self._parent_chain(current_node_position, start_position)
+        if other_visited is None:
+            return self.visited_nodes,path_list
+
+        if other_node_position is None:
+            other_node_position = current_node_position
+        other_path_list = other_visited._parent_chain(other_node_position, end_position)
+        if other_node_position == current_node_position:
+            other_path_list = other_path_list[1:]
+        return self.visited_nodes + other_visited.visited_nodes, other_path_list[::-1] + path_list
+
+    def _parent_chain(self, current_node_position:tuple, start_position:tuple) -> list:
+        """ A function to follow the stored parents from a position back to the start.
+
+            Parameters
+            ----------
+                current_node_position : tuple
+                    a tuple that describes the position of the current node within a grid
+                start_position : tuple
+                    a tuple that describes the position of the starting node
+            Returns
+            -------
+                path_list : list
+                    a list of positions from the current node back to the starting node
+
+        """
+        if self.backend == "array":
+            return self._create_path_from_parents(current_node_position, start_position)
+        if not self.record_visited:
+            path_list = [current_node_position]
+            while current_node_position != start_position:
+                current_node_position = self._parents[current_node_position]
+                path_list.append(current_node_position)
+            return path_list
+
         path_list = list()
         while current_node_position != start_position:
             path_list.append(self.node_info[current_node_position]["current"])
             current_node_position = self.node_info[current_node_position]["parent"]
 
         path_list.append(self.node_info[current_node_position]["current"])
+        return path_list
+
+    def _create_path_from_parents(self, current_node_position:tuple, start_position:tuple) -> list:
+        """ A function to walk the parent array from a position back to the start.
+
+            Parameters
+            ----------
+                current_node_position : tuple
+                    a tuple that describes the position of the current node within a grid
+                start_position : tuple
+                    a tuple that describes the position of the starting node
+            Returns
+            -------
+                path_list : list
+                    a list of positions from the current node back to the starting node
 
-        return self.visited_nodes,path_list
+        """
+        width = self._width
+        index = current_node_position[0] * width + current_node_position[1]
+        start_index = start_position[0] * width + start_position[1]
+        path_list = [current_node_position]
+        while index != start_index:
+            index = int(self.parents[index])
+            if index < 0:
+                raise KeyError(current_node_position)
+            path_list.append(divmod(index, width))
+        return path_list
 
     def __repr__(self):
-        return f"visited nodes are: {self.nodes}"
\ No newline at end of file
+        if self.backend == "array":
+            return f"visited nodes are: {self.visited_nodes}"
+        return f"visited nodes are: {self.nodes}"
@@ -0,0 +1,223 @@
+import heapq
+import numpy as np
+from typing import Tuple,Union
+from data_structures import Maze,get_neighborhood,passable_steps,free_cells
+
+def _step_tables(grid:np.array, neighbors:str) -> Tuple[tuple,list,list]:
+    """ A function to build the per offset tables the sweeps share.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        neighbors : str
+            a string that represents a registered neighborhood
+
+    Returns
+    -------
+        Tuple[tuple,list,list]
+            the offsets of the neighborhood, a flat bool array per offset of the cells that can step along it, and the
+            flat index change of each offset
+    """
+    offsets = get_neighborhood(neighbors)
+    allowed = list()
+    for from_index, _ in passable_steps(grid, neighbors):
+        can_step = np.zeros(grid.size, dtype=bool)
+        can_step[from_index] = True
+        allowed.append(can_step)
+    deltas = [row_offset * grid.shape[1] + col_offset for row_offset, col_offset, _ in offsets]
+    return offsets, allowed, deltas
+
+def distance_field(grid:np.array, sources:list, neighbors:str = "8_wind") -> np.array:
+    """ A function that computes the cost from every cell to the nearest of one or more sources
+
+        This function runs Dijkstra's algorithm as a vectorized wavefront. Tentative costs are kept in a flat array, and
+        the cells are grouped into buckets by their tentative cost. The cheapest bucket is expanded at once: every cell in
+        it is final, and all of their neighbors are relaxed with numpy array operations, one offset of the neighborhood
+        at a time. With the 10/14 step costs this gives the same costs as a_star, and with 4_wind it is a breadth first
+        sweep. The neighborhood is assumed to be symmetric, so the cost from a cell to a source is the cost from the
+        source to the cell.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            sources : list
+                a list of source positions; blocked sources are ignored
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        Returns
+        -------
+            np.array
+                a float array shaped like the grid with the cost to the nearest source, inf where none can be reached
+
+    """
+    return _distance_field(grid, sources, _step_tables(grid, neighbors))
+
+def _distance_field(grid:np.array, sources:list, tables:tuple) -> np.array:
+    offsets, allowed, deltas = tables
+    distances = np.full(grid.size, np.inf)
+    settled = np.zeros(grid.size, dtype=bool)
+    source_index = np.array([row * grid.shape[1] + col for row, col in sources], dtype=np.int64)
+    source_index = source_index[free_cells(grid).ravel()[source_index]] if source_index.size else source_index
+    distances[source_index] = 0
+
+    buckets = {0: [source_index]}
+    bucket_costs = [0]
+    while bucket_costs:
+        cost = heapq.heappop(bucket_costs)
+        frontier = np.unique(np.concatenate(buckets.pop(cost)))
+        # a cell can sit in a bucket it has since been improved out of
+        frontier = frontier[(distances[frontier] == cost) & ~settled[frontier]]
+        if not frontier.size:
+            continue
+        settled[frontier] = True
+        for (_, _, step_cost), can_step, delta in zip(offsets, allowed, deltas):
+            children = frontier[can_step[frontier]] + delta
+            child_cost = cost + step_cost
+            children = children[child_cost < distances[children]]
+            if children.size:
+                distances[children] = child_cost
+                if child_cost not in buckets:
+                    buckets[child_cost] = list()
+                    heapq.heappush(bucket_costs, child_cost)
+                buckets[child_cost].append(children)
+    return distances.reshape(grid.shape)
+
+def direction_field(grid:np.array, distances:np.array, neighbors:str = "8_wind") -> np.array:
+    """ A function that computes the next step towards the nearest source for every cell
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            distances : np.array
+                the output of distance_field for the same grid and neighbors
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        Returns
+        -------
+            np.array
+                an int8 array shaped like the grid with the index (into the neighborhood's offsets) of the step to take,
+                and -1 for sources, blocked cells and cells that can not reach a source
+
+    """
+    return _direction_field(grid, distances, _step_tables(grid, neighbors))
+
+def _direction_field(grid:np.array, distances:np.array, tables:tuple) -> np.array:
+    offsets, allowed, deltas = tables
+    flat_distances = distances.ravel()
+    best = np.full(grid.size, np.inf)
+    directions = np.full(grid.size, -1, dtype=np.int8)
+    for direction, ((_, _, step_cost), can_step, delta) in enumerate(zip(offsets, allowed, deltas)):
+        cells = np.flatnonzero(can_step)
+        through = flat_distances[cells + delta] + step_cost
+        # the first offset that reaches the lowest cost wins ties
+        better = through < best[cells]
+        best[cells[better]] = through[better]
+        directions[cells[better]] = direction
+    directions[flat_distances == 0] = -1
+    return directions.reshape(grid.shape)
+
+class FlowField(Maze):
+    """ A class to hold a distance field and a direction field towards one or more sources.
+
+    This is a class that sweeps the grid once from its sources, and is a child class of the Maze class. Any number of
+    agents heading to the sources can then follow the direction field, reading their path in O(path length) instead
+    of running a search each. Call update after the grid or the sources change.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        sources : list
+            a list of the source positions.
+        neighbors : str
+            a string that represents which neighbors within the grid are considered.
+        distances : numpy.array
+            the cost from every cell to the nearest source, inf where none can be reached.
+        directions : numpy.array
+            the index of the offset to step along from every cell, -1 where there is none.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        sources : list
+            a list of the source positions.
+        neighbors : str
+            the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+
+    Methods
+    -------
+        update(sources:list)
+            a method to sweep the grid again
+        next_step(position:tuple)
+            a method to get the position to step to from a position
+        path_from(position:tuple)
+            a method to get the path from a position to the nearest source
+    """
+    def __init__(self, grid:np.array, sources:list, neighbors:str = "8_wind") -> None:
+        Maze.__init__(self, grid=grid)
+        self.neighbors = neighbors
+        self.offsets = get_neighborhood(neighbors)
+        self.update(sources)
+
+    def update(self, sources:Union[list,None] = None) -> None:
+        """ A function to sweep the grid again.
+
+        Parameters
+        ----------
+            sources : list/None
+                a list of the new source positions, or None to keep the current sources
+        """
+        if sources is not None:
+            self.sources = list(sources)
+        tables = _step_tables(self.grid, self.neighbors)
+        self.distances = _distance_field(self.grid, self.sources, tables)
+        self.directions = _direction_field(self.grid, self.distances, tables)
+
+    def next_step(self, position:tuple) -> Union[tuple,None]:
+        """ A function to get the position to step to from a position.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a cell
+
+        Returns
+        -------
+            tuple/None
+                the next position, or None at a source or where no source can be reached
+        """
+        direction = self.directions[position]
+        if direction < 0:
+            return None
+        row_offset, col_offset, _ = self.offsets[direction]
+        return position[0] + row_offset, position[1] + col_offset
+
+    def path_from(self, position:tuple) -> list:
+        """ A function to get the path from a position to the nearest source.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the agent's position
+
+        Returns
+        -------
+            path_list : list
+                the path from the source back to the position, like VisitedNodes.create_path, or [None] if no source
+                can be reached
+        """
+        if self.distances[position] == np.inf:
+            return [None]
+        path_list = [tuple(position)]
+        step = self.next_step(path_list[-1])
+        while step is not None:
+            path_list.append(step)
+            step = self.next_step(step)
+        path_list.reverse()
+        return path_list
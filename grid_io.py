@@ -0,0 +1,283 @@
+import struct
+import numpy as np
+from typing import Iterator,Tuple,Union
+from numpy.lib.format import open_memmap
+
+# every binary format starts with an 8 byte magic string and the number of rows and columns as two uint32
+PACKED_MAGIC = b"PFBITS1\n"
+RLE_MAGIC = b"PFRLE1\n\x00"
+_HEADER = struct.Struct("<8sII")
+
+def save_npy(path:str, grid:np.array) -> None:
+    """ A function to save a grid as a .npy file.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        grid : numpy.array
+            a numpy.array object with integer values.
+    """
+    np.save(path, np.asarray(grid))
+
+def load_npy(path:str, mmap_mode:Union[str,None] = "r") -> np.array:
+    """ A function to load a grid from a .npy file.
+
+    With a mmap_mode the file is memory mapped, so loading takes constant time and only the pages a search touches are
+    read. Use "r+" to be able to change cells, or None to read the whole grid into memory.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        mmap_mode : str/None
+            the numpy.load memory map mode
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid, as a numpy.memmap unless mmap_mode is None
+    """
+    return np.load(path, mmap_mode=mmap_mode)
+
+def _read_header(file, magic:bytes) -> Tuple[int,int]:
+    found, rows, cols = _HEADER.unpack(file.read(_HEADER.size))
+    if found != magic:
+        raise ValueError(f"not a {magic[:-1].decode(errors='ignore')} file")
+    return rows, cols
+
+def save_packed(path:str, grid:np.array, chunk_rows:int = 1024) -> None:
+    """ A function to save the occupancy of a grid with one bit per cell.
+
+    Only whether a cell is accessible (0) or not is kept, so the file is an eighth of a uint8 grid. The grid is
+    packed chunk_rows rows at a time, so a memory mapped grid is never read into memory at once.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        grid : numpy.array
+            a numpy.array object with integer values.
+        chunk_rows : int
+            the number of rows packed at a time
+    """
+    rows, cols = grid.shape
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(PACKED_MAGIC, rows, cols))
+        for row in range(0, rows, chunk_rows):
+            file.write(np.packbits(np.asarray(grid[row:row + chunk_rows]) != 0, axis=1).tobytes())
+
+def load_packed(path:str, out:Union[np.array,None] = None, chunk_rows:int = 1024) -> np.array:
+    """ A function to load a grid saved with save_packed.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        out : numpy.array/None
+            an array (for example a memory mapped one from open_npy) to unpack into; a new uint8 array if None
+        chunk_rows : int
+            the number of rows unpacked at a time
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid, with 1 for blocked cells and 0 for accessible cells
+    """
+    rows, cols = read_shape(path)
+    if out is None:
+        out = np.empty((rows, cols), dtype=np.uint8)
+    for row, chunk in iter_packed_rows(path, chunk_rows):
+        out[row:row + len(chunk)] = chunk
+    return out
+
+def iter_packed_rows(path:str, chunk_rows:int = 1024) -> Iterator[Tuple[int,np.array]]:
+    """ A function to read a grid saved with save_packed a few rows at a time.
+
+    The packed bits are memory mapped and unpacked chunk_rows rows at a time.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        chunk_rows : int
+            the number of rows per chunk
+
+    Yields
+    ------
+        Tuple[int,np.array]
+            the index of the first row of the chunk and the unpacked uint8 rows
+    """
+    rows, cols = read_shape(path)
+    packed = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size, shape=(rows, -(-cols // 8)))
+    for row in range(0, rows, chunk_rows):
+        yield row, np.unpackbits(packed[row:row + chunk_rows], axis=1, count=cols)
+
+def save_rle(path:str, grid:np.array) -> None:
+    """ A function to save a grid with every row run length encoded.
+
+    Each row is stored as the number of runs, then the value (int32) and the length (uint32) of every run. Maps with
+    long walls and open areas shrink to a small part of their size, and any integer values are kept.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        grid : numpy.array
+            a numpy.array object with integer values.
+    """
+    rows, cols = grid.shape
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(RLE_MAGIC, rows, cols))
+        for row in range(rows):
+            values = np.asarray(grid[row])
+            starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1)) if cols else np.zeros(0, int)
+            lengths = np.diff(np.append(starts, cols))
+            file.write(struct.pack("<I", len(starts)))
+            file.write(values[starts].astype("<i4").tobytes())
+            file.write(lengths.astype("<u4").tobytes())
+
+def iter_rle_rows(path:str) -> Iterator[np.array]:
+    """ A function to read a grid saved with save_rle one row at a time.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+
+    Yields
+    ------
+        np.array
+            the decoded int32 row
+    """
+    with open(path, "rb") as file:
+        rows, cols = _read_header(file, RLE_MAGIC)
+        for _ in range(rows):
+            count, = struct.unpack("<I", file.read(4))
+            values = np.frombuffer(file.read(4 * count), dtype="<i4")
+            lengths = np.frombuffer(file.read(4 * count), dtype="<u4")
+            yield np.repeat(values, lengths)
+
+def load_rle(path:str, out:Union[np.array,None] = None) -> np.array:
+    """ A function to load a grid saved with save_rle.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        out : numpy.array/None
+            an array (for example a memory mapped one from open_npy) to decode into; a new int32 array if None
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid
+    """
+    rows, cols = read_shape(path)
+    if out is None:
+        out = np.empty((rows, cols), dtype=np.int32)
+    for row, values in enumerate(iter_rle_rows(path)):
+        out[row] = values
+    return out
+
+def load_text(path:str, out:Union[np.array,None] = None, delimiter:str = ",") -> np.array:
+    """ A function to load a grid from a delimited text file like data_np.txt, one line at a time.
+
+    Values may be written as floats. Unlike np.genfromtxt, no intermediate lists of the whole file are built, so a
+    large text map can be converted straight into a memory mapped array from open_npy.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        out : numpy.array/None
+            an array to parse into; a new int32 array if None
+        delimiter : str
+            the string between values
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid
+    """
+    if out is None:
+        rows, cols = 0, 0
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    cols = cols or len(line.split(delimiter))
+                    rows += 1
+        out = np.empty((rows, cols), dtype=np.int32)
+    with open(path) as file:
+        row = 0
+        for line in file:
+            if line.strip():
+                out[row] = np.array(line.split(delimiter), dtype=float)
+                row += 1
+    return out
+
+def open_npy(path:str, shape:tuple, dtype:str = "uint8") -> np.array:
+    """ A function to create a memory mapped .npy file to load a grid into.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        shape : tuple
+            the shape of the grid
+        dtype : str
+            the type of the cells
+
+    Returns
+    -------
+        grid : numpy.memmap
+            a writable memory mapped array backed by the file
+    """
+    return open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+
+def read_shape(path:str) -> Tuple[int,int]:
+    """ A function to read the shape of a grid saved with save_packed or save_rle.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+
+    Returns
+    -------
+        Tuple[int,int]
+            the number of rows and columns
+    """
+    with open(path, "rb") as file:
+        magic, rows, cols = _HEADER.unpack(file.read(_HEADER.size))
+    if magic not in (PACKED_MAGIC, RLE_MAGIC):
+        raise ValueError(f"{path} is not a bit packed or run length encoded grid")
+    return rows, cols
+
+def load_grid(path:str, mmap_mode:Union[str,None] = "r") -> np.array:
+    """ A function to load a grid from any of the supported formats.
+
+    The format is told apart by the start of the file: the .npy magic, the packed magic or the run length encoded
+    magic. Anything else is read as delimited text.
+
+    Parameters
+    ----------
+        path : str
+            the path of the file
+        mmap_mode : str/None
+            the memory map mode for .npy files
+
+    Returns
+    -------
+        grid : numpy.array
+            the grid
+    """
+    with open(path, "rb") as file:
+        magic = file.read(8)
+    if magic.startswith(b"\x93NUMPY"):
+        return load_npy(path, mmap_mode=mmap_mode)
+    if magic == PACKED_MAGIC:
+        return load_packed(path)
+    if magic == RLE_MAGIC:
+        return load_rle(path)
+    return load_text(path)
@@ -0,0 +1,187 @@
+import numpy as np
+import math
+from typing import Callable,Union
+
+def heuristic_contract(admissible_for:tuple = (), consistent_for:tuple = ()) -> Callable:
+    """ A function that records the guarantees a heuristic makes.
+
+        This function returns a decorator that stores the neighborhoods a heuristic is admissible and consistent for on
+        the heuristic itself. An admissible heuristic never overestimates the cost to reach the end, so a_star returns
+        an optimal path. A consistent heuristic also never drops by more than the step cost between two neighbors
+        (h(n) <= cost(n, m) + h(m)), so a node is expanded with its optimal cost the first time and a_star never has to
+        reopen a closed node. Heuristics without a contract are treated as neither.
+
+        Parameters
+        ----------
+            admissible_for : tuple
+                a tuple of the neighborhoods the heuristic is admissible for
+            consistent_for : tuple
+                a tuple of the neighborhoods the heuristic is consistent for
+        Returns
+        -------
+            Callable
+                a decorator that sets the admissible_for and consistent_for attributes of a heuristic
+
+    """
+    def decorator(heuristic:Callable) -> Callable:
+        heuristic.admissible_for = tuple(admissible_for)
+        heuristic.consistent_for = tuple(consistent_for)
+        return heuristic
+    return decorator
+
+def is_consistent(heuristic:Callable, neighbors:str) -> bool:
+    """ A function that checks if a heuristic is consistent for a neighborhood.
+
+        Parameters
+        ----------
+            heuristic : Callable
+                a heuristic function
+            neighbors : str
+                a string that represents which neighbors within the grid are considered
+        Returns
+        -------
+            bool
+                True if the heuristic's contract states it is consistent for the neighborhood
+
+    """
+    return neighbors in getattr(heuristic, "consistent_for", ())
+
+def is_admissible(heuristic:Callable, neighbors:str) -> bool:
+    """ A function that checks if a heuristic is admissible for a neighborhood.
+
+        Parameters
+        ----------
+            heuristic : Callable
+                a heuristic function
+            neighbors : str
+                a string that represents which neighbors within the grid are considered
+        Returns
+        -------
+            bool
+                True if the heuristic's contract states it is admissible (consistency implies admissibility)
+
+    """
+    return neighbors in getattr(heuristic, "admissible_for", ()) or is_consistent(heuristic, neighbors)
+
+ALL_WINDS = ("4_wind", "8_wind", "8_wind_no_corner_cutting")
+
+# heuristics used; diagonal_distance is used by default
+@heuristic_contract(admissible_for=ALL_WINDS, consistent_for=ALL_WINDS)
+def euclidean_distance(child_node, end):
+    return math.sqrt((pow(child_node[0]-end[0],2))+(pow(child_node[1]-end[1],2)))
+
+@heuristic_contract(admissible_for=("4_wind",), consistent_for=("4_wind",))
+def manhattan_distance(child_node,end):
+    return (abs(child_node[0] - end[0]) + abs(child_node[1]-end[1])) * 10
+
+@heuristic_contract(admissible_for=ALL_WINDS, consistent_for=ALL_WINDS)
+def diagonal_distance(child_node,end):
+    dx = abs(child_node[0] - end[0])
+    dy = abs(child_node[1] - end[1])
+
+    return 10 * (dx+dy) + (14 - 2 * 10) * min(dx,dy)
+
+@heuristic_contract(admissible_for=ALL_WINDS, consistent_for=ALL_WINDS)
+def zero_distance(child_node,end):
+    # turns a_star into Dijkstra's algorithm
+    return 0
+
+# vectorized versions; nodes is an (n, 2) array of positions and an array of n estimates is returned
+def euclidean_distance_batch(nodes:np.array, end:tuple) -> np.array:
+    nodes = np.asarray(nodes)
+    return np.hypot(nodes[:, 0] - end[0], nodes[:, 1] - end[1])
+
+def manhattan_distance_batch(nodes:np.array, end:tuple) -> np.array:
+    nodes = np.asarray(nodes)
+    return (np.abs(nodes[:, 0] - end[0]) + np.abs(nodes[:, 1] - end[1])) * 10
+
+def diagonal_distance_batch(nodes:np.array, end:tuple) -> np.array:
+    nodes = np.asarray(nodes)
+    dx = np.abs(nodes[:, 0] - end[0])
+    dy = np.abs(nodes[:, 1] - end[1])
+    return 10 * (dx + dy) + (14 - 2 * 10) * np.minimum(dx, dy)
+
+def zero_distance_batch(nodes:np.array, end:tuple) -> np.array:
+    return np.zeros(len(nodes), dtype=np.int64)
+
+HEURISTICS = dict()
+
+def register_heuristic(name:str, heuristic:Callable, batch:Union[Callable,None] = None) -> Callable:
+    """ A function that registers a heuristic under a name.
+
+        The heuristic is a function of (position, end). If a vectorized batch function of (nodes, end) is given, it is
+        stored as the batch attribute of the heuristic and used by score_batch.
+
+        Parameters
+        ----------
+            name : str
+                a string that the heuristic is selected by
+            heuristic : Callable
+                a heuristic function
+            batch : Callable/None
+                a vectorized version of the heuristic
+        Returns
+        -------
+            heuristic : Callable
+                the registered heuristic
+
+    """
+    if batch is not None:
+        heuristic.batch = batch
+    HEURISTICS[name] = heuristic
+    return heuristic
+
+def get_heuristic(heuristic:Union[str,Callable]) -> Callable:
+    """ A function that resolves a heuristic name or callable to a heuristic function.
+
+        Parameters
+        ----------
+            heuristic : str/Callable
+                the name of a registered heuristic, or a heuristic function
+        Returns
+        -------
+            Callable
+                a heuristic function
+
+    """
+    if callable(heuristic):
+        return heuristic
+    try:
+        return HEURISTICS[heuristic]
+    except KeyError:
+        raise ValueError(f"unknown heuristic {heuristic!r}, expected one of {tuple(HEURISTICS)}") from None
+
+def score_batch(heuristic:Union[str,Callable], nodes:np.array, end:tuple, weight:float = 1.0) -> np.array:
+    """ A function that scores a batch of candidate cells in one call.
+
+        The vectorized version of the heuristic is used if it has one, otherwise the heuristic is called per cell.
+
+        Parameters
+        ----------
+            heuristic : str/Callable
+                the name of a registered heuristic, or a heuristic function
+            nodes : np.array
+                an (n, 2) array of positions
+            end : tuple
+                a tuple detailing the ending node's position
+            weight : float
+                a factor the estimates are multiplied by
+        Returns
+        -------
+            np.array
+                an array of n weighted estimates
+
+    """
+    heuristic = get_heuristic(heuristic)
+    batch = getattr(heuristic, "batch", None)
+    if batch is not None:
+        scores = batch(nodes, end)
+    else:
+        scores = np.fromiter((heuristic(tuple(node), end) for node in np.asarray(nodes)), dtype=float, count=len(nodes))
+    return scores * weight if weight != 1 else scores
+
+register_heuristic("euclidean", euclidean_distance, euclidean_distance_batch)
+register_heuristic("manhattan", manhattan_distance, manhattan_distance_batch)
+register_heuristic("diagonal", diagonal_distance, diagonal_distance_batch)
+register_heuristic("octile", diagonal_distance, diagonal_distance_batch)
+register_heuristic("zero", zero_distance, zero_distance_batch)
@@ -0,0 +1,370 @@
+import numpy as np
+from typing import Tuple,Union
+from data_structures import Maze,LightNode,VisitedNodes,PriorityQueue,NO_CORNER_CUTTING,get_neighborhood
+from heuristics import diagonal_distance
+from pathfinding_algorithms import a_star,path_cost
+
+class HierarchicalMaze(Maze):
+    """ A class to hold a maze together with a precomputed cluster graph for HPA*.
+
+    This is a class that splits the grid into square clusters of cluster_size cells. Along the border between two
+    adjacent clusters, every run of accessible cell pairs is an entrance; short entrances get one transition in the
+    middle and entrances of six cells or more get one transition at each end. Diagonal moves that no entrance covers,
+    such as those across a cluster corner, are transitions of their own. The transition cells are the nodes of an
+    abstract graph. Transitions across a border are linked with their step cost, and the nodes within a cluster
+    are linked with the cost of the shortest path between them inside the cluster, found with a_star. Queries are
+    answered by hpa_star.
+
+    When cells change through update_cells, only the clusters that contain the changed cells, and the clusters next
+    to them, are rebuilt.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        cluster_size : int
+            the number of rows and columns of a cluster.
+        neighbors : str
+            a string that represents which neighbors within the grid are considered.
+        cluster_nodes : dict
+            a dictionary of cluster -> set of abstract node positions in the cluster.
+        intra_edges : dict
+            a dictionary of cluster -> {position: {position: cost}} for the paths within a cluster.
+        inter_edges : dict
+            a dictionary of position -> {position: cost} for the steps across cluster borders.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        cluster_size : int
+            the number of rows and columns of a cluster.
+        neighbors : str
+            a string that represents which neighbors within the grid are considered.
+
+    Methods
+    -------
+        cluster_of(position:tuple)
+            a method to get the cluster a position belongs to
+        cluster_bounds(cluster:tuple)
+            a method to get the rows and columns a cluster covers
+        update_cells(cells:list)
+            a method to change cells and rebuild the affected clusters
+    """
+    def __init__(self, grid:np.array, cluster_size:int = 10, neighbors:str = "8_wind") -> None:
+        Maze.__init__(self, grid=grid)
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        get_neighborhood(neighbors)
+        self.cluster_size = cluster_size
+        self.neighbors = neighbors
+        self.cluster_rows = -(-self.grid_shape[0] // cluster_size)
+        self.cluster_cols = -(-self.grid_shape[1] // cluster_size)
+        self.cluster_nodes = dict()
+        self.intra_edges = dict()
+        self.inter_edges = dict()
+        self._borders = dict()
+        clusters = [(row, col) for row in range(self.cluster_rows) for col in range(self.cluster_cols)]
+        self._rebuild(clusters)
+
+    def cluster_of(self, position:tuple) -> tuple:
+        return position[0] // self.cluster_size, position[1] // self.cluster_size
+
+    def cluster_bounds(self, cluster:tuple) -> Tuple[int,int,int,int]:
+        """ A function to get the rows and columns a cluster covers.
+
+        Parameters
+        ----------
+            cluster : tuple
+                a tuple of the cluster's row and column
+
+        Returns
+        -------
+            Tuple[int,int,int,int]
+                the first row, the row after the last, the first column and the column after the last
+        """
+        top = cluster[0] * self.cluster_size
+        left = cluster[1] * self.cluster_size
+        return top, min(top + self.cluster_size, self.grid_shape[0]), left, min(left + self.cluster_size, self.grid_shape[1])
+
+    def _adjacent_clusters(self, cluster:tuple) -> list:
+        adjacent = list()
+        for row_offset in (-1, 0, 1):
+            for col_offset in (-1, 0, 1):
+                row, col = cluster[0] + row_offset, cluster[1] + col_offset
+                if (row_offset or col_offset) and 0 <= row < self.cluster_rows and 0 <= col < self.cluster_cols:
+                    adjacent.append((row, col))
+        return adjacent
+
+    def _find_transitions(self, first:tuple, second:tuple) -> list:
+        """ A function to find the transitions across the border of two adjacent clusters.
+
+        This is a function that collects every legal move from a cell of the first cluster to a cell of the second.
+        Straight moves are grouped into entrances, runs of neighboring moves, and each entrance is represented by one
+        or two of its moves. A diagonal move is kept on its own when one of its cells has no straight move across the
+        border, since the entrances cannot stand in for it then; this covers diagonal squeezes and cluster corners.
+
+        Parameters
+        ----------
+            first : tuple
+                one of the clusters
+            second : tuple
+                an adjacent cluster
+
+        Returns
+        -------
+            transitions : list
+                a list of (position in first, position in second, cost) tuples
+        """
+        top, bottom, left, right = self.cluster_bounds(first)
+        check_corners = self.neighbors in NO_CORNER_CUTTING
+        straight = list()
+        diagonal = list()
+        for row in range(top, bottom):
+            for col in range(left, right):
+                if self.grid[row, col] != 0 or top < row < bottom - 1 and left < col < right - 1:
+                    continue
+                for row_offset, col_offset, cost in get_neighborhood(self.neighbors):
+                    child = (row + row_offset, col + col_offset)
+                    if not (0 <= child[0] < self.grid_shape[0] and 0 <= child[1] < self.grid_shape[1]):
+                        continue
+                    if self.cluster_of(child) != second or self.grid[child] != 0:
+                        continue
+                    if row_offset and col_offset:
+                        if check_corners and (self.grid[child[0], col] != 0 or self.grid[row, child[1]] != 0):
+                            continue
+                        diagonal.append(((row, col), child, cost))
+                    else:
+                        straight.append(((row, col), child, cost))
+
+        transitions = list()
+        run = list()
+        for move in straight + [None]:
+            if move is not None and (not run or abs(move[0][0] - run[-1][0][0]) + abs(move[0][1] - run[-1][0][1]) == 1):
+                run.append(move)
+                continue
+            if run:
+                if len(run) < 6:
+                    transitions.append(run[len(run) // 2])
+                else:
+                    transitions.extend([run[0], run[-1]])
+            run = [move]
+
+        crossing = {position for move in straight for position in move[:2]}
+        for move in diagonal:
+            if move[0] not in crossing or move[1] not in crossing:
+                transitions.append(move)
+        return transitions
+
+    def _rebuild(self, clusters:list) -> None:
+        """ A function to rebuild the entrances and abstract edges of a set of clusters.
+
+        This is a function that recomputes the transitions of every border around the given clusters, and then the
+        abstract nodes and intra-cluster edges of every cluster on those borders, since their transitions may have
+        moved.
+
+        Parameters
+        ----------
+            clusters : list
+                a list of clusters whose cells changed
+        """
+        borders = set()
+        for cluster in clusters:
+            # a diagonal move past a corner may depend on cells of a third cluster, so the borders between the
+            # neighbors of a changed cluster are rebuilt as well
+            area = set(self._adjacent_clusters(cluster)) | {cluster}
+            for first in area:
+                for second in self._adjacent_clusters(first):
+                    if second in area:
+                        borders.add((min(first, second), max(first, second)))
+
+        for border in borders:
+            for first, second, _ in self._borders.get(border, ()):
+                self.inter_edges.get(first, {}).pop(second, None)
+                self.inter_edges.get(second, {}).pop(first, None)
+            transitions = self._find_transitions(*border)
+            self._borders[border] = transitions
+            for first, second, cost in transitions:
+                self.inter_edges.setdefault(first, {})[second] = cost
+                self.inter_edges.setdefault(second, {})[first] = cost
+
+        touched = set(clusters)
+        for first, second in borders:
+            touched.update((first, second))
+        for cluster in touched:
+            nodes = set()
+            for adjacent in self._adjacent_clusters(cluster):
+                for first, second, _ in self._borders.get((min(cluster, adjacent), max(cluster, adjacent)), ()):
+                    nodes.add(first if self.cluster_of(first) == cluster else second)
+            self.cluster_nodes[cluster] = nodes
+            self.intra_edges[cluster] = self._connect(cluster, sorted(nodes))
+        for position in [position for position, edges in self.inter_edges.items() if not edges]:
+            del self.inter_edges[position]
+
+    def _local_path(self, cluster:tuple, start:tuple, end:tuple) -> list:
+        """ A function to find the shortest path between two positions without leaving a cluster.
+
+        Parameters
+        ----------
+            cluster : tuple
+                the cluster both positions are in
+            start : tuple
+                a tuple detailing the starting position in grid coordinates
+            end : tuple
+                a tuple detailing the ending position in grid coordinates
+
+        Returns
+        -------
+            path_list : list
+                the path from end to start in grid coordinates, or [None] if there is none inside the cluster
+        """
+        top, bottom, left, right = self.cluster_bounds(cluster)
+        _, path_list = a_star(self.grid[top:bottom, left:right], (start[0] - top, start[1] - left),
+                              (end[0] - top, end[1] - left), lightweight=True, neighbors=self.neighbors)
+        if path_list == [None]:
+            return path_list
+        return [(row + top, col + left) for row, col in path_list]
+
+    def _connect(self, cluster:tuple, nodes:list, extra:Union[tuple,None] = None) -> dict:
+        """ A function to compute the cost between abstract nodes within a cluster.
+
+        Parameters
+        ----------
+            cluster : tuple
+                the cluster the nodes are in
+            nodes : list
+                a list of node positions in the cluster
+            extra : tuple/None
+                if given, only the costs from this position to the nodes are computed
+
+        Returns
+        -------
+            edges : dict
+                a dictionary of position -> {position: cost}
+        """
+        edges = {node: dict() for node in nodes}
+        sources = [extra] if extra is not None else nodes
+        for index, source in enumerate(sources):
+            targets = nodes if extra is not None else nodes[index + 1:]
+            for target in targets:
+                if target == source:
+                    continue
+                path_list = self._local_path(cluster, source, target)
+                if path_list != [None]:
+                    cost = path_cost(path_list)
+                    edges.setdefault(source, {})[target] = cost
+                    edges[target][source] = cost
+        return edges
+
+    def update_cells(self, cells:list) -> list:
+        """ A function to change cells and rebuild the affected clusters.
+
+        Parameters
+        ----------
+            cells : list
+                a list of (row, col, value) tuples
+
+        Returns
+        -------
+            changed : list
+                a list of the positions whose value changed
+        """
+        changed = Maze.update_cells(self, cells)
+        if changed:
+            self._rebuild(sorted({self.cluster_of(position) for position in changed}))
+        return changed
+
+    def abstract_neighbors(self, position:tuple) -> dict:
+        """ A function to get the abstract nodes linked to an abstract node.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of an abstract node
+
+        Returns
+        -------
+            dict
+                a dictionary of position -> cost
+        """
+        neighbors = dict(self.intra_edges.get(self.cluster_of(position), {}).get(position, {}))
+        neighbors.update(self.inter_edges.get(position, {}))
+        return neighbors
+
+def hpa_star(maze:HierarchicalMaze, start:tuple, end:tuple) -> Tuple[list,list]:
+    """ A function that searches for a path in a HierarchicalMaze using hierarchical path-finding A* (HPA*)
+
+        This function links the start and end to the abstract nodes of their clusters (and to each other if they share
+        a cluster) with a_star searches inside the cluster, runs A* over the abstract graph, and refines every abstract
+        edge on the result into cells: edges within a cluster are refined with a_star on the cluster, edges across a
+        border are a single step. The path is near optimal; it only crosses cluster borders at transitions.
+
+        Parameters
+        ----------
+            maze : HierarchicalMaze
+                a HierarchicalMaze object
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+        Returns
+        -------
+            Tuple[list,list]
+                A list of the abstract nodes that were visited and a list of nodes that are included in the path
+
+    """
+    grid = maze.grid
+    if grid[start[0], start[1]] != 0 or grid[end[0], end[1]] != 0:
+        return [None],[None]
+    if start == end:
+        return [start],[start]
+
+    # temporary edges linking the start and end into the abstract graph for this query
+    temporary_edges = dict()
+    for position in (start, end):
+        cluster = maze.cluster_of(position)
+        nodes = sorted(maze.cluster_nodes.get(cluster, ()))
+        for source, targets in maze._connect(cluster, nodes, extra=position).items():
+            for target, cost in targets.items():
+                temporary_edges.setdefault(source, {})[target] = cost
+    if maze.cluster_of(start) == maze.cluster_of(end):
+        local_path_list = maze._local_path(maze.cluster_of(start), start, end)
+        if local_path_list != [None]:
+            cost = path_cost(local_path_list)
+            temporary_edges.setdefault(start, {})[end] = cost
+            temporary_edges.setdefault(end, {})[start] = cost
+
+    visited = VisitedNodes()
+    priority_queue = PriorityQueue()
+    priority_queue.push(LightNode(grid, start, neighbors=maze.neighbors, cost=0, heuristic=diagonal_distance(start, end)))
+    abstract_path = None
+    while len(priority_queue) > 0:
+        node = priority_queue.pop()
+        visited._store_node(node)
+        if node.pos == end:
+            _, abstract_path = visited.create_path(node.pos, start)
+            break
+        neighbors = maze.abstract_neighbors(node.pos)
+        neighbors.update(temporary_edges.get(node.pos, {}))
+        for neighbor, cost in neighbors.items():
+            if visited.contains(neighbor):
+                continue
+            neighbor_cost = node.cost + cost
+            queued_node = priority_queue.get(neighbor)
+            if queued_node is None or neighbor_cost < queued_node.cost:
+                priority_queue.push(LightNode(grid, neighbor, parent=node.pos, neighbors=maze.neighbors, cost=neighbor_cost,
+                                              heuristic=diagonal_distance(neighbor, end)))
+    if abstract_path is None:
+        return [None],[None]
+
+    # abstract_path runs from end to start; refine each edge into cells in the same order
+    path_list = [abstract_path[0]]
+    for current, following in zip(abstract_path, abstract_path[1:]):
+        if maze.cluster_of(current) == maze.cluster_of(following):
+            segment = maze._local_path(maze.cluster_of(current), following, current)
+            path_list.extend(segment[1:])
+        else:
+            path_list.append(following)
+    return visited.visited_nodes, path_list
@@ -0,0 +1,337 @@
+import numpy as np
+from typing import Tuple,Union
+from data_structures import Maze,LightNode,VisitedNodes,PriorityQueue,EIGHT_WIND,free_cells
+from heuristics import diagonal_distance
+
+# direction order of the jump table, the same order as the 8_wind neighborhood
+DIRECTIONS = tuple((value["calc"][0], value["calc"][1]) for value in EIGHT_WIND.values())
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+def _sign(value:int) -> int:
+    return (value > 0) - (value < 0)
+
+def _octile_cost(a:tuple, b:tuple) -> int:
+    return diagonal_distance(a, b)
+
+class JumpPointTable(Maze):
+    """ A class to hold precomputed jump distances for JPS+.
+
+    This is a class that precomputes, for every cell of a static grid and each of the eight directions, how far a
+    jump in that direction travels before it stops. A positive value is the number of steps to the next jump point; a
+    value of zero or below is minus the number of free steps before the jump runs into a blocked cell or the edge of
+    the grid. The table does not depend on the start or end of a query, so it is built once and shared by every jps
+    call on the same grid. The grid must not change after the table is built.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        distances : numpy.array
+            an int32 array shaped (rows, cols, 8) with the jump distances in DIRECTIONS order.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+    """
+    def __init__(self, grid:np.array) -> None:
+        Maze.__init__(self, grid=grid)
+        self.distances = self._build()
+        self._free, self._width = _padded_free_bytes(self.grid)
+
+    def walkable(self, row:int, col:int) -> bool:
+        return self._free[(row + 1) * self._width + col + 1] == 1
+
+    def _build(self) -> np.array:
+        """ A function to compute the jump distances of every cell.
+
+        This is a function that sweeps the grid once per direction. Each sweep walks row by row (or column by column
+        for horizontal directions) against the direction of travel, so the distance of a cell is derived from the
+        distance of the cell it steps into with vectorized numpy operations.
+
+        Returns
+        -------
+            distances : numpy.array
+                an int32 array shaped (rows, cols, 8)
+        """
+        rows, cols = self.grid_shape
+        free = np.zeros((rows + 2, cols + 2), dtype=bool)
+        free[1:-1, 1:-1] = free_cells(self.grid)
+
+        def shifted(array:np.array, row_offset:int, col_offset:int) -> np.array:
+            # value of array at (row + row_offset, col + col_offset) for every padded cell, False outside
+            result = np.zeros_like(array)
+            source = array[max(row_offset, 0):array.shape[0] + min(row_offset, 0),
+                           max(col_offset, 0):array.shape[1] + min(col_offset, 0)]
+            result[max(-row_offset, 0):array.shape[0] + min(-row_offset, 0),
+                   max(-col_offset, 0):array.shape[1] + min(-col_offset, 0)] = source
+            return result
+
+        tables = dict()
+        # cardinal directions first, the diagonal sweeps read them
+        for direction in sorted(DIRECTIONS, key=lambda direction: direction[0] != 0 and direction[1] != 0):
+            row_step, col_step = direction
+            if row_step and col_step:
+                jump_point = ((shifted(free, -row_step, col_step) & ~shifted(free, -row_step, 0)) |
+                              (shifted(free, row_step, -col_step) & ~shifted(free, 0, -col_step)) |
+                              (tables[(row_step, 0)] > 0) | (tables[(0, col_step)] > 0))
+            elif row_step:
+                jump_point = ((shifted(free, row_step, 1) & ~shifted(free, 0, 1)) |
+                              (shifted(free, row_step, -1) & ~shifted(free, 0, -1)))
+            else:
+                jump_point = ((shifted(free, 1, col_step) & ~shifted(free, 1, 0)) |
+                              (shifted(free, -1, col_step) & ~shifted(free, -1, 0)))
+            tables[direction] = self._sweep(free, jump_point, row_step, col_step)
+
+        distances = np.empty((rows, cols, len(DIRECTIONS)), dtype=np.int32)
+        for index, direction in enumerate(DIRECTIONS):
+            distances[:, :, index] = tables[direction][1:-1, 1:-1]
+        return distances
+
+    @staticmethod
+    def _sweep(free:np.array, jump_point:np.array, row_step:int, col_step:int) -> np.array:
+        """ A function to compute the jump distances of one direction over a padded grid.
+
+        Parameters
+        ----------
+            free : numpy.array
+                a padded bool array of the accessible cells
+            jump_point : numpy.array
+                a padded bool array of the cells a jump in this direction stops at
+            row_step : int
+                the row component of the direction
+            col_step : int
+                the column component of the direction
+
+        Returns
+        -------
+            table : numpy.array
+                a padded int32 array of jump distances
+        """
+        table = np.zeros(free.shape, dtype=np.int32)
+        padded_rows, padded_cols = free.shape
+        if row_step:
+            order = range(padded_rows - 2, 0, -1) if row_step > 0 else range(1, padded_rows - 1)
+            interior = slice(1, padded_cols - 1)
+            stepped = slice(1 + col_step, padded_cols - 1 + col_step)
+            for row in order:
+                next_row = row + row_step
+                previous = table[next_row, stepped]
+                table[row, interior] = np.where(~free[next_row, stepped], 0,
+                                                np.where(jump_point[next_row, stepped], 1,
+                                                         np.where(previous > 0, previous + 1, previous - 1)))
+        else:
+            order = range(padded_cols - 2, 0, -1) if col_step > 0 else range(1, padded_cols - 1)
+            interior = slice(1, padded_rows - 1)
+            for col in order:
+                next_col = col + col_step
+                previous = table[interior, next_col]
+                table[interior, col] = np.where(~free[interior, next_col], 0,
+                                                np.where(jump_point[interior, next_col], 1,
+                                                         np.where(previous > 0, previous + 1, previous - 1)))
+        return table
+
+    def jump(self, position:tuple, direction:tuple, end:tuple) -> Union[tuple,None]:
+        """ A function to look up the successor of a jump.
+
+        This is a function that reads the precomputed distance of a jump and bounds it by the end position: if the end
+        lies on the jump's line (or can be reached by a straight move from a cell on a diagonal jump) before the jump
+        stops, the jump stops there instead.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position the jump starts from
+            direction : tuple
+                a tuple of the row and column step of the jump
+            end : tuple
+                a tuple detailing the ending node's position
+
+        Returns
+        -------
+            tuple/None
+                the position the jump stops at, or None if it runs into a wall without finding a jump point
+        """
+        row_step, col_step = direction
+        distance = int(self.distances[position[0], position[1], DIRECTION_INDEX[direction]])
+        reach = distance if distance > 0 else -distance
+        row_delta = end[0] - position[0]
+        col_delta = end[1] - position[1]
+        steps = None
+        if row_step and col_step:
+            if _sign(row_delta) == row_step and _sign(col_delta) == col_step:
+                steps = min(abs(row_delta), abs(col_delta))
+        elif row_step:
+            if col_delta == 0 and _sign(row_delta) == row_step:
+                steps = abs(row_delta)
+        elif row_delta == 0 and _sign(col_delta) == col_step:
+            steps = abs(col_delta)
+        if steps is not None and steps <= reach:
+            return position[0] + steps * row_step, position[1] + steps * col_step
+        if distance > 0:
+            return position[0] + distance * row_step, position[1] + distance * col_step
+        return None
+
+def _padded_free_bytes(grid:np.array) -> Tuple[bytes,int]:
+    # one byte per cell of the grid padded with a blocked border; indexing bytes is much cheaper than indexing a numpy
+    # array per cell
+    rows, cols = grid.shape
+    free = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    free[1:-1, 1:-1] = free_cells(grid)
+    return free.tobytes(), cols + 2
+
+class _JumpGrid:
+    """ A class to answer walkability and jump queries on a grid for jps. """
+    def __init__(self, grid:np.array) -> None:
+        self._free, self._width = _padded_free_bytes(grid)
+
+    def walkable(self, row:int, col:int) -> bool:
+        return self._free[(row + 1) * self._width + col + 1] == 1
+
+    def jump(self, position:tuple, direction:tuple, end:tuple) -> Union[tuple,None]:
+        """ A function to step in a direction until a jump point, the end or a wall is reached. """
+        walkable = self.walkable
+        row, col = position
+        row_step, col_step = direction
+        while True:
+            row += row_step
+            col += col_step
+            if not walkable(row, col):
+                return None
+            if (row, col) == end:
+                return row, col
+            if row_step and col_step:
+                if ((walkable(row - row_step, col + col_step) and not walkable(row - row_step, col)) or
+                        (walkable(row + row_step, col - col_step) and not walkable(row, col - col_step))):
+                    return row, col
+                if (self.jump((row, col), (row_step, 0), end) is not None or
+                        self.jump((row, col), (0, col_step), end) is not None):
+                    return row, col
+            elif row_step:
+                if ((walkable(row + row_step, col + 1) and not walkable(row, col + 1)) or
+                        (walkable(row + row_step, col - 1) and not walkable(row, col - 1))):
+                    return row, col
+            else:
+                if ((walkable(row + 1, col + col_step) and not walkable(row + 1, col)) or
+                        (walkable(row - 1, col + col_step) and not walkable(row - 1, col))):
+                    return row, col
+
+def _pruned_directions(walkable, position:tuple, parent:Union[tuple,None]) -> list:
+    """ A function to get the natural and forced directions of a jump point.
+
+    Parameters
+    ----------
+        walkable : Callable
+            a function of (row, col) that checks if a cell is accessible
+        position : tuple
+            a tuple describing the position of the jump point
+        parent : tuple/None
+            a tuple describing the position of the jump point's parent
+
+    Returns
+    -------
+        directions : list
+            a list of (row step, column step) tuples to jump in
+    """
+    if parent is None:
+        return list(DIRECTIONS)
+    row, col = position
+    row_step = _sign(row - parent[0])
+    col_step = _sign(col - parent[1])
+    if row_step and col_step:
+        directions = [(0, col_step), (row_step, 0), (row_step, col_step)]
+        if not walkable(row - row_step, col):
+            directions.append((-row_step, col_step))
+        if not walkable(row, col - col_step):
+            directions.append((row_step, -col_step))
+    elif row_step:
+        directions = [(row_step, 0)]
+        if not walkable(row, col + 1):
+            directions.append((row_step, 1))
+        if not walkable(row, col - 1):
+            directions.append((row_step, -1))
+    else:
+        directions = [(0, col_step)]
+        if not walkable(row + 1, col):
+            directions.append((1, col_step))
+        if not walkable(row - 1, col):
+            directions.append((-1, col_step))
+    return directions
+
+def _interpolate(jump_points:list) -> list:
+    """ A function to expand a list of jump points into every cell along the path.
+
+    Parameters
+    ----------
+        jump_points : list
+            a list of positions where consecutive positions lie on a straight or diagonal line
+
+    Returns
+    -------
+        path_list : list
+            a list of every position along the path
+    """
+    path_list = [jump_points[0]]
+    for current, following in zip(jump_points, jump_points[1:]):
+        row_step = _sign(following[0] - current[0])
+        col_step = _sign(following[1] - current[1])
+        row, col = current
+        while (row, col) != following:
+            row += row_step
+            col += col_step
+            path_list.append((row, col))
+    return path_list
+
+def jps(grid:np.array, start:tuple, end:tuple, jump_table:Union[JumpPointTable,None] = None) -> Tuple[list,list]:
+    """ A function that searches for the shortest path in a grid using Jump Point Search
+
+        This function searches an 8_wind grid with uniform step costs for the shortest path using Jump Point Search. JPS
+        is A* that only pushes jump points into the priority queue: from each expanded node it jumps in a straight or
+        diagonal line, skipping every cell that an optimal path would not need to branch at. The function returns the
+        same result as a_star: the jump points in the order they were expanded and the full path with every cell from
+        the end back to the start. If a JumpPointTable of the grid is passed (JPS+), the jumps are looked up in the
+        table instead of being walked cell by cell.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            jump_table : JumpPointTable/None
+                precomputed jump distances of the grid for JPS+
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes and a list of nodes that are included in the path
+
+    """
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None]
+
+    # the table answers walkability queries from bytes it built once, so only a search without one copies the grid
+    jumper = jump_table if jump_table is not None else _JumpGrid(grid)
+    visited = VisitedNodes()
+    priority_queue = PriorityQueue()
+    priority_queue.push(LightNode(grid, start, neighbors="8_wind", cost=0, heuristic=diagonal_distance(start, end)))
+
+    while len(priority_queue) > 0:
+        node = priority_queue.pop()
+        visited._store_node(node)
+        if node.pos == end:
+            visited_list, jump_points = visited.create_path(node.pos, start)
+            return visited_list, _interpolate(jump_points)
+        for direction in _pruned_directions(jumper.walkable, node.pos, node.parent):
+            jump_point = jumper.jump(node.pos, direction, end)
+            if jump_point is None or visited.contains(jump_point):
+                continue
+            jump_cost = node.cost + _octile_cost(node.pos, jump_point)
+            queued_node = priority_queue.get(jump_point)
+            if queued_node is None or jump_cost < queued_node.cost:
+                priority_queue.push(LightNode(grid, jump_point, parent=node.pos, neighbors="8_wind", cost=jump_cost,
+                                              heuristic=diagonal_distance(jump_point, end)))
+    return [None],[None]
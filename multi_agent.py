@@ -0,0 +1,549 @@
+import array
+import heapq
+import itertools
+import math
+import numpy as np
+from typing import Callable,Iterable,Tuple,Union
+from data_structures import Maze,LightNode,STRAIGHT_LINE_COST,DIAGONAL_LINE_COST,get_neighborhood
+from flow_fields import distance_field
+from heuristics import get_heuristic,is_consistent
+
+class ReservationTable:
+    """ A class to hold the space-time cells and moves an agent may not use.
+
+    This is a class that space-time A* checks every state against. A reservation of a position at a time step and a
+    ban on a move between two positions during a time step are each hashed to a single integer, time * cells + index
+    and (time * cells + from index) * cells + to index, so the table is two sets of ints however many agents reserve
+    in it. A parked position is blocked from a time step on, for an agent that has reached its end and stays there.
+
+    Attributes
+    ----------
+        grid_shape : tuple
+            a tuple detailing the bounds of the grid.
+        horizon : int
+            the last time step that any reservation or ban applies to; after it only parked positions are blocked.
+
+    Parameters
+    ----------
+        grid_shape : tuple
+            a tuple detailing the bounds of the grid.
+
+    Methods
+    -------
+        block(position:tuple, time:int)
+            a method to reserve a position at a time step
+        block_move(from_position:tuple, to_position:tuple, time:int)
+            a method to ban the move between two positions from a time step to the next
+        park(position:tuple, time:int)
+            a method to reserve a position from a time step on
+        reserve_path(path:list, park:bool)
+            a method to reserve the positions of a timed path, and the swaps that would collide with it
+        is_blocked(position:tuple, time:int)
+            a method to check whether a position is reserved at a time step
+        copy()
+            a method to copy the table
+    """
+    def __init__(self, grid_shape:tuple) -> None:
+        self.grid_shape = grid_shape
+        self.horizon = 0
+        self._cells = grid_shape[0] * grid_shape[1]
+        self._vertices = set()
+        self._moves = set()
+        self._parked = dict()
+        # the last time step every position is reserved at, so a search knows when an agent may stop there
+        self._last = dict()
+
+    def _index(self, position:tuple) -> int:
+        return position[0] * self.grid_shape[1] + position[1]
+
+    def block(self, position:tuple, time:int) -> None:
+        index = self._index(position)
+        self._vertices.add(time * self._cells + index)
+        self._last[index] = max(self._last.get(index, -1), time)
+        self.horizon = max(self.horizon, time)
+
+    def block_move(self, from_position:tuple, to_position:tuple, time:int) -> None:
+        self._moves.add((time * self._cells + self._index(from_position)) * self._cells + self._index(to_position))
+        self.horizon = max(self.horizon, time + 1)
+
+    def park(self, position:tuple, time:int) -> None:
+        index = self._index(position)
+        self._parked[index] = min(self._parked.get(index, time), time)
+        self._last[index] = math.inf
+        self.horizon = max(self.horizon, time)
+
+    def reserve_path(self, path:list, park:bool = True) -> None:
+        """ A function to reserve the positions of a timed path.
+
+        Every position is reserved at its time step, and the opposite of every move is banned during it, so another
+        agent can neither stand on the path nor swap places with the agent.
+
+        Parameters
+        ----------
+            path : list
+                a list of positions, one per time step
+            park : bool
+                if True, the last position stays reserved after the path ends
+        """
+        for time, position in enumerate(path):
+            self.block(position, time)
+            if time > 0 and position != path[time - 1]:
+                self.block_move(position, path[time - 1], time - 1)
+        if park:
+            self.park(path[-1], len(path) - 1)
+
+    def is_blocked(self, position:tuple, time:int) -> bool:
+        index = self._index(position)
+        return time * self._cells + index in self._vertices or time >= self._parked.get(index, math.inf)
+
+    def copy(self) -> "ReservationTable":
+        table = ReservationTable(self.grid_shape)
+        table.horizon = self.horizon
+        table._vertices = set(self._vertices)
+        table._moves = set(self._moves)
+        table._parked = dict(self._parked)
+        table._last = dict(self._last)
+        return table
+
+    def __repr__(self) -> str:
+        return (f"ReservationTable(horizon={self.horizon}, positions={len(self._vertices)}, moves={len(self._moves)}, "
+                f"parked={len(self._parked)})")
+
+def timed_path_cost(path:list, wait_cost:Union[int,float] = STRAIGHT_LINE_COST) -> Union[int,float]:
+    """ A function that adds up the cost of a timed path
+
+        Parameters
+        ----------
+            path : list
+                a list of positions, one per time step
+            wait_cost : int/float
+                the cost of staying in place for a time step
+        Returns
+        -------
+            int/float
+                the sum of the straight (10), diagonal (14) and wait step costs, 0 for a path without steps
+
+    """
+    if not path or path[0] is None:
+        return 0
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        if a == b:
+            cost += wait_cost
+        else:
+            cost += DIAGONAL_LINE_COST if a[0] != b[0] and a[1] != b[1] else STRAIGHT_LINE_COST
+    return cost
+
+def find_conflicts(paths:list, first:bool = False) -> list:
+    """ A function that finds where timed paths collide
+
+        Agents that reached the end of their path stay on its last position. Two agents collide when they are on the
+        same position at the same time step ("vertex"), or swap positions during a time step ("swap").
+
+        Parameters
+        ----------
+            paths : list
+                a list of timed paths, one per agent; [None] for agents without a path, which are skipped
+            first : bool
+                if True, only the earliest conflict is returned
+        Returns
+        -------
+            list
+                a list of (time, agent, other agent, kind, position, other position) tuples; for a swap, the time is
+                the time step the agents leave position and other position at
+
+    """
+    conflicts = list()
+    agents = [(agent, path) for agent, path in enumerate(paths) if path and path[0] is not None]
+    for time in range(max((len(path) for _, path in agents), default=0)):
+        occupied = dict()
+        for agent, path in agents:
+            position = path[min(time, len(path) - 1)]
+            if position in occupied:
+                conflicts.append((time, occupied[position], agent, "vertex", position, position))
+                if first:
+                    return conflicts
+            else:
+                occupied[position] = agent
+        if time == 0:
+            continue
+        moves = dict()
+        for agent, path in agents:
+            if time < len(path) and path[time] != path[time - 1]:
+                move = (path[time - 1], path[time])
+                other = moves.get((move[1], move[0]))
+                if other is not None:
+                    conflicts.append((time - 1, other, agent, "swap", move[1], move[0]))
+                    if first:
+                        return conflicts
+                moves[move] = agent
+    return conflicts
+
+class _Estimates(dict):
+    # heuristic values by flat index, computed the first time they are needed
+    def __init__(self, heuristic:Callable, end:tuple, cols:int) -> None:
+        dict.__init__(self)
+        self.heuristic = heuristic
+        self.end = end
+        self.cols = cols
+
+    def __missing__(self, index:int) -> float:
+        value = self[index] = self.heuristic(divmod(index, self.cols), self.end)
+        return value
+
+class MultiAgentPlanner(Maze):
+    """ A class to plan collision free paths for many agents on one grid.
+
+    This is a class that plans a timed path per agent, where the position at index t of a path is where the agent is at
+    time step t, and is a child class of the Maze class. At every time step an agent moves to a neighbor, with the
+    neighbors a Node of the neighborhood would generate, or waits in place. No two agents may be on the same position
+    at the same time step or swap positions, and an agent stays on its end once its path is over.
+
+    Paths are found with space-time A*, which searches (position, time step) states against a ReservationTable. By
+    default its heuristic is the exact cost to the end without other agents (see flow_fields.distance_field), computed
+    once per end. This keeps the search on the shortest corridor on grids with many walls, but costs a sweep of the grid
+    per end; on open grids a registered heuristic such as "diagonal" is cheaper. Ends that can not be reached are
+    rejected at once either way. After the horizon of the table only parked positions are blocked, so every state
+    after it is folded into one state per position, which bounds the search even when an agent has to wait for a long
+    time or can not reach its end at all.
+
+    Two methods are available. "prioritized" plans the agents one after another in the given order, and every path
+    is reserved for the agents after it. It is fast and scales to hundreds of agents, but not optimal, and it can fail
+    to find paths that exist; an agent that gets no path is given [None] and parked at its start, and the agents
+    before it are planned again around it if one of their paths crossed its start. "cbs" runs Conflict-Based Search,
+    which finds paths with the lowest sum of costs: it searches a tree of constraint sets and only replans the agents
+    of the earliest conflict, so it is exponential in the number of conflicts and meant for few, crowded agents.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        neighbors : str
+            a string that represents which neighbors within the grid are considered.
+        wait_cost : int/float
+            the cost of staying in place for a time step.
+        heuristic : str/Callable
+            "exact", or the heuristic function space-time A* uses.
+        expanded : int
+            the number of states expanded by space-time A* in the last call to plan.
+        cbs_nodes : int
+            the number of constraint sets expanded by the last call to plan with method "cbs".
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        neighbors : str
+            the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        wait_cost : int/float
+            the cost of staying in place for a time step; it must not be negative
+        heuristic : str/Callable
+            "exact" for the exact cost to the end without other agents, or the name of a registered heuristic or a
+            heuristic function that is consistent for neighbors
+
+    Methods
+    -------
+        plan(starts:list, ends:list, method:str, max_nodes:int)
+            a method to plan a timed path for every agent
+        space_time_a_star(start:tuple, end:tuple, reservations:ReservationTable)
+            a method to plan the path of one agent around reservations
+    """
+    methods = ("prioritized", "cbs")
+
+    def __init__(self, grid:np.array, neighbors:str = "8_wind", wait_cost:Union[int,float] = STRAIGHT_LINE_COST,
+                 heuristic:Union[str,Callable] = "exact") -> None:
+        Maze.__init__(self, grid=grid)
+        get_neighborhood(neighbors)
+        if wait_cost < 0:
+            raise ValueError(f"wait_cost must not be negative, got {wait_cost}")
+        if heuristic != "exact":
+            heuristic = get_heuristic(heuristic)
+            if not is_consistent(heuristic, neighbors):
+                raise ValueError(f"MultiAgentPlanner needs a heuristic that is consistent for {neighbors!r}")
+        self.heuristic = heuristic
+        self.neighbors = neighbors
+        self.wait_cost = wait_cost
+        self.expanded = 0
+        self.cbs_nodes = 0
+        self._cells = self.grid_shape[0] * self.grid_shape[1]
+        self._moves = dict()
+        self._distances = dict()
+        self._version = self.version
+
+    def _check_version(self) -> None:
+        # moves and distances were derived from the grid before update_cells changed it
+        if self._version != self.version:
+            self._moves.clear()
+            self._distances.clear()
+            self._version = self.version
+
+    def _actions(self, index:int) -> list:
+        # waiting in place, then the accessible children a node of the neighborhood generates
+        actions = self._moves.get(index)
+        if actions is None:
+            position = divmod(index, self.grid_shape[1])
+            node = LightNode(self.grid, position, neighbors=self.neighbors)
+            actions = [(index, self.wait_cost)]
+            actions += [(child[0] * self.grid_shape[1] + child[1], cost)
+                        for child, accessibility, cost in node.iter_children() if accessibility]
+            self._moves[index] = actions
+        return actions
+
+    def _distance_to(self, end:tuple) -> Union[array.array,_Estimates]:
+        distances = self._distances.get(end)
+        if distances is None:
+            if self.heuristic == "exact":
+                # indexing an array.array gives python floats, which the heap compares much faster than numpy scalars
+                distances = array.array("d", distance_field(self.grid, [end], self.neighbors).ravel().tobytes())
+            else:
+                distances = _Estimates(self.heuristic, end, self.grid_shape[1])
+            self._distances[end] = distances
+        return distances
+
+    def _connected(self, start:tuple, end:tuple) -> bool:
+        return self.components(self.neighbors).connected(start, end)
+
+    def space_time_a_star(self, start:tuple, end:tuple, reservations:Union[ReservationTable,None] = None,
+                          max_expansions:Union[int,None] = None) -> Union[list,None]:
+        """ A function to plan the path of one agent around reservations.
+
+        Parameters
+        ----------
+            start : tuple
+                a tuple detailing the agent's position at time step 0
+            end : tuple
+                a tuple detailing the position the agent stays on once it arrives
+            reservations : ReservationTable/None
+                the positions and moves the agent may not use, or None for none
+            max_expansions : int/None
+                the largest number of states to expand before giving up, or None for no limit
+
+        Returns
+        -------
+            list/None
+                a list of positions, one per time step, with the lowest cost; None if there is none or max_expansions
+                runs out
+        """
+        self._check_version()
+        reservations = reservations if reservations is not None else ReservationTable(self.grid_shape)
+        cells = self._cells
+        vertices, moves, parked = reservations._vertices, reservations._moves, reservations._parked
+        distances = self._distance_to(end)
+        start_index = start[0] * self.grid_shape[1] + start[1]
+        end_index = end[0] * self.grid_shape[1] + end[1]
+        if start_index in vertices or parked.get(start_index, 1) <= 0:
+            return None
+        if math.isinf(distances[start_index]) if self.heuristic == "exact" else not self._connected(start, end):
+            return None
+        # the agent may only stop on its end after the last time step it is reserved at
+        stop_after = reservations._last.get(end_index, -1)
+        if math.isinf(stop_after):
+            return None
+        # every remaining time step before the agent may stop costs at least the cheapest action, which keeps the
+        # estimate tight when the end is only free late
+        cheapest = min(self.wait_cost, min(cost for _, _, cost in get_neighborhood(self.neighbors)))
+        # states after the horizon only differ by position
+        folded = reservations.horizon + 1
+        infinity = math.inf
+        actions_of = self._moves
+
+        limit = math.inf if max_expansions is None else self.expanded + max_expansions
+        counter = itertools.count()
+        estimate = max(distances[start_index], (stop_after + 1) * cheapest)
+        open_list = [(estimate, estimate, next(counter), 0, 0, start_index, start_index)]
+        best = {start_index: 0}
+        parents = {start_index: None}
+        closed = set()
+        while open_list:
+            _, _, _, cost, time, index, key = heapq.heappop(open_list)
+            if key in closed:
+                continue
+            closed.add(key)
+            if self.expanded >= limit:
+                return None
+            self.expanded += 1
+            if index == end_index and time > stop_after:
+                path = list()
+                while key is not None:
+                    path.append(divmod(key % cells, self.grid_shape[1]))
+                    key = parents[key]
+                return path[::-1]
+
+            next_time = time + 1
+            next_base = min(next_time, folded) * cells
+            move_base = (time * cells + index) * cells if time < folded else None
+            for child, step_cost in actions_of.get(index) or self._actions(index):
+                child_key = next_base + child
+                if child_key in closed or child_key in vertices or (child in parked and next_time >= parked[child]):
+                    continue
+                if move_base is not None and move_base + child in moves:
+                    continue
+                child_cost = cost + step_cost
+                if child_cost < best.get(child_key, infinity):
+                    best[child_key] = child_cost
+                    parents[child_key] = key
+                    estimate = distances[child]
+                    if next_time <= stop_after and (stop_after + 1 - next_time) * cheapest > estimate:
+                        estimate = (stop_after + 1 - next_time) * cheapest
+                    heapq.heappush(open_list, (child_cost + estimate, estimate, next(counter), child_cost, next_time,
+                                               child, child_key))
+        return None
+
+    def _validate(self, starts:list, ends:list) -> Tuple[list,list]:
+        starts = [tuple(start) for start in starts]
+        ends = [tuple(end) for end in ends]
+        if len(starts) != len(ends):
+            raise ValueError(f"got {len(starts)} starts and {len(ends)} ends")
+        for name, positions in (("starts", starts), ("ends", ends)):
+            if len(set(positions)) != len(positions):
+                raise ValueError(f"{name} must be distinct positions")
+            for position in positions:
+                if not (0 <= position[0] < self.grid_shape[0] and 0 <= position[1] < self.grid_shape[1]):
+                    raise ValueError(f"position {position} is out of bounds for a grid shaped {self.grid_shape}")
+        return starts, ends
+
+    def plan(self, starts:Iterable, ends:Iterable, method:str = "prioritized", max_nodes:int = 10000,
+             max_expansions:Union[int,None] = None) -> list:
+        """ A function to plan a timed path for every agent.
+
+        Parameters
+        ----------
+            starts : Iterable
+                the position of every agent at time step 0
+            ends : Iterable
+                the position every agent has to reach and stay on, in the same order as starts
+            method : str
+                "prioritized" to plan the agents in the given order, or "cbs" for the lowest sum of costs
+            max_nodes : int
+                the largest number of constraint sets "cbs" expands before it gives up
+            max_expansions : int/None
+                the largest number of states space-time A* expands per path; an agent whose end is blocked for good
+                otherwise makes it search every state before the horizon, which is slow on large grids
+
+        Returns
+        -------
+            list
+                a list of timed paths in the order of the agents; [None] for an agent without a path. With "cbs",
+                every agent gets [None] if there is no collision free plan or max_nodes runs out
+        """
+        if method not in self.methods:
+            raise ValueError(f"method must be one of {self.methods}, got {method!r}")
+        starts, ends = self._validate(list(starts), list(ends))
+        self.expanded = 0
+        self.cbs_nodes = 0
+        if method == "cbs":
+            return self._conflict_based_search(starts, ends, max_nodes, max_expansions)
+
+        return self._prioritized(starts, ends, max_expansions)
+
+    def _prioritized(self, starts:list, ends:list, max_expansions:Union[int,None]) -> list:
+        # an agent without a path stays on its start for good, so once one fails every agent is planned again with it
+        # parked there, unless no earlier path crosses its start; the failed agents only grow, so this ends
+        stuck = set()
+        while True:
+            reservations = ReservationTable(self.grid_shape)
+            # every agent is on its start at time step 0
+            for agent, start in enumerate(starts):
+                if agent in stuck:
+                    reservations.park(start, 0)
+                else:
+                    reservations.block(start, 0)
+            paths = list()
+            for agent, (start, end) in enumerate(zip(starts, ends)):
+                if agent in stuck:
+                    paths.append([None])
+                    continue
+                # the agent's own start is only reserved for itself
+                reservations._vertices.discard(reservations._index(start))
+                path = self.space_time_a_star(start, end, reservations, max_expansions)
+                if path is None:
+                    stuck.add(agent)
+                    reservations.park(start, 0)
+                    paths.append([None])
+                    if any(start in earlier for earlier in paths):
+                        break
+                else:
+                    paths.append(path)
+                    reservations.reserve_path(path)
+            else:
+                return paths
+
+    def _conflict_based_search(self, starts:list, ends:list, max_nodes:int,
+                               max_expansions:Union[int,None]) -> list:
+        agents = len(starts)
+        tables = [ReservationTable(self.grid_shape) for _ in range(agents)]
+        paths = [self.space_time_a_star(start, end, table, max_expansions)
+                 for start, end, table in zip(starts, ends, tables)]
+        if any(path is None for path in paths):
+            return [[None] for _ in range(agents)]
+        costs = [timed_path_cost(path, self.wait_cost) for path in paths]
+
+        counter = itertools.count()
+        open_list = [(sum(costs), next(counter), tables, paths, costs)]
+        while open_list and self.cbs_nodes < max_nodes:
+            _, _, tables, paths, costs = heapq.heappop(open_list)
+            self.cbs_nodes += 1
+            conflicts = find_conflicts(paths, first=True)
+            if not conflicts:
+                return paths
+            time, agent, other, kind, position, other_position = conflicts[0]
+            for constrained, moved_from, moved_to in ((agent, position, other_position),
+                                                      (other, other_position, position)):
+                table = tables[constrained].copy()
+                if kind == "vertex":
+                    table.block(position, time)
+                else:
+                    table.block_move(moved_from, moved_to, time)
+                path = self.space_time_a_star(starts[constrained], ends[constrained], table, max_expansions)
+                if path is None:
+                    continue
+                child_tables = list(tables)
+                child_tables[constrained] = table
+                child_paths = list(paths)
+                child_paths[constrained] = path
+                child_costs = list(costs)
+                child_costs[constrained] = timed_path_cost(path, self.wait_cost)
+                heapq.heappush(open_list, (sum(child_costs), next(counter), child_tables, child_paths, child_costs))
+        return [[None] for _ in range(agents)]
+
+def plan_paths(grid:Union[np.array,Maze], starts:Iterable, ends:Iterable, method:str = "prioritized",
+               neighbors:str = "8_wind", wait_cost:Union[int,float] = STRAIGHT_LINE_COST,
+               heuristic:Union[str,Callable] = "exact", max_nodes:int = 10000,
+               max_expansions:Union[int,None] = None) -> list:
+    """ A function that plans collision free timed paths for many agents
+
+        This function is a shortcut for MultiAgentPlanner(grid, neighbors, wait_cost, heuristic).plan(starts, ends,
+        method, max_nodes, max_expansions).
+
+        Parameters
+        ----------
+            grid : np.array/Maze
+                a numpy array detailing the grid, or a Maze holding it
+            starts : Iterable
+                the position of every agent at time step 0
+            ends : Iterable
+                the position every agent has to reach and stay on
+            method : str
+                "prioritized" or "cbs" (see MultiAgentPlanner)
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            wait_cost : int/float
+                the cost of staying in place for a time step
+            heuristic : str/Callable
+                "exact", or a registered heuristic or heuristic function that is consistent for neighbors
+            max_nodes : int
+                the largest number of constraint sets "cbs" expands
+            max_expansions : int/None
+                the largest number of states space-time A* expands per path
+        Returns
+        -------
+            list
+                a list of timed paths, a list of positions per time step for every agent; [None] for an agent without
+                a path
+
+    """
+    grid = grid.grid if isinstance(grid, Maze) else grid
+    planner = MultiAgentPlanner(grid, neighbors=neighbors, wait_cost=wait_cost, heuristic=heuristic)
+    return planner.plan(starts, ends, method=method, max_nodes=max_nodes, max_expansions=max_expansions)
@@ -0,0 +1,157 @@
+import os
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor,as_completed
+from multiprocessing import shared_memory
+from typing import Callable,Iterable,Iterator,Tuple,Union
+from data_structures import Maze
+from pathfinding_algorithms import prepare_batch,solve_prepared,solve_many
+
+class SharedMaze(Maze):
+    """ A class to hold a maze whose grid lives in shared memory.
+
+    This is a class that backs Maze.grid with a multiprocessing.shared_memory block, so worker processes can attach
+    to the grid by name instead of receiving a pickled copy with every task. The process that creates the block owns
+    it and unlinks it when closed; processes that attach only close their view.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object backed by the shared memory block.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        name : str
+            the name of the shared memory block.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values that is copied into a new shared memory block.
+
+    Methods
+    -------
+        attach(name:str, shape:tuple, dtype:str)
+            a method to attach to a grid created by another process
+        close()
+            a method to release the grid, and unlink the block if this maze created it
+    """
+    def __init__(self, grid:np.array) -> None:
+        grid = np.asarray(grid)
+        self._shared_memory = shared_memory.SharedMemory(create=True, size=max(1, grid.nbytes))
+        self._owner = True
+        shared_grid = np.ndarray(grid.shape, dtype=grid.dtype, buffer=self._shared_memory.buf)
+        shared_grid[...] = grid
+        Maze.__init__(self, grid=shared_grid)
+        self.name = self._shared_memory.name
+
+    @classmethod
+    def attach(cls, name:str, shape:tuple, dtype:str) -> "SharedMaze":
+        maze = cls.__new__(cls)
+        maze._shared_memory = shared_memory.SharedMemory(name=name)
+        maze._owner = False
+        Maze.__init__(maze, grid=np.ndarray(shape, dtype=dtype, buffer=maze._shared_memory.buf))
+        maze.name = name
+        return maze
+
+    def close(self) -> None:
+        if self._shared_memory is None:
+            return
+        # the array has to go before the buffer it views can be closed
+        self.grid = None
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+        self._shared_memory = None
+
+    def __enter__(self) -> "SharedMaze":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# per worker state, set once by _init_worker
+_worker = dict()
+
+def _init_worker(name:str, shape:tuple, dtype:str, algorithm:Union[str,Callable], kwargs:dict) -> None:
+    maze = SharedMaze.attach(name, shape, dtype)
+    grid, search, labels, kwargs = prepare_batch(maze.grid, algorithm, **kwargs)
+    _worker.update(maze=maze, grid=grid, search=search, labels=labels, kwargs=kwargs)
+
+def _solve_chunk(chunk:list) -> list:
+    grid, search, labels, kwargs = _worker["grid"], _worker["search"], _worker["labels"], _worker["kwargs"]
+    return [(index, solve_prepared(grid, search, labels, start, end, **kwargs)) for index, (start, end) in chunk]
+
+def default_workers() -> int:
+    """ A function that picks the number of worker processes.
+
+    Returns
+    -------
+        int
+            the number of CPUs this process may run on
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+def solve_parallel(grid:Union[np.array,Maze], pairs:Iterable, algorithm:Union[str,Callable] = "a_star",
+                   workers:Union[int,None] = None, chunksize:Union[int,None] = None, ordered:bool = True,
+                   **kwargs) -> Iterator:
+    """ A function that searches for paths between many pairs of positions with a pool of processes
+
+        This function splits the pairs into chunks and solves them with solve_many's per grid preparation in a
+        ProcessPoolExecutor. The grid is placed in shared memory once (or reused, if a SharedMaze is passed), and every
+        worker attaches to it and prepares it once when it starts, so a task only carries its chunk of pairs. With a
+        single worker, or a single chunk, the pairs are solved in this process without starting a pool.
+
+        Parameters
+        ----------
+            grid : np.array/Maze
+                a numpy array detailing the grid, or a Maze (or SharedMaze) holding it
+            pairs : Iterable
+                an iterable of (start, end) tuples
+            algorithm : str/Callable
+                the name of an algorithm in pathfinding_algorithms.ALGORITHMS, or a picklable module level function
+            workers : int/None
+                the number of worker processes; the number of usable CPUs if None
+            chunksize : int/None
+                the number of pairs per task; if None, about four tasks per worker
+            ordered : bool
+                if True, results are yielded in the order of pairs; otherwise as soon as their chunk finishes
+            **kwargs
+                keyword arguments passed on to the algorithm
+        Yields
+        -------
+            Tuple[list,list] / Tuple[int,Tuple[list,list]]
+                if ordered, the visited list and path list of each pair; otherwise the index of the pair with them
+
+    """
+    pairs = list(pairs)
+    workers = default_workers() if workers is None else workers
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(pairs) / (workers * 4)))
+    indexed_pairs = list(enumerate(pairs))
+    chunks = [indexed_pairs[offset:offset + chunksize] for offset in range(0, len(indexed_pairs), chunksize)]
+
+    if workers == 1 or len(chunks) <= 1:
+        results = solve_many(grid.grid if isinstance(grid, Maze) else grid, pairs, algorithm, **kwargs)
+        for index, result in enumerate(results):
+            yield result if ordered else (index, result)
+        return
+
+    maze = grid if isinstance(grid, SharedMaze) else SharedMaze(grid.grid if isinstance(grid, Maze) else grid)
+    try:
+        initargs = (maze.name, maze.grid_shape, maze.grid.dtype.str, algorithm, kwargs)
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            if ordered:
+                for chunk_results in executor.map(_solve_chunk, chunks):
+                    for _, result in chunk_results:
+                        yield result
+            else:
+                for future in as_completed([executor.submit(_solve_chunk, chunk) for chunk in chunks]):
+                    yield from future.result()
+    finally:
+        if maze is not grid:
+            maze.close()
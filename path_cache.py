@@ -0,0 +1,259 @@
+import hashlib
+import inspect
+import weakref
+import numpy as np
+from collections import OrderedDict
+from typing import Callable,Tuple,Union
+from data_structures import Maze
+from heuristics import get_heuristic,is_admissible
+from pathfinding_algorithms import ALGORITHMS
+
+# algorithms whose paths are shortest paths, so every subpath of a cached path is a shortest path too
+OPTIMAL_ALGORITHMS = {"a_star", "bfs", "bidirectional_bfs", "bidirectional_a_star", "jps", "iddfs", "ida_star"}
+
+def grid_fingerprint(grid:np.array) -> str:
+    """ A function to fingerprint the contents of a grid.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+
+    Returns
+    -------
+        str
+            a digest of the shape, type and values of the grid
+    """
+    grid = np.ascontiguousarray(grid)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((grid.shape, grid.dtype.str)).encode())
+    digest.update(grid.data)
+    return digest.hexdigest()
+
+class PathCache:
+    """ A class to cache the results of path queries.
+
+    This is a class that keeps the results of searches keyed by the grid's fingerprint, the start, the end, the
+    algorithm, the neighborhood and any other keyword arguments. Entries are evicted in least recently used order once
+    there are more than max_entries of them, or once the paths and visited lists they hold add up to more than
+    max_cells positions.
+
+    The fingerprint of a Maze is only recomputed when its version changes, which happens when cells are changed
+    through Maze.update_cells; the entries of the old version are dropped then. Cells written to maze.grid directly do
+    not change the version. A numpy array is fingerprinted on every query.
+
+    For algorithms that return shortest paths, a query whose start and end both lie on a cached path of the same grid
+    and settings is answered with the slice of that path between them, without searching. On weighted grids the slice
+    must run in the direction the path was searched, since a step costs the weight of the cell it enters. The visited
+    list of such an answer is empty, since nothing was visited.
+
+    Attributes
+    ----------
+        max_entries : int
+            the largest number of entries kept.
+        max_cells : int/None
+            the largest number of positions kept over all entries, or None for no limit.
+        hits : int
+            the number of queries answered with a cached result.
+        subpath_hits : int
+            the number of hits that were answered with a slice of a cached path.
+        misses : int
+            the number of queries that had to be searched.
+        evictions : int
+            the number of entries evicted.
+
+    Parameters
+    ----------
+        max_entries : int
+            the largest number of entries kept.
+        max_cells : int/None
+            the largest number of positions kept over all entries, or None for no limit.
+
+    Methods
+    -------
+        solve(grid, start:tuple, end:tuple, algorithm, **kwargs)
+            a method to answer a query from the cache, or search and cache it
+        invalidate(grid)
+            a method to drop every entry of a grid
+        clear()
+            a method to drop every entry
+        info()
+            a method to get the counters and sizes of the cache
+    """
+    def __init__(self, max_entries:int = 1024, max_cells:Union[int,None] = None) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._cells = 0
+        # group -> position -> keys of cached shortest paths through the position
+        self._through = dict()
+        self._maze_fingerprints = weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fingerprint(self, grid:Union[np.array,Maze]) -> str:
+        if not isinstance(grid, Maze):
+            return grid_fingerprint(grid)
+        version, fingerprint = self._maze_fingerprints.get(grid, (None, None))
+        if version != grid.version:
+            if fingerprint is not None:
+                self._drop_fingerprint(fingerprint)
+            fingerprint = grid_fingerprint(grid.grid)
+            self._maze_fingerprints[grid] = (grid.version, fingerprint)
+        return fingerprint
+
+    def _group(self, fingerprint:str, algorithm:Union[str,Callable], kwargs:dict) -> tuple:
+        search = ALGORITHMS[algorithm] if isinstance(algorithm, str) else algorithm
+        parameters = inspect.signature(search).parameters
+        if "neighbors" not in kwargs and "neighbors" in parameters:
+            kwargs = dict(kwargs, neighbors=parameters["neighbors"].default)
+        settings = tuple(sorted((name, value if isinstance(value, str) else repr(value)) for name, value in kwargs.items()
+                                if name not in ("_stack", "stats", "on_expand", "on_push", "components")))
+        return fingerprint, algorithm, settings
+
+    def _is_optimal(self, algorithm:Union[str,Callable], kwargs:dict) -> bool:
+        if algorithm not in OPTIMAL_ALGORITHMS:
+            return False
+        if kwargs.get("max_expansions") is not None or kwargs.get("time_budget") is not None:
+            # a search that ran out of budget may return a partial path
+            return False
+        if algorithm in ("a_star", "ida_star"):
+            heuristic = get_heuristic(kwargs.get("heuristic", "diagonal"))
+            return kwargs.get("weight", 1.0) == 1 and is_admissible(heuristic, kwargs.get("neighbors", "8_wind"))
+        return True
+
+    def _subpath(self, group:tuple, start:tuple, end:tuple, reversible:bool = True) -> Union[list,None]:
+        through = self._through.get(group)
+        if not through or start not in through or end not in through:
+            return None
+        for key in through[start] & through[end]:
+            path_list = self._entries[key][1]
+            start_index = path_list.index(start)
+            end_index = path_list.index(end)
+            # path lists run from end to start; the built in neighborhoods are symmetric, so a path can be walked back
+            # unless stepping into a cell costs its weight, which makes a step cost differ by direction
+            if end_index <= start_index:
+                self._entries.move_to_end(key)
+                return path_list[end_index:start_index + 1]
+            if reversible:
+                self._entries.move_to_end(key)
+                return path_list[start_index:end_index + 1][::-1]
+        return None
+
+    def _store(self, key:tuple, group:tuple, visited_list:list, path_list:list, optimal:bool) -> None:
+        size = len(visited_list) + len(path_list)
+        self._entries[key] = (visited_list, path_list, group, size, optimal)
+        self._cells += size
+        if optimal and path_list != [None]:
+            through = self._through.setdefault(group, dict())
+            for position in path_list:
+                through.setdefault(position, set()).add(key)
+        while len(self._entries) > self.max_entries or (self.max_cells is not None and self._cells > self.max_cells
+                                                        and len(self._entries) > 1):
+            self._evict(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _evict(self, key:tuple) -> None:
+        _, path_list, group, size, optimal = self._entries.pop(key)
+        self._cells -= size
+        if optimal and path_list != [None]:
+            through = self._through[group]
+            for position in path_list:
+                keys = through.get(position)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del through[position]
+            if not through:
+                del self._through[group]
+
+    def _drop_fingerprint(self, fingerprint:str) -> None:
+        for key in [key for key, entry in self._entries.items() if entry[2][0] == fingerprint]:
+            self._evict(key)
+
+    def solve(self, grid:Union[np.array,Maze], start:tuple, end:tuple, algorithm:Union[str,Callable] = "a_star",
+              **kwargs) -> Tuple[list,list]:
+        """ A function to answer a query from the cache, or search and cache it.
+
+        Parameters
+        ----------
+            grid : np.array/Maze
+                a numpy array detailing the grid, or a Maze holding it
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            algorithm : str/Callable
+                the name of an algorithm in pathfinding_algorithms.ALGORITHMS, or a function with the same signature
+            **kwargs
+                keyword arguments passed on to the algorithm
+
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes and a list of nodes that are included in the path
+        """
+        if isinstance(algorithm, str) and algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {tuple(ALGORITHMS)}")
+        start = tuple(start)
+        end = tuple(end)
+        group = self._group(self._fingerprint(grid), algorithm, kwargs)
+        key = group + (start, end)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0]), list(entry[1])
+
+        optimal = self._is_optimal(algorithm, kwargs)
+        if optimal:
+            path_list = self._subpath(group, start, end, reversible=not kwargs.get("weighted"))
+            if path_list is not None:
+                self.hits += 1
+                self.subpath_hits += 1
+                return [], path_list
+
+        self.misses += 1
+        search = ALGORITHMS[algorithm] if isinstance(algorithm, str) else algorithm
+        visited_list, path_list = search(grid.grid if isinstance(grid, Maze) else grid, start, end, **kwargs)
+        self._store(key, group, list(visited_list), list(path_list), optimal)
+        return visited_list, path_list
+
+    def invalidate(self, grid:Union[np.array,Maze]) -> None:
+        """ A function to drop every entry of a grid.
+
+        Parameters
+        ----------
+            grid : np.array/Maze
+                a numpy array detailing the grid, or a Maze holding it
+        """
+        if isinstance(grid, Maze):
+            fingerprint = self._maze_fingerprints.pop(grid, (None, None))[1]
+        else:
+            fingerprint = grid_fingerprint(grid)
+        if fingerprint is not None:
+            self._drop_fingerprint(fingerprint)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._through.clear()
+        self._maze_fingerprints.clear()
+        self._cells = 0
+
+    def info(self) -> dict:
+        """ A function to get the counters and sizes of the cache.
+
+        Returns
+        -------
+            dict
+                a dictionary of the hits, subpath hits, misses, evictions, entries and cells
+        """
+        return {"hits": self.hits, "subpath_hits": self.subpath_hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self._entries), "cells": self._cells}
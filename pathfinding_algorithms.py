@@ -1,9 +1,103 @@
 import numpy as np
 import math
-from typing import Tuple
-from data_structures import Node,VisitedNodes,Queue,Stack,PriorityQueue
+import time
+import inspect
+from typing import Tuple,Callable,Union,Iterable,Iterator,Generator
+from data_structures import (Node,LightNode,VisitedNodes,Queue,Stack,PriorityQueue,BucketQueue,STRAIGHT_LINE_COST,
+                             DIAGONAL_LINE_COST,CONNECTIVITY,ComponentIndex,label_components)
+from heuristics import (heuristic_contract, is_consistent, is_admissible, get_heuristic, euclidean_distance,
+                        manhattan_distance, diagonal_distance)
+from jump_point_search import jps,JumpPointTable
+from search_stats import SearchStats,instrument
 
-def a_star(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
+def path_cost(path_list:list) -> int:
+    """ A function that adds up the step costs along a path
+
+        Parameters
+        ----------
+            path_list : list
+                a list of positions where consecutive positions are neighbors
+        Returns
+        -------
+            int
+                the sum of the straight (10) and diagonal (14) step costs, 0 for a path without steps
+
+    """
+    if not path_list or path_list[0] is None:
+        return 0
+    return sum(DIAGONAL_LINE_COST if a[0] != b[0] and a[1] != b[1] else STRAIGHT_LINE_COST
+               for a, b in zip(path_list, path_list[1:]))
+
+SearchSteps = Generator[Union[Node,LightNode], None, Tuple[list,list]]
+
+def _drain(steps:SearchSteps) -> Tuple[list,list]:
+    # runs a generator core to the end for the plain searches
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def unreachable(components:Union[ComponentIndex,None], neighbors:str, start:tuple, end:tuple) -> bool:
+    """ A function that checks a component index for an end that can not be reached
+
+        Parameters
+        ----------
+            components : ComponentIndex/None
+                an index of the grid (see data_structures.Maze.components), or None to skip the check
+            neighbors : str
+                the neighborhood of the search; the index must have been made for its connectivity
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+        Returns
+        -------
+            bool
+                True if the index shows that there is no path from start to end
+
+    """
+    if components is None:
+        return False
+    if components.connectivity != CONNECTIVITY.get(neighbors, neighbors):
+        raise ValueError(f"components were labeled for {components.connectivity!r}, which does not match {neighbors!r}")
+    return not components.connected(start, end)
+
+def scale_heuristic(grid:np.array, heuristic:Callable, weight:float = 1.0, weighted:bool = False) -> Callable:
+    """ A function that scales a heuristic by the weight of weighted A* and the lowest terrain cost
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            heuristic : Callable
+                a function of (position, end) that estimates the cost from position to end
+            weight : float
+                a factor the heuristic is multiplied by
+            weighted : bool
+                if True, cell values are step cost multipliers, and the heuristic is also multiplied by the lowest one
+        Returns
+        -------
+            Callable
+                the scaled heuristic, or the heuristic itself if the factor is 1
+
+    """
+    if weighted:
+        # every step of a weighted grid costs at least the lowest weight times its unweighted cost
+        weights = np.asarray(grid)
+        weight = weight * weights[weights > 0].min().item()
+    if weight == 1:
+        return heuristic
+    def scaled(position, end):
+        return weight * heuristic(position, end)
+    return scaled
+
+def a_star(grid:np.array,start:tuple,end:tuple,lightweight:bool = False,backend:str = "list",
+           heuristic:Union[str,Callable] = "diagonal",neighbors:str = "8_wind",weight:float = 1.0,
+           weighted:bool = False,queue:str = "heap",stats:Union[SearchStats,None] = None,
+           on_expand:Union[Callable,None] = None,on_push:Union[Callable,None] = None,
+           max_expansions:Union[int,None] = None,time_budget:Union[float,None] = None,
+           partial:bool = False,components:Union[ComponentIndex,None] = None) -> Tuple[list,list]:
     """ A function that searches for the shortest path in a grid using the A* algorithm
 
         This function searches through a grid searching for the shortest path using the A* algorithm. The function first
@@ -12,9 +106,33 @@ def a_star(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
         While there are still objects in the priority_queue, the function will pull the first item from the
         priority_queue and store it in visited. The function will check that the current node's position is not equal
         to the end position; if it does then a visited list and path list is created by calling the appropriate methods
-        from visited. Otherwise, the function iterates on the current node's children, and checks if they are already in
-        visited or the priority_queue, and that the child is accessible (accessible > 0). If true, then child of the
-        current node is added to the priority_queue along with the child's information.
+        from visited. Otherwise, the function iterates on the current node's accessible children, and computes their
+        cost as the current node's cost plus the step cost. Children that are not visited or queued are added to the
+        priority_queue; queued children are updated through decrease_key if the new cost is lower. If the heuristic is
+        not consistent (see heuristic_contract), visited children that are reached with a lower cost are reopened.
+        A weight above 1 turns the search into weighted A*, which expands fewer nodes and returns a path that costs at
+        most weight times the optimal cost.
+
+        If weighted is True, the grid holds terrain costs: stepping into a cell costs the step cost times the cell's
+        value, and cells that are not above 0 (see data_structures.IMPASSABLE) are blocked. The heuristic is multiplied
+        by the lowest weight in the grid, so it never overestimates and stays admissible and consistent. With
+        queue="bucket" a BucketQueue is used instead of the binary heap; it needs integer costs, so integer weights and
+        an integer heuristic such as "diagonal", "manhattan" or "zero".
+
+        If a SearchStats object is passed as stats, it is filled in with the counts, the peak frontier size, the time
+        spent per phase and the cost of the path. on_expand is called with every expanded node and on_push with every
+        pushed node. Without stats and on_push the frontier is not wrapped, so a search without them only pays for one
+        None check per expanded node.
+
+        max_expansions and time_budget bound the search: once that many nodes were expanded, or that many seconds
+        passed, the search stops (stats.exhausted is set). It then returns [None] as the path, or with partial=True the
+        path to the expanded node with the lowest heuristic, that is the one believed closest to the end. A budget
+        also bounds the time it takes to find out that no path exists. For the best path within a budget, see
+        anytime_a_star.
+
+        If components is given (see data_structures.Maze.components), an end in another component than the start is
+        rejected before anything is searched, instead of after every reachable node was expanded. It is not consulted
+        for weighted grids, or with partial=True and a budget, where the partial path is still searched for.
 
         Parameters
         ----------
@@ -24,48 +142,139 @@ def a_star(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
                 a tuple detailing the starting node's position
             end : tuple
                 a tuple detailing the ending node's position
+            lightweight : bool
+                if True, LightNode objects are used instead of Node objects
+            backend : str
+                the VisitedNodes backend; "list" or "array" for flat numpy arrays on very large grids
+            heuristic : str/Callable
+                the name of a registered heuristic (see heuristics.HEURISTICS), or a function of (position, end) that
+                estimates the cost from position to end
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            weight : float
+                a factor the heuristic is multiplied by
+            weighted : bool
+                if True, cell values are step cost multipliers and cells that are not above 0 are blocked
+            queue : str
+                the frontier; "heap" for a PriorityQueue or "bucket" for a BucketQueue
+            stats : SearchStats/None
+                an object to record what the search cost in; it is reset first
+            on_expand : Callable/None
+                a function called with every expanded node
+            on_push : Callable/None
+                a function called with every node pushed into the frontier
+            max_expansions : int/None
+                the largest number of nodes expanded, or None for no limit
+            time_budget : float/None
+                the largest number of seconds searched, or None for no limit
+            partial : bool
+                if True, a search that runs out of budget returns the path to the node closest to the end
+            components : ComponentIndex/None
+                a component index of the grid for the connectivity of neighbors
         Returns
         -------
             Tuple[list,list]
                 A list of visited nodes and a list of nodes that are included in the path
 
     """
+    return _drain(_a_star_steps(grid, start, end, lightweight, backend, heuristic, neighbors, weight, weighted, queue,
+                                stats, on_expand, on_push, max_expansions, time_budget, partial, components))
 
-    # heuristics used; diagonal_distance is used by default
-    def euclidean_distance(child_node, end):
-        return math.sqrt((pow(child_node[0]-end[0],2))+(pow(child_node[1]-end[1],2)))
+def _a_star_steps(grid:np.array, start:tuple, end:tuple, lightweight:bool, backend:str, heuristic:Union[str,Callable],
+                  neighbors:str, weight:float, weighted:bool, queue:str, stats:Union[SearchStats,None],
+                  on_expand:Union[Callable,None], on_push:Union[Callable,None], max_expansions:Union[int,None],
+                  time_budget:Union[float,None], partial:bool, components:Union[ComponentIndex,None],
+                  record_visited:bool = True) -> SearchSteps:
+    """ A generator that runs a_star, yielding every expanded node and returning what a_star returns
 
-    def manhattan_distance(child_node,end):
-        return (abs(child_node[0] - end[0]) + abs(child_node[1]-end[1])) * 10
+        a_star drains it and streaming.iter_a_star turns its nodes into events, so both run the same search. The
+        parameters are those of a_star; with record_visited set to False the visited list is not kept.
 
-    def diagonal_distance(child_node,end):
-        dx = abs(child_node[0] - end[0])
-        dy = abs(child_node[1] - end[1])
-
-        return 10 * (dx+dy) + (14 - 2 * 10) * min(dx,dy)
+    """
 
-    if grid[start[0]][start[1]] == 1 or grid[end[0]][end[1]] == 1:
+    if stats is not None:
+        stats.start()
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    budgeted = max_expansions is not None or deadline is not None
+    if weighted:
+        if grid[start[0], start[1]] <= 0 or grid[end[0], end[1]] <= 0:
+            return [None],[None]
+    elif grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None]
+    elif not (partial and budgeted) and unreachable(components, neighbors, start, end):
         return [None],[None]
+    if queue not in ("heap", "bucket"):
+        raise ValueError(f"queue must be 'heap' or 'bucket', got {queue!r}")
 
-    visited = VisitedNodes()
-    priority_queue = PriorityQueue()
-    priority_queue.push(Node(grid, start, neighbors="8_wind", cost=0, heuristic=diagonal_distance(start, end)))
+    estimate = get_heuristic(heuristic)
+    heuristic = scale_heuristic(grid, estimate, weight, weighted)
+    consistent = is_consistent(estimate, neighbors)
+    node_class = LightNode if lightweight else Node
+    visited = VisitedNodes(grid_shape=grid.shape if backend == "array" else None, backend=backend,
+                           record_visited=record_visited)
+    priority_queue, on_expand = instrument(BucketQueue() if queue == "bucket" else PriorityQueue(), stats, on_expand,
+                                           on_push)
+    priority_queue.push(node_class(grid, start, neighbors=neighbors, cost=0, heuristic=heuristic(start, end),
+                                   weighted=weighted))
+    if stats is not None:
+        stats.mark("setup")
 
+    expansions = 0
+    closest = None
     while len(priority_queue) > 0:
+        if budgeted:
+            if (max_expansions is not None and expansions >= max_expansions) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                if stats is not None:
+                    stats.mark("search")
+                if not partial or closest is None:
+                    if stats is not None:
+                        stats.finish([None], exhausted=True)
+                    return [None],[None]
+                visited_list,path_list = visited.create_path(closest.pos, start)
+                if stats is not None:
+                    stats.finish(path_list, closest.cost, exhausted=True)
+                return visited_list,path_list
+            expansions += 1
         node = priority_queue.pop()
         visited._store_node(node)
+        if on_expand is not None:
+            on_expand(node)
+        yield node
+        if partial and (closest is None or node.heuristic < closest.heuristic):
+            closest = node
         if node.pos == end:
+            if stats is not None:
+                stats.mark("search")
             visited_list,path_list = visited.create_path(node.pos, start)
+            if stats is not None:
+                stats.finish(path_list, node.cost)
             return visited_list,path_list
         else:
-            for child in node.children:
-                if child["node"] not in visited.visited_nodes and child["node"] not in priority_queue.queue_list and child["accessibility"]:
-                    priority_queue.push(Node(grid, child["node"], parent=node.pos, neighbors="8_wind", cost=child["cost"],
-                                             heuristic=diagonal_distance(child["node"], end)))
+            for child_node, accessibility, cost in node.iter_children():
+                if not accessibility:
+                    continue
+                if stats is not None:
+                    stats.generated += 1
+                child_cost = node.cost + cost
+                queued_node = priority_queue.get(child_node)
+                if queued_node is not None:
+                    if child_cost < queued_node.cost:
+                        priority_queue.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors,
+                                                       cost=child_cost, heuristic=queued_node.heuristic,
+                                                       weighted=weighted))
+                elif not visited.contains(child_node) or (not consistent and child_cost < visited.get_cost(child_node)):
+                    priority_queue.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors, cost=child_cost,
+                                                   heuristic=heuristic(child_node, end), weighted=weighted))
+    if stats is not None:
+        stats.mark("search")
     return [None],[None]
 
 
-def dfs(grid:np.array, start:tuple, end:tuple, _stack: Stack = Stack()) -> Tuple[list, list]:
+def dfs(grid:np.array, start:tuple, end:tuple, _stack:Union[Stack,None] = None, lightweight:bool = False,
+        backend:str = "list", neighbors:str = "4_wind", max_depth:Union[int,None] = None,
+        stats:Union[SearchStats,None] = None, on_expand:Union[Callable,None] = None,
+        on_push:Union[Callable,None] = None, components:Union[ComponentIndex,None] = None) -> Tuple[list, list]:
     """ A function that searches for a path in a grid using the Depth-first-search algorithm
 
         This function searches through a grid searching for a path using the Depth-first-search algorithm. The function
@@ -74,7 +283,12 @@ def dfs(grid:np.array, start:tuple, end:tuple, _stack: Stack = Stack()) -> Tuple
         checked to see if it is equal to the end position; if it is, then a list of visited nodes and a path list is
         returned. Otherwise, the function iterates over each child of the current node. The child is checked to see
         if it is in the stack or in visited nodes, and is accessible. If true, the child node is pushed into the stack
-        and the process repeats.
+        and the process repeats. stats, on_expand, on_push and components work as they do for a_star.
+
+        Every call uses a new Stack unless one is passed, so nothing is left over between searches. Nodes carry their
+        depth (the number of steps from the start) as their cost. With a max_depth, nodes at that depth are not
+        expanded, and a visited position that is reached again at a smaller depth is expanded again, so the end is
+        found whenever a path of at most max_depth steps exists.
 
         Parameters
         ----------
@@ -84,33 +298,89 @@ def dfs(grid:np.array, start:tuple, end:tuple, _stack: Stack = Stack()) -> Tuple
                 a tuple detailing the starting node's position
             end : tuple
                 a tuple detailing the ending node's position
-            _stack : Stack = Stack()
-                a stack object
+            _stack : Stack/None
+                a stack object; a new one if None
+            lightweight : bool
+                if True, LightNode objects are used instead of Node objects
+            backend : str
+                the VisitedNodes backend; "list" or "array" for flat numpy arrays on very large grids
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            max_depth : int/None
+                the largest number of steps from the start that is searched, or None for no limit
+            stats : SearchStats/None
+                an object to record what the search cost in; it is reset first
+            on_expand : Callable/None
+                a function called with every expanded node
+            on_push : Callable/None
+                a function called with every node pushed into the frontier
+            components : ComponentIndex/None
+                a component index of the grid for the connectivity of neighbors
         Returns
         -------
             Tuple[list,list]
                 A list of visited nodes and a list of nodes that are included in the path
     """
+    return _drain(_dfs_steps(grid, start, end, _stack, lightweight, backend, neighbors, max_depth, stats, on_expand,
+                             on_push, components))
+
+def _dfs_steps(grid:np.array, start:tuple, end:tuple, _stack:Union[Stack,None], lightweight:bool, backend:str,
+               neighbors:str, max_depth:Union[int,None], stats:Union[SearchStats,None],
+               on_expand:Union[Callable,None], on_push:Union[Callable,None], components:Union[ComponentIndex,None],
+               record_visited:bool = True) -> SearchSteps:
+    """ A generator that runs dfs, yielding every expanded node and returning what dfs returns
+
+        The parameters are those of dfs; with record_visited set to False the visited list is not kept.
 
-    if grid[start[0]][start[1]] == 1 or grid[end[0]][end[1]] == 1:
+    """
+
+    if stats is not None:
+        stats.start()
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1 or unreachable(components, neighbors, start, end):
         return [None],[None]
 
-    _stack.push(Node(grid, start))
-    visited = VisitedNodes()
+    node_class = LightNode if lightweight else Node
+    stack, on_expand = instrument(Stack() if _stack is None else _stack, stats, on_expand, on_push)
+    stack.push(node_class(grid, start, neighbors=neighbors, cost=0))
+    visited = VisitedNodes(grid_shape=grid.shape if backend == "array" else None, backend=backend,
+                           record_visited=record_visited)
+    if stats is not None:
+        stats.mark("setup")
 
-    while len(_stack) > 0:
-            node = _stack.pop()
+    while len(stack) > 0:
+            node = stack.pop()
+            # a position can be stacked by more than one parent; only the most recent push is expanded, unless a depth
+            # limit makes reaching it with fewer steps worth expanding it again
+            if visited.contains(node.pos) and (max_depth is None or visited.get_cost(node.pos) <= node.cost):
+                continue
             visited._store_node(node)
+            if on_expand is not None:
+                on_expand(node)
+            yield node
             if node.pos == end:
+                if stats is not None:
+                    stats.mark("search")
                 visited_list,path_list = visited.create_path(node.pos, start)
+                if stats is not None:
+                    stats.finish(path_list, path_cost(path_list))
                 return visited_list,path_list
-            else:
-                for child in node.children:
-                    if child["node"] not in visited.visited_nodes and child["node"] not in _stack.stacked_nodes and child["accessibility"]:
-                            _stack.push(Node(grid, child["node"], parent=node.pos))
+            elif max_depth is None or node.cost < max_depth:
+                depth = node.cost + 1
+                for child_node, accessibility, cost in node.iter_children():
+                    if not accessibility:
+                        continue
+                    if stats is not None:
+                        stats.generated += 1
+                    if not visited.contains(child_node) or (max_depth is not None and
+                                                            depth < visited.get_cost(child_node)):
+                        stack.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors, cost=depth))
+    if stats is not None:
+        stats.mark("search")
     return [None],[None]
 
-def bfs(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
+def bfs(grid:np.array,start:tuple,end:tuple,lightweight:bool = False,backend:str = "list",
+        neighbors:str = "4_wind",stats:Union[SearchStats,None] = None,on_expand:Union[Callable,None] = None,
+        on_push:Union[Callable,None] = None,components:Union[ComponentIndex,None] = None) -> Tuple[list,list]:
     """ A function that searches for the shortest path in a grid using the Breadth-first-search algorithm
 
         This function searches through a grid searching for the shortest path using the Breadth-first-search algorithm.
@@ -119,6 +389,7 @@ def bfs(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
         visited. If the node's position is equal to the end, then a visited list and a path list is returned. Otherwise,
         each child of the node is iterated upon and checked to see if they are in visited or the queue, and if that
         child is accessible. If true, then that child node is pushed into the queue and the process repeats.
+        stats, on_expand, on_push and components work as they do for a_star.
 
         Parameters
         ----------
@@ -128,27 +399,608 @@ def bfs(grid:np.array,start:tuple,end:tuple) -> Tuple[list,list]:
                 a tuple detailing the starting node's position
             end : tuple
                 a tuple detailing the ending node's position
+            lightweight : bool
+                if True, LightNode objects are used instead of Node objects
+            backend : str
+                the VisitedNodes backend; "list" or "array" for flat numpy arrays on very large grids
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            stats : SearchStats/None
+                an object to record what the search cost in; it is reset first
+            on_expand : Callable/None
+                a function called with every expanded node
+            on_push : Callable/None
+                a function called with every node pushed into the frontier
+            components : ComponentIndex/None
+                a component index of the grid for the connectivity of neighbors
         Returns
         -------
             Tuple[list,list]
                 A list of visited nodes and a list of nodes that are included in the path
     """
+    return _drain(_bfs_steps(grid, start, end, lightweight, backend, neighbors, stats, on_expand, on_push,
+                             components))
 
-    if grid[start[0]][start[1]] == 1 or grid[end[0]][end[1]] == 1:
+def _bfs_steps(grid:np.array, start:tuple, end:tuple, lightweight:bool, backend:str, neighbors:str,
+               stats:Union[SearchStats,None], on_expand:Union[Callable,None], on_push:Union[Callable,None],
+               components:Union[ComponentIndex,None], record_visited:bool = True) -> SearchSteps:
+    """ A generator that runs bfs, yielding every expanded node and returning what bfs returns
+
+        The parameters are those of bfs; with record_visited set to False the visited list is not kept.
+
+    """
+
+    if stats is not None:
+        stats.start()
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1 or unreachable(components, neighbors, start, end):
         return [None],[None]
 
-    queue = Queue()
-    queue.push(Node(grid,start))
-    visited= VisitedNodes()
+    node_class = LightNode if lightweight else Node
+    index_shape = grid.shape if backend == "array" else None
+    queue, on_expand = instrument(Queue(grid_shape=index_shape), stats, on_expand, on_push)
+    queue.push(node_class(grid,start,neighbors=neighbors))
+    visited= VisitedNodes(grid_shape=index_shape, backend=backend, record_visited=record_visited)
+    if stats is not None:
+        stats.mark("setup")
 
     while len(queue) > 0:
         node = queue.pop()
         visited._store_node(node)
+        if on_expand is not None:
+            on_expand(node)
+        yield node
         if node.pos == end:
+            if stats is not None:
+                stats.mark("search")
             visited_list, path_list = visited.create_path(node.pos, start)
+            if stats is not None:
+                stats.finish(path_list, path_cost(path_list))
             return visited_list, path_list
         else:
-            for child in node.children:
-                if child["node"] not in visited.visited_nodes and child["node"] not in queue.queue_list and child["accessibility"]:
-                    queue.push(Node(grid, child["node"], parent=node.pos))
-    return [None],[None]
\ No newline at end of file
+            for child_node, accessibility, cost in node.iter_children():
+                if not accessibility:
+                    continue
+                if stats is not None:
+                    stats.generated += 1
+                if not visited.contains(child_node) and not queue.contains(child_node):
+                    queue.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors))
+    if stats is not None:
+        stats.mark("search")
+    return [None],[None]
+
+def _iterative_deepening(grid:np.array, start:tuple, end:tuple, neighbors:str, step_cost:Callable,
+                         heuristic:Callable, max_bound:Union[int,float,None], table_size:int) -> Tuple[list,list]:
+    """ A function that runs the bounded depth first searches of iddfs and ida_star
+
+        Only the current path is kept: a stack of the positions on it, their costs, and a lazy iterator over the
+        children of each. A child is skipped if it is blocked, already on the path, or if its cost plus its heuristic is
+        above the bound; the lowest such value becomes the bound of the next iteration. A table of up to table_size
+        positions keeps the lowest cost each was reached with in the current iteration, and a position reached again
+        without a lower cost is skipped, since everything below it within the bound has been searched already.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            step_cost : Callable
+                a function of the 10/14 cost of a step that returns the cost the search uses for it
+            heuristic : Callable
+                a function of (position, end) that estimates the cost from position to end
+            max_bound : int/float/None
+                the largest bound that is searched, or None for no limit
+            table_size : int
+                the largest number of positions whose lowest cost is remembered within an iteration
+        Returns
+        -------
+            Tuple[list,list]
+                A list of the nodes visited by the last iteration and a list of nodes that are included in the path
+
+    """
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None]
+    if start == end:
+        return [start],[start]
+
+    bound = heuristic(start, end)
+    while max_bound is None or bound <= max_bound:
+        visited_list = [start]
+        path = [start]
+        on_path = {start}
+        costs = [0]
+        children = [LightNode(grid, start, neighbors=neighbors).iter_children()]
+        lowest_costs = {start: 0} if table_size > 0 else dict()
+        next_bound = math.inf
+        while children:
+            for child_node, accessibility, cost in children[-1]:
+                if not accessibility or child_node in on_path:
+                    continue
+                child_cost = costs[-1] + step_cost(cost)
+                lowest_cost = lowest_costs.get(child_node)
+                if lowest_cost is not None and lowest_cost <= child_cost:
+                    continue
+                if lowest_cost is not None or len(lowest_costs) < table_size:
+                    lowest_costs[child_node] = child_cost
+                estimate = child_cost + heuristic(child_node, end)
+                if estimate > bound:
+                    next_bound = min(next_bound, estimate)
+                    continue
+                visited_list.append(child_node)
+                path.append(child_node)
+                if child_node == end:
+                    return visited_list, path[::-1]
+                on_path.add(child_node)
+                costs.append(child_cost)
+                children.append(LightNode(grid, child_node, neighbors=neighbors).iter_children())
+                break
+            else:
+                children.pop()
+                on_path.discard(path.pop())
+                costs.pop()
+        if next_bound == math.inf:
+            break
+        bound = next_bound
+    return [None],[None]
+
+def iddfs(grid:np.array, start:tuple, end:tuple, neighbors:str = "4_wind", max_depth:Union[int,None] = None,
+          table_size:int = 65536) -> Tuple[list,list]:
+    """ A function that searches for the path with the fewest steps using iterative deepening depth-first-search
+
+        This function runs a depth first search limited to 0 steps, then 1 step, and so on, until the end is found.
+        Unlike dfs and bfs it does not keep a visited set or a frontier, only the current path and a table of at most
+        table_size positions with the fewest steps they were reached with, so its memory has a fixed bound instead of
+        growing with the area searched. The price is time: positions are searched again in every iteration, and once
+        the table is full, as often as there are paths to them. Use max_depth to bound it; if the end is further than
+        max_depth steps away, [None],[None] is returned.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            max_depth : int/None
+                the largest number of steps searched, or None for no limit
+            table_size : int
+                the largest number of positions remembered within an iteration; 0 keeps only the current path
+        Returns
+        -------
+            Tuple[list,list]
+                A list of the nodes visited by the last iteration (a position can be visited more than once) and a
+                list of nodes that are included in the path
+
+    """
+    return _iterative_deepening(grid, start, end, neighbors, lambda cost: 1, lambda position, end: 0, max_depth,
+                                table_size)
+
+def ida_star(grid:np.array, start:tuple, end:tuple, heuristic:Union[str,Callable] = "diagonal",
+             neighbors:str = "8_wind", max_cost:Union[int,float,None] = None,
+             table_size:int = 65536) -> Tuple[list,list]:
+    """ A function that searches for the shortest path in a grid using iterative deepening A* (IDA*)
+
+        This function runs depth first searches that skip every node whose cost plus heuristic is above a bound. The
+        first bound is the heuristic of the start, and every next bound is the lowest value that was above the last
+        one, so with an admissible heuristic the first path found is the cheapest. Like iddfs only the current path and
+        a table of at most table_size positions are kept in memory, and positions are searched again in every
+        iteration; it suits grids that are too large for the visited set of a_star and where the heuristic is close to
+        the real cost. With max_cost the search gives up once the bound is above it.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            heuristic : str/Callable
+                the name of a registered heuristic (see heuristics.HEURISTICS), or a function of (position, end)
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            max_cost : int/float/None
+                the largest path cost searched, or None for no limit
+            table_size : int
+                the largest number of positions remembered within an iteration; 0 keeps only the current path
+        Returns
+        -------
+            Tuple[list,list]
+                A list of the nodes visited by the last iteration (a position can be visited more than once) and a
+                list of nodes that are included in the path
+
+    """
+    return _iterative_deepening(grid, start, end, neighbors, lambda cost: cost, get_heuristic(heuristic), max_cost,
+                                table_size)
+
+def bidirectional_bfs(grid:np.array,start:tuple,end:tuple,lightweight:bool = False,backend:str = "list",
+                      neighbors:str = "4_wind") -> Tuple[list,list]:
+    """ A function that searches for the shortest path in a grid using a Breadth-first-search from both ends
+
+        This function runs one Breadth-first-search from the start and one from the end, each with its own Queue and
+        VisitedNodes object. The search with the smaller queue expands its whole next layer. While a layer is expanded,
+        every popped node or accessible child that the other search has already visited is a meeting point, and its
+        path length is recorded. Once a layer produced a meeting point, no shorter path can exist, so the two parent
+        chains of the best meeting point are stitched together with VisitedNodes.create_path. On long routes the two
+        searches meet after expanding about half the layers a single bfs would.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            lightweight : bool
+                if True, LightNode objects are used instead of Node objects
+            backend : str
+                the VisitedNodes backend; "list" or "array" for flat numpy arrays on very large grids
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes (from the start, then from the end) and a list of nodes that are included in
+                the path
+
+    """
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None]
+    if start == end:
+        return [start],[start]
+
+    node_class = LightNode if lightweight else Node
+    index_shape = grid.shape if backend == "array" else None
+    sides = list()
+    for origin in (start, end):
+        queue = Queue(grid_shape=index_shape)
+        queue.push(node_class(grid, origin, neighbors=neighbors, cost=0))
+        sides.append((queue, VisitedNodes(grid_shape=index_shape, backend=backend)))
+    (forward_queue, forward_visited), (backward_queue, backward_visited) = sides
+
+    # (path length, position in the forward search, position in the backward search)
+    meeting = None
+    expand_forward = False
+    while len(forward_queue) > 0 and len(backward_queue) > 0:
+        # expand the smaller side and alternate on ties, so both sides have visited nodes to meet on
+        expand_forward = len(forward_queue) < len(backward_queue) or (len(forward_queue) == len(backward_queue)
+                                                                     and not expand_forward)
+        queue, visited = sides[0] if expand_forward else sides[1]
+        other_visited = sides[1][1] if expand_forward else sides[0][1]
+        for _ in range(len(queue)):
+            node = queue.pop()
+            visited._store_node(node)
+            if other_visited.contains(node.pos):
+                candidate = (node.cost + other_visited.get_cost(node.pos), node.pos, node.pos)
+                meeting = candidate if meeting is None else min(meeting, candidate)
+            for child_node, accessibility, cost in node.iter_children():
+                if not accessibility:
+                    continue
+                if other_visited.contains(child_node):
+                    length = node.cost + 1 + other_visited.get_cost(child_node)
+                    candidate = (length, node.pos, child_node) if expand_forward else (length, child_node, node.pos)
+                    meeting = candidate if meeting is None else min(meeting, candidate)
+                if not visited.contains(child_node) and not queue.contains(child_node):
+                    queue.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors, cost=node.cost + 1))
+        if meeting is not None:
+            _, forward_position, backward_position = meeting
+            return forward_visited.create_path(forward_position, start, other_visited=backward_visited,
+                                               end_position=end, other_node_position=backward_position)
+    return [None],[None]
+
+def bidirectional_a_star(grid:np.array,start:tuple,end:tuple,lightweight:bool = False,backend:str = "list",
+                         heuristic:Union[str,Callable] = "diagonal",neighbors:str = "8_wind") -> Tuple[list,list]:
+    """ A function that searches for the shortest path in a grid using an A* search from both ends
+
+        This function runs one A* search from the start towards the end and one from the end towards the start, each
+        with its own PriorityQueue and VisitedNodes object, expanding the side with the smaller queue. Whenever a popped
+        node or an accessible child has been visited by the other search, the cost of the path through it is recorded.
+        The search stops once the lowest total cost in either queue is at least the best recorded cost; with a
+        consistent heuristic no cheaper path can remain, and the two parent chains are stitched together with
+        VisitedNodes.create_path.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            lightweight : bool
+                if True, LightNode objects are used instead of Node objects
+            backend : str
+                the VisitedNodes backend; "list" or "array" for flat numpy arrays on very large grids
+            heuristic : str/Callable
+                the name of a registered heuristic or a heuristic function; it must be consistent for neighbors
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes (from the start, then from the end) and a list of nodes that are included in
+                the path
+
+    """
+    heuristic = get_heuristic(heuristic)
+    if not is_consistent(heuristic, neighbors):
+        raise ValueError(f"bidirectional_a_star needs a heuristic that is consistent for {neighbors!r}")
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None]
+    if start == end:
+        return [start],[start]
+
+    node_class = LightNode if lightweight else Node
+    index_shape = grid.shape if backend == "array" else None
+    sides = list()
+    for origin, goal in ((start, end), (end, start)):
+        priority_queue = PriorityQueue()
+        priority_queue.push(node_class(grid, origin, neighbors=neighbors, cost=0, heuristic=heuristic(origin, goal)))
+        sides.append((priority_queue, VisitedNodes(grid_shape=index_shape, backend=backend), goal))
+    forward_queue, forward_visited, _ = sides[0]
+    backward_queue, backward_visited, _ = sides[1]
+
+    # (path cost, position in the forward search, position in the backward search)
+    meeting = None
+    expand_forward = False
+    while len(forward_queue) > 0 and len(backward_queue) > 0:
+        if meeting is not None and max(forward_queue.peek().total_cost, backward_queue.peek().total_cost) >= meeting[0]:
+            break
+        # expand the smaller side and alternate on ties, so both sides have visited nodes to meet on
+        expand_forward = len(forward_queue) < len(backward_queue) or (len(forward_queue) == len(backward_queue)
+                                                                     and not expand_forward)
+        priority_queue, visited, goal = sides[0] if expand_forward else sides[1]
+        other_visited = sides[1][1] if expand_forward else sides[0][1]
+        node = priority_queue.pop()
+        visited._store_node(node)
+        if other_visited.contains(node.pos):
+            candidate = (node.cost + other_visited.get_cost(node.pos), node.pos, node.pos)
+            meeting = candidate if meeting is None else min(meeting, candidate)
+        for child_node, accessibility, cost in node.iter_children():
+            if not accessibility:
+                continue
+            child_cost = node.cost + cost
+            if other_visited.contains(child_node):
+                path_cost = child_cost + other_visited.get_cost(child_node)
+                candidate = (path_cost, node.pos, child_node) if expand_forward else (path_cost, child_node, node.pos)
+                meeting = candidate if meeting is None else min(meeting, candidate)
+            if visited.contains(child_node):
+                continue
+            queued_node = priority_queue.get(child_node)
+            if queued_node is None or child_cost < queued_node.cost:
+                child_heuristic = heuristic(child_node, goal)
+                # a child that cannot lead to a path cheaper than the best meeting point is not queued
+                if meeting is not None and child_cost + child_heuristic >= meeting[0]:
+                    continue
+                priority_queue.push(node_class(grid, child_node, parent=node.pos, neighbors=neighbors, cost=child_cost,
+                                               heuristic=child_heuristic))
+
+    if meeting is None:
+        return [None],[None]
+    _, forward_position, backward_position = meeting
+    return forward_visited.create_path(forward_position, start, other_visited=backward_visited, end_position=end,
+                                       other_node_position=backward_position)
+
+def anytime_a_star(grid:np.array, start:tuple, end:tuple, weights:Iterable = (3.0, 2.0, 1.5, 1.25, 1.0),
+                   heuristic:Union[str,Callable] = "diagonal", neighbors:str = "8_wind",
+                   max_expansions:Union[int,None] = None, time_budget:Union[float,None] = None) -> Tuple[list,list,bool]:
+    """ A function that searches for a path that gets better the longer it may search, using ARA*
+
+        This function runs Anytime Repairing A* (ARA*): a series of weighted A* searches with decreasing weights that
+        share their costs and parent pointers. The first search, with the largest weight, finds a path quickly, and
+        every following search only repairs the part of the search tree the lower weight changes. A node whose cost
+        improves after it was expanded in the current search is not queued again, but kept as inconsistent for the next
+        search. Each search stops as soon as no queued node could lead to a cheaper path than the best one found, so
+        the best path always costs at most the current weight times the optimal cost.
+
+        When max_expansions or time_budget run out, the best path found so far is returned. If no path has been found
+        yet, the path to the expanded node with the lowest heuristic, the one believed closest to the end, is returned.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            weights : Iterable
+                the decreasing weights of the searches; a last weight of 1 makes the final path optimal
+            heuristic : str/Callable
+                the name of a registered heuristic or a heuristic function; it must be consistent for neighbors
+            neighbors : str
+                the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+            max_expansions : int/None
+                the largest number of nodes expanded over all searches, or None for no limit
+            time_budget : float/None
+                the largest number of seconds searched, or None for no limit
+        Returns
+        -------
+            Tuple[list,list,bool]
+                A list of visited nodes (a node can be expanded by more than one search), a list of nodes that are
+                included in the best path (or the partial path), and True if the path is known to be optimal
+
+    """
+    estimate = get_heuristic(heuristic)
+    if not is_consistent(estimate, neighbors):
+        raise ValueError(f"anytime_a_star needs a heuristic that is consistent for {neighbors!r}")
+    weights = list(weights)
+    if not weights or any(later > earlier for earlier, later in zip(weights, weights[1:])) or weights[-1] < 1:
+        raise ValueError(f"weights must be a non empty decreasing sequence that ends at 1 or more, got {weights}")
+    if grid[start[0], start[1]] == 1 or grid[end[0], end[1]] == 1:
+        return [None],[None],False
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    costs = {start: 0}
+    parents = {start: None}
+    estimates = {start: estimate(start, end)}
+    visited_list = list()
+    closest = start
+    expansions = 0
+    found = False
+    inconsistent = {start}
+    for weight in weights:
+        # every search starts from the inconsistent nodes and the leftovers of the last one, keyed by the new weight
+        priority_queue = PriorityQueue()
+        for position in inconsistent:
+            priority_queue.push(LightNode(grid, position, parent=parents[position], neighbors=neighbors,
+                                          cost=costs[position], heuristic=weight * estimates[position]))
+        inconsistent = set()
+        expanded = set()
+        while len(priority_queue) > 0 and priority_queue.peek().total_cost < costs.get(end, math.inf):
+            if (max_expansions is not None and expansions >= max_expansions) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                path_list = _parent_path(parents, end if found else closest)
+                return visited_list, path_list, False
+            expansions += 1
+            node = priority_queue.pop()
+            expanded.add(node.pos)
+            visited_list.append(node.pos)
+            if estimates[node.pos] < estimates[closest]:
+                closest = node.pos
+            for child_node, accessibility, cost in node.iter_children():
+                if not accessibility:
+                    continue
+                child_cost = node.cost + cost
+                if child_cost >= costs.get(child_node, math.inf):
+                    continue
+                costs[child_node] = child_cost
+                parents[child_node] = node.pos
+                if child_node not in estimates:
+                    estimates[child_node] = estimate(child_node, end)
+                if child_node in expanded:
+                    inconsistent.add(child_node)
+                else:
+                    priority_queue.push(LightNode(grid, child_node, parent=node.pos, neighbors=neighbors,
+                                                  cost=child_cost, heuristic=weight * estimates[child_node]))
+        found = end in costs
+        inconsistent.update(queued.pos for queued in priority_queue.queued_nodes)
+    if not found:
+        return [None],[None],False
+    return visited_list, _parent_path(parents, end), weights[-1] == 1
+
+def _parent_path(parents:dict, position:tuple) -> list:
+    path_list = list()
+    while position is not None:
+        path_list.append(position)
+        position = parents[position]
+    return path_list
+
+ALGORITHMS = {
+    "a_star": a_star,
+    "bfs": bfs,
+    "dfs": dfs,
+    "iddfs": iddfs,
+    "ida_star": ida_star,
+    "bidirectional_bfs": bidirectional_bfs,
+    "bidirectional_a_star": bidirectional_a_star,
+    "jps": jps,
+}
+
+def solve_many(grid:np.array, pairs:Iterable, algorithm:Union[str,Callable] = "a_star", **kwargs) -> Iterator[Tuple[list,list]]:
+    """ A function that searches for paths between many pairs of positions in the same grid
+
+        This function does the per grid work once and then streams one result per pair. The grid is validated and the
+        connected components of its accessible cells (the cells above 0 if weighted is True) are labeled with
+        data_structures.label_components for the neighborhood the algorithm searches. A pair whose start or end is
+        blocked, or whose ends are in different components, is answered with [None],[None] without searching. The
+        other pairs are searched with the algorithm, using LightNode objects unless lightweight is given, and jps shares
+        one JumpPointTable of the grid.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            pairs : Iterable
+                an iterable of (start, end) tuples
+            algorithm : str/Callable
+                the name of an algorithm in ALGORITHMS, or a function with the same signature
+            **kwargs
+                keyword arguments passed on to the algorithm
+        Yields
+        -------
+            Tuple[list,list]
+                A list of visited nodes and a list of nodes that are included in the path, for each pair in order
+
+    """
+    grid, search, labels, kwargs = prepare_batch(grid, algorithm, **kwargs)
+    for start, end in pairs:
+        yield solve_prepared(grid, search, labels, start, end, **kwargs)
+
+def prepare_batch(grid:np.array, algorithm:Union[str,Callable] = "a_star", **kwargs) -> Tuple[np.array,Callable,np.array,dict]:
+    """ A function that does the per grid work of solve_many
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            algorithm : str/Callable
+                the name of an algorithm in ALGORITHMS, or a function with the same signature
+            **kwargs
+                keyword arguments passed on to the algorithm
+        Returns
+        -------
+            Tuple[np.array,Callable,np.array,dict]
+                the validated grid, the search function, the component labels and the keyword arguments for the search
+
+    """
+    grid = np.asarray(grid)
+    if grid.ndim != 2:
+        raise ValueError(f"grid must be 2 dimensional, got {grid.ndim} dimensions")
+    if callable(algorithm):
+        search = algorithm
+    elif algorithm in ALGORITHMS:
+        search = ALGORITHMS[algorithm]
+    else:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {tuple(ALGORITHMS)}")
+
+    parameters = inspect.signature(search).parameters
+    if "neighbors" in kwargs:
+        neighbors = kwargs["neighbors"]
+    elif "neighbors" in parameters:
+        neighbors = parameters["neighbors"].default
+    else:
+        neighbors = "8_wind"
+    if "lightweight" in parameters:
+        kwargs.setdefault("lightweight", True)
+    if search is jps and kwargs.get("jump_table") is None:
+        kwargs["jump_table"] = JumpPointTable(grid)
+    # label_components treats the cells of 0 as accessible, while a weighted grid can enter every cell above 0
+    accessible = np.where(grid > 0, 0, 1) if kwargs.get("weighted") else grid
+    return grid, search, label_components(accessible, neighbors), kwargs
+
+def solve_prepared(grid:np.array, search:Callable, labels:np.array, start:tuple, end:tuple, **kwargs) -> Tuple[list,list]:
+    """ A function that answers one query with the output of prepare_batch
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            search : Callable
+                the search function
+            labels : np.array
+                the component labels of the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            **kwargs
+                keyword arguments passed on to the search
+        Returns
+        -------
+            Tuple[list,list]
+                A list of visited nodes and a list of nodes that are included in the path
+
+    """
+    label = labels[start[0], start[1]]
+    if label < 0 or label != labels[end[0], end[1]]:
+        return [None],[None]
+    return search(grid, start, end, **kwargs)
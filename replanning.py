@@ -0,0 +1,271 @@
+import math
+import numpy as np
+from typing import Callable,Tuple,Union
+from data_structures import Maze,LightNode,PriorityQueue,NO_CORNER_CUTTING,get_neighborhood
+from heuristics import get_heuristic,is_consistent
+
+class DStarLite(Maze):
+    """ A class to plan and incrementally replan a path in a changing grid using D* Lite.
+
+    This is a class that keeps the search tree of a D* Lite search between calls, and is a child class of the Maze
+    class. The search runs backwards from the end, so g holds the cost from every settled cell to the end, and rhs holds
+    the one step lookahead of g. A cell is consistent when both are equal; only inconsistent cells are queued. When
+    update_cells changes cells, the lookahead of the cells next to them is recomputed and only the cells that became
+    inconsistent are searched again by the next call to plan. When the agent moves with move_start, the keys already in
+    the queue stay valid by adding the distance moved to the key modifier (km) instead of reordering the queue.
+
+    Attributes
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        grid_shape : tuple
+            a tuple detailing the bounds of the array.
+        start : tuple
+            a tuple detailing the agent's current position.
+        end : tuple
+            a tuple detailing the ending position.
+        neighbors : str
+            a string that represents which neighbors within the grid are considered.
+        heuristic : Callable
+            a heuristic function that is consistent for neighbors.
+        km : float
+            the key modifier; the sum of the heuristic distances the start has moved.
+
+    Parameters
+    ----------
+        grid : numpy.array
+            a numpy.array object with integer values.
+        start : tuple
+            a tuple detailing the starting position.
+        end : tuple
+            a tuple detailing the ending position.
+        neighbors : str
+            the name of a registered neighborhood (see data_structures.NEIGHBOR_OFFSETS)
+        heuristic : str/Callable
+            the name of a registered heuristic or a heuristic function; it must be consistent for neighbors
+
+    Methods
+    -------
+        plan()
+            a method to repair the search tree and return the current path
+        update_cells(cells:list)
+            a method to change cells and mark the affected part of the search tree
+        move_start(position:tuple)
+            a method to move the agent to a new position
+        get_cost(position:tuple)
+            a method to get the cost from a position to the end
+    """
+    def __init__(self, grid:np.array, start:tuple, end:tuple, neighbors:str = "8_wind",
+                 heuristic:Union[str,Callable] = "diagonal") -> None:
+        Maze.__init__(self, grid=grid)
+        self.offsets = get_neighborhood(neighbors)
+        heuristic = get_heuristic(heuristic)
+        if not is_consistent(heuristic, neighbors):
+            raise ValueError(f"DStarLite needs a heuristic that is consistent for {neighbors!r}")
+        self.neighbors = neighbors
+        self.heuristic = heuristic
+        self.start = start
+        self.end = end
+        self.km = 0
+        self._check_corners = neighbors in NO_CORNER_CUTTING
+        rows, cols = self.grid_shape
+        self._g = [math.inf] * (rows * cols)
+        self._rhs = [math.inf] * (rows * cols)
+        self._rhs[self._index(end)] = 0
+        self._priority_queue = PriorityQueue(tie_break="fifo")
+        self._queue(end)
+
+    def _index(self, position:tuple) -> int:
+        return position[0] * self.grid_shape[1] + position[1]
+
+    def _key(self, position:tuple) -> tuple:
+        index = self._index(position)
+        best = min(self._g[index], self._rhs[index])
+        return best + self.heuristic(position, self.start) + self.km, best
+
+    def _queue(self, position:tuple) -> None:
+        # queued positions are LightNodes whose total cost is the two part D* Lite key
+        node = LightNode(self.grid, position, neighbors=self.neighbors)
+        node.total_cost = self._key(position)
+        self._priority_queue.push(node)
+
+    def _edges(self, position:tuple):
+        """ A function that yields the cells next to a position and the cost of the step between them.
+
+        The cost is infinite if either cell is not accessible, or if the step is a diagonal that would cut a corner in
+        a neighborhood that does not allow it. Steps are symmetric, so the same edges lead into the position.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a cell
+
+        Yields
+        ------
+            tuple
+                a tuple of the neighboring position and the cost of the step
+        """
+        grid = self.grid
+        rows, cols = self.grid_shape
+        row, col = position
+        blocked = grid[row, col] != 0
+        for row_offset, col_offset, cost in self.offsets:
+            child_row = row + row_offset
+            child_col = col + col_offset
+            if 0 <= child_row < rows and 0 <= child_col < cols:
+                if blocked or grid[child_row, child_col] != 0:
+                    cost = math.inf
+                elif self._check_corners and row_offset and col_offset:
+                    if grid[child_row, col] != 0 or grid[row, child_col] != 0:
+                        cost = math.inf
+                yield (child_row, child_col), cost
+
+    def _lookahead(self, position:tuple) -> float:
+        g = self._g
+        best = math.inf
+        for child, cost in self._edges(position):
+            child_cost = cost + g[self._index(child)]
+            if child_cost < best:
+                best = child_cost
+        return best
+
+    def _update_vertex(self, position:tuple) -> None:
+        index = self._index(position)
+        if self._g[index] != self._rhs[index]:
+            self._queue(position)
+        elif self._priority_queue.contains(position):
+            self._priority_queue.remove(position)
+
+    def _compute_shortest_path(self) -> list:
+        """ A function that expands inconsistent cells until the cost of the start is settled.
+
+        Returns
+        -------
+            visited_list : list
+                a list of the positions expanded, in order
+        """
+        g = self._g
+        rhs = self._rhs
+        priority_queue = self._priority_queue
+        start_index = self._index(self.start)
+        visited_list = list()
+        while len(priority_queue) > 0:
+            node = priority_queue.peek()
+            start_key = self._key(self.start)
+            if node.total_cost >= start_key and rhs[start_index] == g[start_index]:
+                break
+            position = node.pos
+            index = self._index(position)
+            new_key = self._key(position)
+            if node.total_cost < new_key:
+                self._queue(position)
+                continue
+            priority_queue.pop()
+            visited_list.append(position)
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for child, cost in self._edges(position):
+                    child_index = self._index(child)
+                    if child != self.end and cost + g[index] < rhs[child_index]:
+                        rhs[child_index] = cost + g[index]
+                        self._update_vertex(child)
+            else:
+                old_cost = g[index]
+                g[index] = math.inf
+                for child, cost in list(self._edges(position)) + [(position, 0)]:
+                    child_index = self._index(child)
+                    if child != self.end and (rhs[child_index] == cost + old_cost or child == position):
+                        rhs[child_index] = self._lookahead(child)
+                    self._update_vertex(child)
+        return visited_list
+
+    def get_cost(self, position:tuple) -> float:
+        """ A function to get the cost from a position to the end.
+
+        The cost is only settled for the start after plan has been called; other positions may not be settled.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple describing the position of a cell
+
+        Returns
+        -------
+            float
+                the cost of the position, or inf if the end can not be reached from it
+        """
+        return self._g[self._index(position)]
+
+    def plan(self) -> Tuple[list,list]:
+        """ A function to repair the search tree and return the current path.
+
+        Only the cells made inconsistent by update_cells or move_start since the last call are expanded. The path is
+        built by stepping from the start to the cheapest neighbor until the end is reached, and is returned from end
+        to start like VisitedNodes.create_path.
+
+        Returns
+        -------
+            Tuple[list,list]
+                A list of the positions expanded by this call and a list of nodes that are included in the path
+        """
+        if self.grid[self.start] != 0 or self.grid[self.end] != 0:
+            return [None],[None]
+        visited_list = self._compute_shortest_path()
+        if self._g[self._index(self.start)] == math.inf:
+            return [None],[None]
+
+        g = self._g
+        path_list = [self.start]
+        current = self.start
+        for _ in range(self.grid_shape[0] * self.grid_shape[1]):
+            if current == self.end:
+                break
+            best = math.inf
+            for child, cost in self._edges(current):
+                child_cost = cost + g[self._index(child)]
+                if child_cost < best:
+                    best = child_cost
+                    current = child
+            path_list.append(current)
+        path_list.reverse()
+        return visited_list, path_list
+
+    def update_cells(self, cells:list) -> list:
+        """ A function to change cells and mark the affected part of the search tree.
+
+        This is a function that writes the new values into the grid and recomputes the lookahead of every cell whose
+        steps changed: the changed cells and the cells around them. The search itself is repaired by the next call to
+        plan.
+
+        Parameters
+        ----------
+            cells : list
+                a list of (row, col, value) tuples
+
+        Returns
+        -------
+            changed : list
+                a list of the positions whose value changed
+        """
+        changed = Maze.update_cells(self, cells)
+        affected = set()
+        for position in changed:
+            affected.add(position)
+            for child, _ in self._edges(position):
+                affected.add(child)
+        for position in sorted(affected):
+            if position != self.end:
+                self._rhs[self._index(position)] = self._lookahead(position)
+            self._update_vertex(position)
+        return changed
+
+    def move_start(self, position:tuple) -> None:
+        """ A function to move the agent to a new position.
+
+        Parameters
+        ----------
+            position : tuple
+                a tuple detailing the agent's new position
+        """
+        self.km += self.heuristic(self.start, position)
+        self.start = position
@@ -0,0 +1,203 @@
+import time
+from typing import Callable,Tuple,Union
+
+class SearchStats:
+    """ A class to collect what a search cost.
+
+    This is a class that a_star, bfs and dfs fill in when one is passed as their stats argument. It is reset at the
+    start of every search, so one object can be reused, and as_dict gives a flat dictionary for a metrics pipeline.
+    Wall time is split into setup (before the first node is popped), search (until the end is found or the frontier
+    runs out) and path (building the visited list and the path list).
+
+    Attributes
+    ----------
+        expanded : int
+            the number of nodes popped and expanded.
+        generated : int
+            the number of accessible children of the expanded nodes, whether they were pushed or not.
+        pushes : int
+            the number of nodes pushed into the frontier.
+        pops : int
+            the number of nodes popped from the frontier, including stale ones that were skipped.
+        requeues : int
+            the number of pushes for a position that was already in the frontier.
+        peak_frontier : int
+            the largest size of the frontier.
+        found : bool
+            True if a path to the end was found.
+        exhausted : bool
+            True if the search ran out of its expansion or time budget before it finished.
+        path_length : int
+            the number of positions in the path (or the partial path), 0 if there is none.
+        path_cost : int/float/None
+            the cost of the path (or the partial path), or None if there is none.
+        timings : dict
+            the seconds spent in the setup, search and path phases.
+
+    Methods
+    -------
+        start()
+            a method to reset the counters and start the clock
+        mark(phase:str)
+            a method to charge the time since the last mark to a phase
+        finish(path_list:list, cost, exhausted:bool)
+            a method to record the path and stop the clock
+        as_dict()
+            a method to get the counters and timings as a flat dictionary
+    """
+    phases = ("setup", "search", "path")
+
+    def __init__(self) -> None:
+        self.start()
+
+    def start(self) -> None:
+        self.expanded = 0
+        self.generated = 0
+        self.pushes = 0
+        self.pops = 0
+        self.requeues = 0
+        self.peak_frontier = 0
+        self.found = False
+        self.exhausted = False
+        self.path_length = 0
+        self.path_cost = None
+        self.timings = dict.fromkeys(self.phases, 0.0)
+        self._clock = time.perf_counter()
+
+    def mark(self, phase:str) -> None:
+        """ A function to charge the time since the last mark to a phase.
+
+        Parameters
+        ----------
+            phase : str
+                the name of the phase
+        """
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - self._clock
+        self._clock = now
+
+    def finish(self, path_list:list, cost:Union[int,float,None] = None, exhausted:bool = False) -> None:
+        """ A function to record the path and charge the remaining time to the path phase.
+
+        Parameters
+        ----------
+            path_list : list
+                the path list returned by the search
+            cost : int/float/None
+                the cost of the path
+            exhausted : bool
+                True if the search ran out of budget, so the path is partial
+        """
+        self.mark("path")
+        has_path = bool(path_list) and path_list[0] is not None
+        self.found = has_path and not exhausted
+        self.exhausted = exhausted
+        self.path_length = len(path_list) if has_path else 0
+        self.path_cost = cost if has_path else None
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+
+    def as_dict(self) -> dict:
+        """ A function to get the counters and timings as a flat dictionary.
+
+        Returns
+        -------
+            dict
+                the counters, the path fields, a <phase>_time entry per phase and the total_time
+        """
+        stats = {"expanded": self.expanded, "generated": self.generated, "pushes": self.pushes, "pops": self.pops,
+                 "requeues": self.requeues, "peak_frontier": self.peak_frontier, "found": self.found,
+                 "exhausted": self.exhausted, "path_length": self.path_length, "path_cost": self.path_cost}
+        for phase, seconds in self.timings.items():
+            stats[f"{phase}_time"] = seconds
+        stats["total_time"] = self.total_time
+        return stats
+
+    def __repr__(self) -> str:
+        return f"SearchStats({self.as_dict()})"
+
+class InstrumentedFrontier:
+    """ A class to count the operations on a frontier.
+
+    This is a class that wraps a Stack, Queue or PriorityQueue and forwards every call to it. Pushes and pops are
+    counted in a SearchStats object, the peak size of the frontier is tracked, and an on_push hook is called with every
+    pushed node. The searches only wrap their frontier when stats or on_push are given, so an uninstrumented search
+    calls the frontier directly.
+
+    Parameters
+    ----------
+        frontier : Stack/Queue/PriorityQueue
+            the frontier to wrap
+        stats : SearchStats/None
+            the object to count in
+        on_push : Callable/None
+            a function called with every pushed node
+    """
+    def __init__(self, frontier, stats:Union[SearchStats,None] = None, on_push:Union[Callable,None] = None) -> None:
+        self.frontier = frontier
+        self.stats = stats
+        self.on_push = on_push
+
+    def push(self, node) -> None:
+        stats = self.stats
+        if stats is not None:
+            stats.pushes += 1
+            if node.pos in self.frontier:
+                stats.requeues += 1
+        self.frontier.push(node)
+        if stats is not None and len(self.frontier) > stats.peak_frontier:
+            stats.peak_frontier = len(self.frontier)
+        if self.on_push is not None:
+            self.on_push(node)
+
+    def pop(self):
+        if self.stats is not None:
+            self.stats.pops += 1
+        return self.frontier.pop()
+
+    def __getattr__(self, name:str):
+        value = getattr(self.frontier, name)
+        if callable(value):
+            # methods such as get are looked up for every child, so the bound method is kept on the wrapper
+            setattr(self, name, value)
+        return value
+
+    def __contains__(self, position:tuple) -> bool:
+        return position in self.frontier
+
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+def instrument(frontier, stats:Union[SearchStats,None] = None, on_expand:Union[Callable,None] = None,
+               on_push:Union[Callable,None] = None) -> Tuple[object,Union[Callable,None]]:
+    """ A function that sets up the stats and hooks of a search.
+
+    Parameters
+    ----------
+        frontier : Stack/Queue/PriorityQueue
+            the frontier of the search
+        stats : SearchStats/None
+            the object to count in
+        on_expand : Callable/None
+            a function called with every expanded node
+        on_push : Callable/None
+            a function called with every pushed node
+
+    Returns
+    -------
+        Tuple[object,Callable/None]
+            the frontier, wrapped in an InstrumentedFrontier if stats or on_push are given, and the function the search
+            calls with every expanded node, or None if there is nothing to call
+    """
+    if stats is None and on_push is None:
+        return frontier, on_expand
+    if stats is not None:
+        def expand_hook(node) -> None:
+            stats.expanded += 1
+            if on_expand is not None:
+                on_expand(node)
+    else:
+        expand_hook = on_expand
+    return InstrumentedFrontier(frontier, stats, on_push), expand_hook
@@ -0,0 +1,193 @@
+import numpy as np
+from typing import Callable,Generator,Iterable,Tuple,Union
+from data_structures import Stack,ComponentIndex
+from pathfinding_algorithms import SearchSteps,_a_star_steps,_bfs_steps,_dfs_steps
+from search_stats import SearchStats
+
+class SearchEvent:
+    """ A class to describe one step of a streaming search.
+
+    This is a class for the events the iter_* searches yield. An "expand" event is yielded for every expanded node.
+    The last event is "done", which carries the visited list and the path list the matching search would return.
+
+    Attributes
+    ----------
+        kind : str
+            "expand" or "done".
+        position : tuple/None
+            the position of the expanded node, None for "done".
+        parent : tuple/None
+            the position of the expanded node's parent.
+        cost : int/float/None
+            the cost of the expanded node (its depth for iter_dfs, None for iter_bfs).
+        visited_list : list/None
+            the visited list, only for "done"; empty if the search did not record it.
+        path_list : list/None
+            the path list, only for "done"; [None] if there is no path.
+    """
+    __slots__ = ("kind", "position", "parent", "cost", "visited_list", "path_list")
+
+    def __init__(self, kind:str, position:Union[tuple,None] = None, parent:Union[tuple,None] = None,
+                 cost:Union[int,float,None] = None, visited_list:Union[list,None] = None,
+                 path_list:Union[list,None] = None) -> None:
+        self.kind = kind
+        self.position = position
+        self.parent = parent
+        self.cost = cost
+        self.visited_list = visited_list
+        self.path_list = path_list
+
+    def __repr__(self) -> str:
+        if self.kind == "done":
+            return f"SearchEvent(done, path_list={self.path_list})"
+        return f"SearchEvent({self.kind}, {self.position}, parent={self.parent}, cost={self.cost})"
+
+SearchStream = Generator[SearchEvent, None, Tuple[list,list]]
+
+def _done(visited_list:list, path_list:list) -> SearchEvent:
+    return SearchEvent("done", visited_list=visited_list, path_list=path_list)
+
+def _events(steps:SearchSteps) -> SearchStream:
+    # turns the nodes a generator core of pathfinding_algorithms expands into events
+    while True:
+        try:
+            node = next(steps)
+        except StopIteration as stop:
+            visited_list, path_list = stop.value
+            yield _done(visited_list, path_list)
+            return visited_list, path_list
+        yield SearchEvent("expand", node.pos, node.parent, node.cost)
+
+def iter_a_star(grid:np.array, start:tuple, end:tuple, lightweight:bool = False, backend:str = "list",
+                heuristic:Union[str,Callable] = "diagonal", neighbors:str = "8_wind", weight:float = 1.0,
+                weighted:bool = False, queue:str = "heap", stats:Union[SearchStats,None] = None,
+                on_expand:Union[Callable,None] = None, on_push:Union[Callable,None] = None,
+                max_expansions:Union[int,None] = None, time_budget:Union[float,None] = None, partial:bool = False,
+                components:Union[ComponentIndex,None] = None, record_visited:bool = True) -> SearchStream:
+    """ A function that runs pathfinding_algorithms.a_star one expansion at a time
+
+        This function is a generator that yields a SearchEvent for every expanded node, and a last "done" event with
+        the visited list and the path list a_star would return; they are also the generator's return value. The search
+        only advances when the next event is asked for, so it can be paused between events, resumed by asking for the
+        next one, and cancelled with close(). With record_visited set to False, only the parents and costs needed to
+        rebuild the path are kept, and the visited list of the "done" event is empty.
+
+        It runs the same generator as a_star and takes the same parameters, which work the same way here; only
+        grid, start, end and record_visited are listed below. The time of a time_budget, and the search time of stats,
+        include the time the stream spends paused.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            record_visited : bool
+                if False, the visited list is not kept
+        Yields
+        -------
+            SearchEvent
+                an "expand" event per expanded node, then a "done" event
+
+    """
+    return (yield from _events(_a_star_steps(grid, start, end, lightweight, backend, heuristic, neighbors, weight,
+                                             weighted, queue, stats, on_expand, on_push, max_expansions, time_budget,
+                                             partial, components, record_visited)))
+
+def iter_bfs(grid:np.array, start:tuple, end:tuple, lightweight:bool = False, backend:str = "list",
+             neighbors:str = "4_wind", stats:Union[SearchStats,None] = None, on_expand:Union[Callable,None] = None,
+             on_push:Union[Callable,None] = None, components:Union[ComponentIndex,None] = None,
+             record_visited:bool = True) -> SearchStream:
+    """ A function that runs pathfinding_algorithms.bfs one expansion at a time
+
+        This function is a generator that works like iter_a_star for bfs, and takes the parameters of bfs.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            record_visited : bool
+                if False, the visited list is not kept
+        Yields
+        -------
+            SearchEvent
+                an "expand" event per expanded node, then a "done" event
+
+    """
+    return (yield from _events(_bfs_steps(grid, start, end, lightweight, backend, neighbors, stats, on_expand, on_push,
+                                          components, record_visited)))
+
+def iter_dfs(grid:np.array, start:tuple, end:tuple, _stack:Union[Stack,None] = None, lightweight:bool = False,
+             backend:str = "list", neighbors:str = "4_wind", max_depth:Union[int,None] = None,
+             stats:Union[SearchStats,None] = None, on_expand:Union[Callable,None] = None,
+             on_push:Union[Callable,None] = None, components:Union[ComponentIndex,None] = None,
+             record_visited:bool = True) -> SearchStream:
+    """ A function that runs pathfinding_algorithms.dfs one expansion at a time
+
+        This function is a generator that works like iter_a_star for dfs, and takes the parameters of dfs.
+
+        Parameters
+        ----------
+            grid : np.array
+                a numpy array detailing the grid
+            start : tuple
+                a tuple detailing the starting node's position
+            end : tuple
+                a tuple detailing the ending node's position
+            record_visited : bool
+                if False, the visited list is not kept
+        Yields
+        -------
+            SearchEvent
+                an "expand" event per expanded node, then a "done" event
+
+    """
+    return (yield from _events(_dfs_steps(grid, start, end, _stack, lightweight, backend, neighbors, max_depth, stats,
+                                          on_expand, on_push, components, record_visited)))
+
+def run_steps(stream:SearchStream, steps:int) -> Union[SearchEvent,None]:
+    """ A function that advances a streaming search by up to a number of events.
+
+        This is meant for cooperative schedulers that give every search a slice of work per tick.
+
+        Parameters
+        ----------
+            stream : Generator
+                a generator returned by one of the iter_* searches
+            steps : int
+                the largest number of events to take
+        Returns
+        -------
+            SearchEvent/None
+                the "done" event if the search finished within the steps, None otherwise
+
+    """
+    for _ in range(steps):
+        event = next(stream, None)
+        if event is None or event.kind == "done":
+            return event
+    return None
+
+def collect(stream:Iterable) -> Tuple[list,list]:
+    """ A function that runs a streaming search to the end.
+
+        Parameters
+        ----------
+            stream : Iterable
+                a generator returned by one of the iter_* searches
+        Returns
+        -------
+            Tuple[list,list]
+                the visited list and the path list of the "done" event
+
+    """
+    for event in stream:
+        if event.kind == "done":
+            return event.visited_list, event.path_list
+    raise ValueError("the stream ended without a done event")
@@ -1,4 +1,4 @@
-import os, sys
+import os, sys, tempfile, json
 sys.path += [os.path.abspath('..')]
 
 
@@ -7,8 +7,22 @@ import numpy as np
 from hypothesis import given,settings, Verbosity
 import hypothesis.strategies as st
 from hypothesis.extra.numpy import arrays as hypo_array
-from data_structures import Maze, Node,VisitedNodes,Queue,Stack,PriorityQueue
-from pathfinding_algorithms import bfs,dfs,a_star
+from data_structures import Maze, Node,LightNode,VisitedNodes,Queue,Stack,PriorityQueue,BucketQueue,label_components,BitGrid,IMPASSABLE,ComponentIndex
+from pathfinding_algorithms import bfs,dfs,iddfs,ida_star,a_star,anytime_a_star,path_cost,solve_many,bidirectional_bfs,bidirectional_a_star,heuristic_contract,is_consistent,is_admissible,manhattan_distance,diagonal_distance
+from heuristics import get_heuristic,score_batch
+from jump_point_search import jps,JumpPointTable
+from hierarchical import HierarchicalMaze,hpa_star
+from replanning import DStarLite
+from parallel import solve_parallel,SharedMaze
+from flow_fields import FlowField,distance_field
+from path_cache import PathCache
+from grid_io import load_grid,save_npy,save_packed,save_rle,load_text
+from search_stats import SearchStats
+from streaming import iter_a_star,iter_bfs,iter_dfs,collect,run_steps
+from async_planner import AsyncPlanner,PlannerBusy
+from multi_agent import plan_paths,find_conflicts
+from benchmarks.generators import GENERATORS,pick_endpoints
+from benchmarks.run_benchmarks import run_benchmarks,compare,main as run_benchmarks_main
 
 
 
@@ -82,6 +96,25 @@ class PathfindingTests(unittest.TestCase):
         self.assertEqual(path_list,self.dfs_correct_returns["path_list"],
                          "tested path_list is not equal to correct path list")
 
+    def test_dfs_reentrant_and_depth_limit(self):
+        self.assertEqual(dfs(self.grid, self.start, self.end), dfs(self.grid, self.start, self.end),
+                         "nodes left over from the first search changed the second")
+        _, shortest = bfs(self.grid, self.start, self.end)
+        self.assertEqual(dfs(self.grid, self.start, self.end, max_depth=len(shortest) - 2), ([None],[None]))
+        _, path_list = dfs(self.grid, self.start, self.end, max_depth=len(shortest) - 1)
+        self.assertEqual(len(path_list), len(shortest), "path within the depth limit was not found")
+
+    @given(hypo_array(dtype=np.int,shape=(5,5),elements=st.integers(0,1)),
+           st.tuples(st.integers(0,4),st.integers(0,4)),
+           st.tuples(st.integers(0,4),st.integers(0,4)))
+    def test_iterative_deepening_assert_optimal(self, grid, start, end):
+        _, shortest = bfs(grid, start, end)
+        _, path_list = iddfs(grid, start, end, table_size=3)
+        self.assertEqual(len(path_list) if path_list != [None] else None, len(shortest) if shortest != [None] else None)
+        _, cheapest = a_star(grid, start, end)
+        _, path_list = ida_star(grid, start, end)
+        self.assertEqual(path_cost(path_list), path_cost(cheapest))
+
     @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
            st.tuples(st.integers(0, 4), st.integers(0, 4)),
            st.tuples(st.integers(0, 4), st.integers(0, 4)))
@@ -112,8 +145,474 @@ class PathfindingTests(unittest.TestCase):
         self.assertEqual(path_list, self.a_star_correct_returns["path_list"],
                          "tested path_list is not equal to correct path list")
 
+    @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)))
+    def test_lightweight_assert_equal_return_lists(self, grid, start, end):
+        self.assertEqual(bfs(grid, start, end, lightweight=True), bfs(grid, start, end))
+        self.assertEqual(dfs(grid, start, end, _stack=Stack(), lightweight=True), dfs(grid, start, end, _stack=Stack()))
+        self.assertEqual(a_star(grid, start, end, lightweight=True), a_star(grid, start, end))
+
+    @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)))
+    def test_array_backend_assert_equal_return_lists(self, grid, start, end):
+        self.assertEqual(bfs(grid, start, end, backend="array"), bfs(grid, start, end))
+        self.assertEqual(dfs(grid, start, end, _stack=Stack(), backend="array"), dfs(grid, start, end, _stack=Stack()))
+        self.assertEqual(a_star(grid, start, end, lightweight=True, backend="array"), a_star(grid, start, end))
+
+    @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)))
+    def test_a_star_assert_optimal_cost(self, grid, start, end):
+        dijkstra = heuristic_contract(consistent_for=("8_wind",))(lambda node, end: 0)
+        _, path_list = a_star(grid, start, end)
+        _, dijkstra_path_list = a_star(grid, start, end, heuristic=dijkstra)
+        if path_list != [None]:
+            self.assertEqual(path_cost(path_list), path_cost(dijkstra_path_list), "a_star returned a suboptimal path")
+
+    def test_heuristic_contract(self):
+        self.assertTrue(is_consistent(diagonal_distance, "8_wind"))
+        self.assertFalse(is_consistent(manhattan_distance, "8_wind"))
+        self.assertFalse(is_admissible(lambda node, end: 0, "8_wind"))
+        visited_list, path_list = a_star(self.grid, self.start, self.end, heuristic=manhattan_distance)
+        self.assertEqual((path_list[0], path_list[-1]), (self.end, self.start), "reopening a_star did not find a path")
+
+    def test_a_star_no_corner_cutting(self):
+        grid = np.array([[0, 1],
+                         [1, 0]])
+        self.assertEqual(a_star(grid, (0,0), (1,1))[1], [(1,1), (0,0)], "8_wind did not cut the corner")
+        self.assertEqual(a_star(grid, (0,0), (1,1), neighbors="8_wind_no_corner_cutting"), ([None], [None]),
+                         "8_wind_no_corner_cutting cut the corner")
+
+    def test_a_star_weighted(self):
+        visited_list, path_list = a_star(self.grid, self.start, self.end, heuristic="octile", weight=2.0)
+        self.assertEqual((path_list[0], path_list[-1]), (self.end, self.start), "weighted a_star did not find a path")
+        self.assertLessEqual(len(visited_list), len(self.a_star_correct_returns["visited_list"]))
+
+    def test_heuristic_score_batch(self):
+        nodes = np.array([[0, 0], [4, 0], [2, 3], [4, 4]])
+        for name in ("euclidean", "manhattan", "diagonal", "zero"):
+            expected = [get_heuristic(name)(tuple(node), self.end) for node in nodes]
+            np.testing.assert_allclose(score_batch(name, nodes, self.end), expected)
+
+    @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)))
+    def test_jps_assert_equal_path_cost(self, grid, start, end):
+        _, a_star_path_list = a_star(grid, start, end)
+        for visited_list, path_list in (jps(grid, start, end), jps(grid, start, end, jump_table=JumpPointTable(grid))):
+            if a_star_path_list == [None]:
+                self.assertEqual(path_list, [None], "jps found a path that does not exist")
+            else:
+                self.assertEqual((path_list[0], path_list[-1]), (end, start))
+                self.assertEqual(path_cost(path_list), path_cost(a_star_path_list), "jps returned a suboptimal path")
+
+    def test_a_star_weighted_terrain(self):
+        weights = np.array([[1, 1, 1, 1, 1],
+                            [1, 9, 9, 9, 1],
+                            [1, 9, IMPASSABLE, 9, 1],
+                            [1, 9, 9, 9, 1],
+                            [1, 1, 1, 1, 1]])
+        _, path_list = a_star(weights, (2,0), (2,4), weighted=True, neighbors="4_wind", heuristic="manhattan")
+        self.assertEqual(len(path_list), 9, "path went through the slow zone instead of around it")
+        self.assertNotIn((2,2), path_list, "path went through an impassable cell")
+        for queue in ("heap", "bucket"):
+            for lightweight in (False, True):
+                _, other_path_list = a_star(weights, (2,0), (2,4), weighted=True, neighbors="4_wind",
+                                            heuristic="manhattan", queue=queue, lightweight=lightweight)
+                self.assertEqual(len(other_path_list), len(path_list))
+        self.assertEqual(a_star(self.grid, self.start, self.end, queue="bucket")[1],
+                         self.a_star_correct_returns["path_list"])
+
+    def test_search_stats_and_hooks(self):
+        for search in (a_star, bfs, dfs):
+            stats = SearchStats()
+            expanded, pushed = list(), list()
+            kwargs = {"_stack": Stack()} if search is dfs else {}
+            visited_list, path_list = search(self.grid, self.start, self.end, stats=stats, on_expand=expanded.append,
+                                             on_push=pushed.append, **kwargs)
+            kwargs = {"_stack": Stack()} if search is dfs else {}
+            self.assertEqual((visited_list, path_list), search(self.grid, self.start, self.end, **kwargs),
+                             "instrumenting the search changed its result")
+            self.assertEqual([node.pos for node in expanded], visited_list)
+            self.assertEqual((stats.expanded, stats.pushes), (len(visited_list), len(pushed)))
+            self.assertEqual((stats.path_length, stats.path_cost), (len(path_list), path_cost(path_list)))
+            self.assertGreaterEqual(stats.generated, stats.pushes - 1)
+            self.assertTrue({"peak_frontier", "search_time", "total_time"} <= set(stats.as_dict()))
+        grid = self.grid.copy()
+        grid[self.start] = 1
+        a_star(grid, self.start, self.end, stats=stats)
+        self.assertEqual((stats.found, stats.expanded, stats.path_cost), (False, 0, None), "stats were not reset")
+
+    def test_a_star_budget_and_anytime(self):
+        stats = SearchStats()
+        visited_list, path_list = a_star(self.grid, self.start, self.end, max_expansions=3, partial=True, stats=stats)
+        self.assertEqual((len(visited_list), path_list[-1], stats.exhausted, stats.found), (3, self.start, True, False))
+        self.assertEqual(a_star(self.grid, self.start, self.end, max_expansions=3), ([None],[None]))
+        _, path_list, optimal = anytime_a_star(self.grid, self.start, self.end)
+        self.assertEqual((path_list, optimal), (self.a_star_correct_returns["path_list"], True))
+        _, path_list, optimal = anytime_a_star(self.grid, self.start, self.end, max_expansions=2)
+        self.assertEqual((path_list[-1], optimal), (self.start, False), "partial path does not start at the start")
+        with self.assertRaises(ValueError):
+            anytime_a_star(self.grid, self.start, self.end, weights=(1.0, 2.0))
+
+    def test_streaming_searches(self):
+        for search, stream in ((a_star, iter_a_star), (bfs, iter_bfs), (dfs, iter_dfs)):
+            events = list(stream(self.grid, self.start, self.end))
+            visited_list, path_list = search(self.grid, self.start, self.end)
+            self.assertEqual([event.position for event in events[:-1]], visited_list)
+            self.assertEqual((events[-1].kind, events[-1].path_list), ("done", path_list))
+            self.assertEqual(collect(stream(self.grid, self.start, self.end, record_visited=False)), ([], path_list),
+                             "path only search kept the visited list")
+        paused = iter_a_star(self.grid, self.start, self.end)
+        self.assertIsNone(run_steps(paused, 2), "search finished before its end was expanded")
+        self.assertEqual(run_steps(paused, 100).path_list, self.a_star_correct_returns["path_list"])
+        cancelled = iter_bfs(self.grid, self.start, self.end)
+        next(cancelled)
+        cancelled.close()
+        self.assertIsNone(next(cancelled, None), "cancelled search kept running")
+        budgeted = dict(max_expansions=3, partial=True, stats=SearchStats())
+        self.assertEqual(collect(iter_a_star(self.grid, self.start, self.end, **budgeted)),
+                         a_star(self.grid, self.start, self.end, **budgeted))
+        self.assertTrue(budgeted["stats"].exhausted)
+        walled = self.grid.copy()
+        walled[:, 2] = 1
+        events = list(iter_bfs(walled, self.start, self.end, components=Maze(walled).components("4_wind")))
+        self.assertEqual([event.kind for event in events], ["done"], "stream searched a disconnected end")
+
+    def test_async_planner_coalesce_and_cancel(self):
+        import asyncio
+        grid = GENERATORS["random_25"](64, 1)
+        start, end = pick_endpoints(grid)
+
+        async def serve():
+            async with AsyncPlanner(grid, workers=1, max_queued=1) as planner:
+                results = await asyncio.gather(*[planner.solve(start, end) for _ in range(5)])
+                self.assertEqual((planner.submitted, planner.coalesced), (1, 4), "identical requests were not coalesced")
+                self.assertTrue(all(result == a_star(grid, start, end) for result in results))
+                request = asyncio.ensure_future(planner.solve(end, start))
+                await asyncio.sleep(0)
+                request.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await request
+                self.assertEqual(planner.cancelled, 1, "search of a cancelled request was kept")
+                waiting = [asyncio.ensure_future(planner.solve(start, (row, col))) for row, col in ((0, 0), (1, 1), (2, 2))]
+                await asyncio.sleep(0)
+                with self.assertRaises(PlannerBusy):
+                    await planner.solve(end, start, wait=False)
+                await asyncio.gather(*waiting)
+                planner.update_cells([(start[0], start[1], 1)])
+                self.assertEqual(await planner.solve(start, end), ([None], [None]), "search ignored the new grid version")
+
+        asyncio.run(serve())
+
+    def test_async_planner_assert_cancel_keeps_shared_search(self):
+        import asyncio, threading
+        grid = GENERATORS["random_25"](64, 1)
+        start, end = pick_endpoints(grid)
+        target = tuple(np.argwhere(grid == 0)[len(np.argwhere(grid == 0)) // 2])
+        gate = threading.Event()
+
+        def gated_a_star(grid, start, end, **kwargs):
+            gate.wait(10)
+            return a_star(grid, start, end)
+
+        async def serve(cancel_creator):
+            gate.clear()
+            async with AsyncPlanner(grid, gated_a_star, workers=1, max_queued=1) as planner:
+                # one search holds the worker and one fills the queue, so the next request waits for room
+                running = asyncio.ensure_future(planner.solve(start, end))
+                await asyncio.sleep(0.05)
+                queued = asyncio.ensure_future(planner.solve(end, start))
+                await asyncio.sleep(0)
+                creator = asyncio.ensure_future(planner.solve(start, target))
+                await asyncio.sleep(0)
+                sharer = asyncio.ensure_future(planner.solve(start, target))
+                await asyncio.sleep(0)
+                self.assertEqual(planner.coalesced, 1)
+                cancelled, kept = (creator, sharer) if cancel_creator else (sharer, creator)
+                cancelled.cancel()
+                await asyncio.sleep(0)
+                gate.set()
+                self.assertEqual(await asyncio.wait_for(kept, 10), a_star(grid, start, target),
+                                 "cancelling one request lost the search it shared")
+                await asyncio.gather(running, queued)
+                self.assertEqual(planner.info()["in_flight"], 0)
+
+        asyncio.run(serve(cancel_creator=True))
+        asyncio.run(serve(cancel_creator=False))
+
+    def test_multi_agent_paths_do_not_collide(self):
+        # a corridor with one alcove the agents have to pass each other in
+        grid = np.array([[0, 0, 0, 0, 0], [1, 1, 0, 1, 1]])
+        starts, ends = [(0, 0), (0, 4)], [(0, 4), (0, 0)]
+        independent = [a_star(grid, start, end, neighbors="4_wind", heuristic="manhattan")[1][::-1]
+                       for start, end in zip(starts, ends)]
+        self.assertNotEqual(find_conflicts(independent), [])
+        prioritized = plan_paths(grid, starts, ends, neighbors="4_wind")
+        self.assertEqual(find_conflicts(prioritized), [])
+        for stuck in (agent for agent, path in enumerate(prioritized) if path == [None]):
+            self.assertFalse(any(starts[stuck] in path for path in prioritized), "an agent ran into a stuck agent")
+        # the second agent can not reach its end and stays on the straight route of the first
+        open_grid = np.array([[0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [1, 1, 1, 1, 1], [0, 1, 1, 1, 1]])
+        detour = plan_paths(open_grid, [(1, 0), (1, 2)], [(1, 4), (3, 0)], neighbors="4_wind")
+        self.assertEqual(detour[1], [None])
+        self.assertEqual((detour[0][0], detour[0][-1]), ((1, 0), (1, 4)))
+        self.assertNotIn((1, 2), detour[0], "first agent went through the stuck agent")
+        paths = plan_paths(grid, starts, ends, method="cbs", neighbors="4_wind")
+        self.assertEqual(find_conflicts(paths), [])
+        self.assertEqual([(path[0], path[-1]) for path in paths], list(zip(starts, ends)))
+        self.assertIn((1, 2), paths[0] + paths[1], "agents did not use the alcove")
+
+    @given(hypo_array(dtype=np.int, shape=(6, 6), elements=st.integers(0, 1)),
+           st.lists(st.tuples(st.integers(0, 5), st.integers(0, 5), st.integers(0, 1)), max_size=12),
+           st.sampled_from(["4_wind", "8_wind"]))
+    def test_component_index_assert_matches_labels(self, grid, cells, neighbors):
+        maze = Maze(grid.copy())
+        components = maze.components(neighbors)
+        for cell in cells:
+            maze.update_cells([cell])
+        labels = label_components(maze.grid, neighbors)
+        free = np.argwhere(labels >= 0)
+        for (row_a, col_a), (row_b, col_b) in zip(free, free[::-1]):
+            self.assertEqual(components.connected((row_a, col_a), (row_b, col_b)),
+                             labels[row_a, col_a] == labels[row_b, col_b], "index disagrees with a fresh labeling")
+        self.assertEqual(components.label((0, 0)) < 0, maze.grid[0, 0] != 0)
+
+    def test_components_assert_instant_failure(self):
+        grid = np.zeros((40, 40), dtype=np.uint8)
+        grid[:, 20] = 1
+        maze = Maze(grid)
+        stats = SearchStats()
+        self.assertEqual(bfs(grid, (0, 0), (0, 39), components=maze.components("4_wind"), stats=stats), ([None], [None]))
+        self.assertEqual(stats.expanded, 0, "search ran although the end is in another component")
+        maze.update_cells([(10, 20, 0)])
+        _, path_list = a_star(grid, (0, 0), (0, 39), components=maze.components("8_wind"))
+        self.assertEqual(path_list, a_star(grid, (0, 0), (0, 39))[1], "index was not updated when a cell was unblocked")
+        with self.assertRaises(ValueError):
+            dfs(grid, (0, 0), (0, 39), components=maze.components("8_wind"))
+
+    def test_jps_assert_full_path(self):
+        visited_list, path_list = jps(self.grid, self.start, self.end)
+        self.assertEqual(path_list, self.a_star_correct_returns["path_list"], "jps path was not interpolated")
+        self.assertLess(len(visited_list), len(self.a_star_correct_returns["visited_list"]))
+
+    @given(hypo_array(dtype=np.int, shape=(5, 5), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)),
+           st.tuples(st.integers(0, 4), st.integers(0, 4)))
+    def test_bidirectional_assert_equal_path_cost(self, grid, start, end):
+        _, bfs_path_list = bfs(grid, start, end)
+        _, path_list = bidirectional_bfs(grid, start, end)
+        self.assertEqual(len(path_list), len(bfs_path_list), "bidirectional_bfs path length differs from bfs")
+        _, a_star_path_list = a_star(grid, start, end)
+        _, path_list = bidirectional_a_star(grid, start, end)
+        if a_star_path_list == [None]:
+            self.assertEqual(path_list, [None], "bidirectional_a_star found a path that does not exist")
+        else:
+            self.assertEqual((path_list[0], path_list[-1]), (end, start))
+            self.assertEqual(path_cost(path_list), path_cost(a_star_path_list), "bidirectional_a_star is suboptimal")
+
+    def test_bidirectional_bfs_assert_path(self):
+        visited_list, path_list = bidirectional_bfs(self.grid, self.start, self.end)
+        self.assertEqual(len(path_list), len(self.bfs_correct_returns["path_list"]))
+        self.assertEqual((path_list[0], path_list[-1]), (self.end, self.start))
+
+    @given(hypo_array(dtype=np.int, shape=(8, 8), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 7), st.integers(0, 7)),
+           st.tuples(st.integers(0, 7), st.integers(0, 7)))
+    def test_hpa_star_assert_valid_path(self, grid, start, end):
+        _, a_star_path_list = a_star(grid, start, end)
+        _, path_list = hpa_star(HierarchicalMaze(grid, cluster_size=3), start, end)
+        if a_star_path_list == [None]:
+            self.assertEqual(path_list, [None], "hpa_star found a path that does not exist")
+        else:
+            self.assertNotEqual(path_list, [None], "hpa_star missed a path")
+            self.assertEqual((path_list[0], path_list[-1]), (end, start))
+            for a, b in zip(path_list, path_list[1:]):
+                self.assertEqual(max(abs(a[0] - b[0]), abs(a[1] - b[1])), 1, "hpa_star path is not connected")
+                self.assertEqual(grid[b], 0, "hpa_star path crosses a wall")
+            self.assertGreaterEqual(path_cost(path_list), path_cost(a_star_path_list))
+
+    def test_hpa_star_update_cells(self):
+        maze = HierarchicalMaze(self.grid.copy(), cluster_size=2)
+        changed = maze.update_cells([(1,3,0), (3,2,1), (4,4,0)])
+        rebuilt = HierarchicalMaze(maze.grid.copy(), cluster_size=2)
+        self.assertEqual(changed, [(1,3), (3,2)], "unchanged cells were reported.")
+        self.assertEqual(maze.version, 1, "version was not bumped once.")
+        self.assertEqual(maze.inter_edges, rebuilt.inter_edges, "borders were not rebuilt.")
+        self.assertEqual(maze.intra_edges, rebuilt.intra_edges, "cluster edges were not rebuilt.")
+
+    @given(hypo_array(dtype=np.int, shape=(6, 6), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 5), st.integers(0, 5)),
+           st.tuples(st.integers(0, 5), st.integers(0, 5)),
+           st.lists(st.tuples(st.integers(0, 5), st.integers(0, 5), st.integers(0, 1)), max_size=6))
+    def test_d_star_lite_assert_equal_path_cost(self, grid, start, end, cells):
+        planner = DStarLite(grid.copy(), start, end)
+        planner.plan()
+        planner.update_cells(cells)
+        _, path_list = planner.plan()
+        _, a_star_path_list = a_star(planner.grid.copy(), start, end)
+        if a_star_path_list == [None]:
+            self.assertEqual(path_list, [None], "DStarLite found a path that does not exist")
+        else:
+            self.assertEqual((path_list[0], path_list[-1]), (end, start))
+            self.assertEqual(path_cost(path_list), path_cost(a_star_path_list), "DStarLite replanned a suboptimal path")
+
+    def test_d_star_lite_replan(self):
+        planner = DStarLite(self.grid.copy(), self.start, self.end)
+        visited_list, path_list = planner.plan()
+        self.assertEqual(path_cost(path_list), path_cost(a_star(self.grid, self.start, self.end)[1]))
+        planner.move_start(path_list[-2])
+        planner.update_cells([(3,3,1), (3,4,1)])
+        _, path_list = planner.plan()
+        self.assertEqual((path_list[0], path_list[-1]), (self.end, (4,1)))
+        self.assertNotIn((3,3), path_list, "path goes through a cell that was blocked")
+
+    def test_solve_many_assert_equal(self):
+        grid = self.grid.copy()
+        grid[0,0] = 1
+        grid[4,1] = 1
+        pairs = [(self.start, self.end), (self.end, self.start), ((3,0), self.end), ((0,0), self.end), ((4,4), (4,4))]
+        for algorithm, search in (("a_star", a_star), ("bfs", bfs), ("dfs", dfs)):
+            results = list(solve_many(grid, pairs, algorithm=algorithm))
+            self.assertEqual(results, [search(grid, start, end, _stack=Stack()) if search is dfs else
+                                       search(grid, start, end) for start, end in pairs])
+        self.assertEqual(list(solve_many(grid, [((0,1), (3,0))], algorithm="bfs")), [([None],[None])],
+                         "pair in different components was searched")
+
+    def test_solve_many_weighted_assert_equal(self):
+        weights = np.array([[1, 1, 1, 1, 1],
+                            [1, 9, 9, 9, 1],
+                            [1, 9, IMPASSABLE, 9, 1],
+                            [1, 9, 9, 9, 1],
+                            [1, 1, 1, 1, 1]])
+        pairs = [((2,0), (2,4)), ((0,0), (4,4)), ((2,0), (2,2))]
+        expected = [a_star(weights, start, end, weighted=True) for start, end in pairs]
+        self.assertNotEqual(expected[0], ([None],[None]))
+        self.assertEqual(list(solve_many(weights, pairs, weighted=True)), expected)
+        self.assertEqual(list(solve_parallel(weights, pairs, workers=2, weighted=True)), expected)
+
+    def test_solve_parallel_assert_equal(self):
+        pairs = [(self.start, self.end), (self.end, self.start), ((3,0), (0,0)), ((4,4), (1,0))] * 2
+        expected = list(solve_many(self.grid, pairs))
+        self.assertEqual(list(solve_parallel(self.grid, pairs, workers=2, chunksize=3)), expected)
+        with SharedMaze(self.grid) as maze:
+            unordered = dict(solve_parallel(maze, pairs, workers=2, chunksize=3, ordered=False))
+        self.assertEqual([unordered[index] for index in range(len(pairs))], expected)
+
+    def test_path_cache_hits_and_invalidation(self):
+        cache = PathCache(max_entries=2)
+        maze = Maze(self.grid.copy())
+        self.assertEqual(cache.solve(maze, self.start, self.end), a_star(self.grid, self.start, self.end))
+        self.assertEqual(cache.solve(maze, self.start, self.end), a_star(self.grid, self.start, self.end))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        visited_list, path_list = cache.solve(maze, (3,2), (1,4))
+        self.assertEqual((visited_list, path_list[0], path_list[-1]), ([], (1,4), (3,2)), "subpath was not reused")
+        maze.update_cells([(3,3,1)])
+        cache.solve(maze, self.start, self.end)
+        self.assertEqual((cache.misses, len(cache)), (2, 1), "entries of the old grid version were kept")
+        cache.solve(maze, self.start, self.end, algorithm="bfs")
+        cache.solve(maze, self.end, self.start, algorithm="dfs")
+        self.assertEqual((len(cache), cache.evictions), (2, 1), "least recently used entry was not evicted")
+
+    def test_path_cache_weighted_assert_optimal_cost(self):
+        # stepping into a cell costs its weight, so a path walked back can cost more than the best path back
+        weights = np.array([[5, 3, 4, 3, 3],
+                            [4, 5, 2, 2, 3],
+                            [2, 4, 5, 1, 1],
+                            [5, 3, 4, 4, 5],
+                            [1, 2, 5, 3, 2]])
+
+        def weighted_cost(path_list):
+            return sum(weights[a] * (14 if a[0] != b[0] and a[1] != b[1] else 10)
+                       for a, b in zip(path_list, path_list[1:]))
+
+        cache = PathCache()
+        cache.solve(weights, (1,0), (0,4), weighted=True)
+        _, path_list = cache.solve(weights, (0,4), (1,0), weighted=True)
+        self.assertEqual(weighted_cost(path_list), weighted_cost(a_star(weights, (0,4), (1,0), weighted=True)[1]),
+                         "cache walked a weighted path back")
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_grid_io_round_trip(self):
+        self.assertTrue((load_text("data_np.txt") == self.grid).all(), "text grid was not parsed")
+        with tempfile.TemporaryDirectory() as directory:
+            for name, save in (("grid.npy", save_npy), ("grid.bits", save_packed), ("grid.rle", save_rle)):
+                path = os.path.join(directory, name)
+                save(path, self.grid)
+                self.assertTrue((load_grid(path) == self.grid).all(), f"{name} did not round trip")
+            maze = Maze.from_file(os.path.join(directory, "grid.npy"), mmap_mode="r+")
+            self.assertIsInstance(maze.grid, np.memmap)
+            self.assertEqual(a_star(maze.grid, self.start, self.end), a_star(self.grid, self.start, self.end))
+            del maze
+
+    def test_benchmark_corpus_and_compare(self):
+        for name, generator in GENERATORS.items():
+            grid = generator(32, seed=3)
+            self.assertTrue((grid == generator(32, seed=3)).all(), f"{name} is not reproducible")
+            start, end = pick_endpoints(grid)
+            self.assertNotEqual(bfs(grid, start, end)[1], [None], f"{name} endpoints are not connected")
+        results = run_benchmarks(sizes=(16,), generators=("maze",), engines=("a_star", "bfs"), repeat=1, memory=False)
+        self.assertEqual(compare(results, results), [])
+        slower = {"results": {key: dict(case, expanded=case["expanded"] + 1) for key, case in results["results"].items()}}
+        self.assertEqual(len(compare(slower, results)), 2, "extra expanded nodes were not reported")
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            faster = {"results": {key: dict(case, time=case["time"] / 10) for key, case in results["results"].items()}}
+            with open(baseline, "w") as file:
+                json.dump(faster, file)
+            argv = ["--sizes", "16", "--generators", "maze", "--engines", "a_star", "bfs", "--repeat", "1",
+                    "--no-memory", "--min-time", "0", "--output", os.path.join(directory, "results.json"),
+                    "--baseline", baseline]
+            self.assertEqual(run_benchmarks_main(argv), 0, "a slower time failed the run")
+            self.assertEqual(run_benchmarks_main(argv + ["--fail-on-time"]), 1)
+
+    def test_label_components(self):
+        labels = label_components(self.grid, "4_wind")
+        self.assertEqual(labels[2,0], -1, "blocked cell was labeled")
+        self.assertEqual(labels[self.start], labels[self.end])
+        self.assertEqual(label_components(self.grid, "8_wind").max(), 0, "8_wind grid is one component")
+
+    @given(hypo_array(dtype=np.int, shape=(6, 6), elements=st.integers(0, 1)),
+           st.tuples(st.integers(0, 5), st.integers(0, 5)),
+           st.tuples(st.integers(0, 5), st.integers(0, 5)))
+    def test_flow_field_assert_equal_path_cost(self, grid, start, end):
+        flow_field = FlowField(grid, [end])
+        _, a_star_path_list = a_star(grid, start, end)
+        path_list = flow_field.path_from(start)
+        if a_star_path_list == [None]:
+            self.assertEqual(path_list, [None], "flow field reached a source that can not be reached")
+        else:
+            self.assertEqual((path_list[0], path_list[-1]), (end, start))
+            self.assertEqual(path_cost(path_list), path_cost(a_star_path_list), "flow field path is suboptimal")
+            self.assertEqual(flow_field.distances[start], path_cost(a_star_path_list))
+
+    def test_distance_field_many_sources(self):
+        distances = distance_field(self.grid, [self.start, self.end], neighbors="4_wind")
+        self.assertEqual(distances[self.start], 0)
+        self.assertEqual(distances[2,0], np.inf, "blocked cell has a cost")
+        self.assertEqual(distances[4,2], 20, "cost is not to the nearest source")
+
     #### Class Testing ####
 
+    def test_light_node_children(self):
+        node = Node(self.grid, (3,3), parent=(4,3), neighbors="8_wind")
+        light_node = LightNode(self.grid, (3,3), parent=(4,3), neighbors="8_wind")
+        self.assertEqual(light_node.children, node.children, "LightNode children differ from Node children.")
+
+    def test_bit_grid(self):
+        bit_grid = BitGrid(self.grid)
+        self.assertTrue((np.asarray(bit_grid) == self.grid).all(), "grid did not round trip")
+        self.assertEqual(bit_grid.nbytes, 5, "grid was not packed to a bit per cell")
+        self.assertEqual(a_star(bit_grid, self.start, self.end), a_star(self.grid, self.start, self.end))
+        self.assertEqual(Node(bit_grid, (3,3), parent=(4,3)).children, Node(self.grid, (3,3), parent=(4,3)).children)
+        self.assertEqual(bit_grid.neighbor_mask([0, 4], [0, 4], "4_wind").tolist(),
+                         [[False, True, True, False], [True, False, False, True]])
+        maze = Maze(self.grid.copy(), compact=True)
+        maze.update_cells([(2,0,0)])
+        self.assertEqual((maze.grid[2,0], maze.grid[2,1]), (0, 1), "cell was not updated")
+
     def test_stack_push_assert_in(self):
         self.stack.push(self.test_nodes[0])
         self.assertIn(self.test_nodes[0], self.stack.stacked_nodes, "Was not able to push node into stack")
@@ -144,14 +643,71 @@ class PathfindingTests(unittest.TestCase):
     def test_priority_queue_pop(self):
         for node in self.test_nodes:
             self.priority_queue.push(node)
-        self.priority_queue.pop()
-        self.assertSequenceEqual(self.priority_queue.queued_nodes, [self.test_nodes[1], self.test_nodes[2]], "pop failed with test nodes.")
+        self.assertEqual(self.priority_queue.pop(), self.test_nodes[0], "pop failed with test nodes.")
+        self.assertSequenceEqual([self.priority_queue.pop(), self.priority_queue.pop()],
+                                 [self.test_nodes[2], self.test_nodes[1]], "pop failed with test nodes.")
+
+    def test_priority_queue_decrease_key(self):
+        for node in self.test_nodes:
+            self.priority_queue.push(node)
+        cheaper_node = Node(self.grid, (3,0), cost=0, heuristic=10)
+        self.assertTrue(self.priority_queue.decrease_key(cheaper_node), "decrease_key did not replace the node.")
+        self.assertFalse(self.priority_queue.decrease_key(self.test_nodes[1]), "decrease_key replaced a cheaper node.")
+        self.assertEqual(len(self.priority_queue), 3, "decrease_key changed the queue length.")
+        self.assertEqual(self.priority_queue.pop(), cheaper_node, "decrease_key did not reprioritize the node.")
+
+    def test_priority_queue_tie_break(self):
+        high_heuristic_node = Node(self.grid, (3,0), cost=10, heuristic=10)
+        low_heuristic_node = Node(self.grid, (4,1), cost=12, heuristic=8)
+        self.priority_queue.push(high_heuristic_node)
+        self.priority_queue.push(low_heuristic_node)
+        self.assertEqual(self.priority_queue.pop(), low_heuristic_node, "ties were not broken on the heuristic.")
+
+    def test_bucket_queue_pop(self):
+        bucket_queue = BucketQueue()
+        for position, cost in (((0,0), 20), ((0,1), 10), ((0,2), 20), ((0,3), 30)):
+            bucket_queue.push(LightNode(self.grid, position, cost=cost, heuristic=0))
+        bucket_queue.push(LightNode(self.grid, (0,3), cost=5, heuristic=0))
+        self.assertEqual([bucket_queue.pop().pos for _ in range(len(bucket_queue))], [(0,3), (0,1), (0,2), (0,0)])
+        with self.assertRaises(ValueError):
+            bucket_queue.push(LightNode(self.grid, (0,0), cost=1.5, heuristic=0))
+
+    def test_queue_contains(self):
+        self.queue.push(self.test_nodes[0])
+        self.assertTrue(self.queue.contains(self.test_nodes[0].pos), "Queued position not found.")
+        self.queue.pop()
+        self.assertFalse(self.queue.contains(self.test_nodes[0].pos), "Popped position still found.")
+
+    def test_stack_contains_bitmap(self):
+        stack = Stack(grid_shape=self.grid.shape)
+        stack.push(self.test_nodes[1])
+        self.assertIn(self.test_nodes[1].pos, stack, "Stacked position not found.")
+        self.assertNotIn(self.test_nodes[2].pos, stack, "Position found without being stacked.")
 
     def test_visited_nodes_store_node(self):
-        pass
+        self.visited._store_node(self.test_nodes[0])
+        self.assertEqual(self.visited.visited_nodes, [self.test_nodes[0].pos], "Node position was not stored.")
+        self.assertTrue(self.visited.contains(self.test_nodes[0].pos), "Stored position not found.")
+
+    def test_visited_nodes_create_path_stitched(self):
+        forward = VisitedNodes()
+        backward = VisitedNodes()
+        for node in [Node(self.grid, (4,0)), Node(self.grid, (4,1), parent=(4,0))]:
+            forward._store_node(node)
+        for node in [Node(self.grid, (4,3)), Node(self.grid, (4,2), parent=(4,3))]:
+            backward._store_node(node)
+        visited_list, path_list = forward.create_path((4,1), (4,0), other_visited=backward, end_position=(4,3),
+                                                      other_node_position=(4,2))
+        self.assertEqual(path_list, [(4,3), (4,2), (4,1), (4,0)], "parent chains were not stitched together.")
+        self.assertEqual(visited_list, [(4,0), (4,1), (4,3), (4,2)], "visited lists were not combined.")
 
     def test_visited_nodes_create_path(self):
-        pass
+        visited = VisitedNodes(grid_shape=self.grid.shape, backend="array")
+        for node in [Node(self.grid, (4,0)), Node(self.grid, (4,1), parent=(4,0)), Node(self.grid, (3,2), parent=(4,1))]:
+            visited._store_node(node)
+        visited_list, path_list = visited.create_path((3,2), (4,0))
+        self.assertEqual(visited_list, [(4,0), (4,1), (3,2)], "visited list was not kept in order.")
+        self.assertEqual(path_list, [(3,2), (4,1), (4,0)], "path was not rebuilt from the parent array.")
 
 if __name__ == "__main__":
 